@@ -0,0 +1,36 @@
+import json
+import os
+
+import ee
+import pytest
+from ee import _cloud_api_utils
+
+from wildfire_analyser.fire_assessment import cassette
+from wildfire_analyser.fire_assessment.auth import authenticate_gee
+
+ROI_GEOMETRY = {
+    "type": "Polygon",
+    "coordinates": [[[26.3, 40.1], [26.4, 40.1], [26.4, 40.2], [26.3, 40.2], [26.3, 40.1]]],
+}
+
+
+@pytest.fixture
+def offline_ee(tmp_path):
+    """
+    EE client library initialised offline (replay cassette holding only the
+    algorithm signatures shipped with the library's own tests).
+    """
+    with open(os.path.join(os.path.dirname(ee.__file__), "tests", "algorithms.json")) as f:
+        signatures = _cloud_api_utils.convert_algorithms(json.load(f))
+
+    path = tmp_path / "algorithms.cassette.jsonl"
+    path.write_text(json.dumps({
+        "key": cassette.ALGORITHMS_KEY,
+        "kind": cassette.ALGORITHMS_KEY,
+        "response": signatures,
+    }) + "\n")
+
+    active = cassette.use_cassette(path, cassette.REPLAY)
+    authenticate_gee(None)
+    yield active
+    cassette.use_cassette(None)
@@ -0,0 +1,67 @@
+from wildfire_analyser.fire_assessment import asset_checkpoints
+from wildfire_analyser.fire_assessment.asset_checkpoints import AssetCheckpoints
+from wildfire_analyser.fire_assessment.deliverables import Deliverable
+from wildfire_analyser.fire_assessment.dependencies import Dependency
+from wildfire_analyser.fire_assessment.post_fire_assessment import PostFireAssessment
+
+from conftest import ROI_GEOMETRY
+
+
+class FakeClient:
+    """
+    Stand-in for the EE client: exports start, then complete.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.state = "RUNNING"
+
+    def get_asset(self, asset_id):
+        self.calls.append(("get_asset", asset_id))
+        return {} if asset_id.endswith("checkpoints") else None
+
+    def create_folder(self, asset_id):
+        self.calls.append(("create_folder", asset_id))
+
+    def start_task(self, task):
+        self.calls.append(("start_task", task.config["description"]))
+        task.id = f"T{len(self.calls)}"
+
+    def task_status(self, task_id):
+        self.calls.append(("task_status", task_id))
+        return [{"state": self.state}]
+
+
+def run(checkpoints):
+    runner = PostFireAssessment(
+        None, None, "2023-07-01", "2023-07-21",
+        [Deliverable.DNBR],
+        roi_geometry=ROI_GEOMETRY,
+        asset_checkpoints=checkpoints,
+    )
+    return runner, runner.run()
+
+
+def test_restored_run_keeps_provenance(offline_ee, tmp_path, monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(asset_checkpoints, "get_client", lambda: client)
+    # Provenance stand-in: the collection's expression graph
+    monkeypatch.setattr(
+        PostFireAssessment,
+        "_extract_collection_provenance",
+        lambda self, collection: [{"graph": collection.serialize()}],
+    )
+    checkpoints = AssetCheckpoints(
+        "projects/p/assets/checkpoints", tmp_path / "assets.sqlite"
+    )
+
+    _, computed = run(checkpoints)
+    assert [c[0] for c in client.calls].count("start_task") == 2
+
+    client.state = "COMPLETED"
+    runner, restored = run(checkpoints)
+
+    assert "Image.load" in runner.context.get(Dependency.DNBR).serialize()
+    assert Dependency.PRE_FIRE_MOSAIC not in runner.context.cache
+    assert restored["provenance"]["pre_fire"]["images"]
+    assert restored["provenance"] == computed["provenance"]
@@ -0,0 +1,70 @@
+import pytest
+
+import wildfire_analyser.fire_assessment.post_fire_assessment as pfa
+from wildfire_analyser.fire_assessment.deliverables import Deliverable
+from wildfire_analyser.fire_assessment.post_fire_assessment import PostFireAssessment
+
+from conftest import ROI_GEOMETRY
+
+FEATURES = {
+    "type": "FeatureCollection",
+    "features": [{"type": "Feature", "geometry": None, "properties": {}}] * 3,
+}
+
+
+class FakeClient:
+    def __init__(self, count):
+        self.count = count
+
+    def get_info(self, request):
+        if self.count > PostFireAssessment.PERIMETERS_INLINE_MAX_FEATURES:
+            return {"count": self.count, "features": None}
+        return {"count": self.count, "features": FEATURES}
+
+
+@pytest.fixture
+def perimeters(offline_ee, monkeypatch):
+    """
+    Run DNBR_BURN_PERIMETERS alone against a stand-in EE client that
+    reports `count` perimeters; returns the run's scientific output.
+    """
+    monkeypatch.setattr(
+        PostFireAssessment, "_extract_collection_provenance", lambda self, c: []
+    )
+    exports = []
+    monkeypatch.setattr(pfa, "list_export_tasks", lambda: [])
+    monkeypatch.setattr(
+        pfa,
+        "export_table_to_gcs",
+        lambda collection, bucket, object_name: exports.append(object_name)
+        or {"url": f"gs://{bucket}/{object_name}", "gee_task_id": "T1"},
+    )
+
+    def run(count, bucket=None):
+        monkeypatch.setattr(pfa, "get_client", lambda: FakeClient(count))
+        result = PostFireAssessment(
+            None, None, "2023-07-01", "2023-07-21",
+            [Deliverable.DNBR_BURN_PERIMETERS],
+            roi_geometry=ROI_GEOMETRY,
+            gcs_bucket=bucket,
+        ).run()
+        return result["scientific"]["DNBR_BURN_PERIMETERS"], exports
+
+    return run
+
+
+def test_few_perimeters_inline(perimeters):
+    output, exports = perimeters(3)
+    assert output["features"] == 3
+    assert exports == []
+
+
+def test_too_many_perimeters_exported(perimeters):
+    output, exports = perimeters(12_000, bucket="b")
+    assert output["gee_task_id"] == "T1"
+    assert len(exports) == 1
+
+
+def test_too_many_perimeters_without_bucket(perimeters):
+    with pytest.raises(RuntimeError, match="too many to return inline"):
+        perimeters(12_000)
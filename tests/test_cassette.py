@@ -0,0 +1,57 @@
+import ee
+import pytest
+
+from wildfire_analyser.fire_assessment import cassette
+from wildfire_analyser.fire_assessment.deliverables import Deliverable
+from wildfire_analyser.fire_assessment.post_fire_assessment import PostFireAssessment
+
+from conftest import ROI_GEOMETRY
+
+
+def test_replays_in_recording_order(tmp_path):
+    path = tmp_path / "c.jsonl"
+    recorder = cassette.Cassette(path, cassette.RECORD)
+    for state in ("RUNNING", "COMPLETED"):
+        recorder.play("status", ["T1"], lambda state=state: state)
+
+    player = cassette.Cassette(path, cassette.REPLAY)
+    fail = lambda: pytest.fail("replay must not call through")
+    assert [player.play("status", ["T1"], fail) for _ in range(3)] == [
+        "RUNNING", "COMPLETED", "COMPLETED",
+    ]
+    with pytest.raises(KeyError):
+        player.play("status", ["T2"], fail)
+
+
+def test_close_restores_client_library(tmp_path):
+    originals = (
+        ee.data._install_cloud_api_resource,
+        ee.data.getAlgorithms,
+        ee.deprecation._FetchDataCatalogStac,
+    )
+    path = tmp_path / "c.jsonl"
+    path.write_text(
+        '{"key": "algorithms", "kind": "algorithms", "response": {}}\n'
+    )
+
+    active = cassette.use_cassette(path, cassette.REPLAY)
+    active.initialize_offline()
+    assert ee.data.getAlgorithms is not originals[1]
+
+    cassette.use_cassette(None)
+    assert (
+        ee.data._install_cloud_api_resource,
+        ee.data.getAlgorithms,
+        ee.deprecation._FetchDataCatalogStac,
+    ) == originals
+
+
+@pytest.mark.parametrize("option", ["output_dir", "image_store_dir"])
+def test_replay_rejects_local_downloads(offline_ee, tmp_path, option):
+    with pytest.raises(ValueError, match="replaying a cassette"):
+        PostFireAssessment(
+            None, None, "2023-07-01", "2023-07-21",
+            [Deliverable.DNBR],
+            roi_geometry=ROI_GEOMETRY,
+            **{option: str(tmp_path)},
+        )
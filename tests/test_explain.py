@@ -0,0 +1,25 @@
+import pytest
+
+from wildfire_analyser.fire_assessment.deliverables import Deliverable
+from wildfire_analyser.fire_assessment.post_fire_assessment import PostFireAssessment
+
+from conftest import ROI_GEOMETRY
+
+
+@pytest.mark.parametrize("scale", [None, 30])
+def test_statistics_pixels_at_statistics_scale(offline_ee, monkeypatch, scale):
+    runner = PostFireAssessment(
+        None, None, "2023-07-01", "2023-07-21",
+        [Deliverable.DNBR_AREA_STATISTICS],
+        roi_geometry=ROI_GEOMETRY,
+        statistics_scale=scale,
+    )
+    monkeypatch.setattr(runner, "_explain_windows", lambda: ({}, 0))
+
+    plan = runner.explain()
+
+    expected_scale = scale or 10
+    assert plan["statistics"]["scale_m"] == expected_scale
+    assert plan["statistics"]["pixels"] == pytest.approx(
+        plan["roi"]["pixels"] * 100 / expected_scale ** 2, abs=1
+    )
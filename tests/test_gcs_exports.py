@@ -0,0 +1,67 @@
+import logging
+
+import pytest
+
+from wildfire_analyser.fire_assessment.exporters import gcs
+
+TASKS = [{"id": "T1", "description": "dnbr_abc", "state": "COMPLETED"}]
+
+
+class FakeResponse:
+    def __init__(self, status_code, names=()):
+        self.status_code = status_code
+        self._names = names
+
+    def json(self):
+        return {"items": [{"name": name} for name in self._names]} if self._names else {}
+
+
+@pytest.fixture
+def bucket(monkeypatch):
+    """
+    Stand-in GCS JSON API: set `bucket.response` to the listing response.
+    """
+    class Bucket:
+        response = FakeResponse(200)
+        requests = []
+
+    class FakeSession:
+        def __init__(self, credentials):
+            assert credentials == "service-account"
+
+        def get(self, url, params, timeout):
+            Bucket.requests.append((url, params["prefix"]))
+            return Bucket.response
+
+    monkeypatch.setattr(gcs, "gee_credentials", lambda: "service-account")
+    monkeypatch.setattr(gcs, "AuthorizedSession", FakeSession)
+    return Bucket
+
+
+@pytest.mark.parametrize("names", [
+    ["dnbr_abc.tif"],
+    ["dnbr_abc-0000000000-0000000000.tif", "dnbr_abc-0000000000-0000032768.tif"],
+])
+def test_completed_export_reused(bucket, names):
+    bucket.response = FakeResponse(200, names)
+
+    existing = gcs.find_existing_export("b", "dnbr_abc", TASKS)
+
+    assert existing["gee_task_id"] == "T1"
+    assert bucket.requests == [(f"{gcs.GCS_API_URL}/b/b/o", "dnbr_abc")]
+
+
+def test_expired_export_not_reused(bucket):
+    bucket.response = FakeResponse(200, ["dnbr_abc_source.tif"])
+
+    assert gcs.find_existing_export("b", "dnbr_abc", TASKS) is None
+
+
+def test_forbidden_listing_trusts_task(bucket, caplog):
+    bucket.response = FakeResponse(403)
+
+    with caplog.at_level(logging.WARNING):
+        existing = gcs.find_existing_export("b", "dnbr_abc", TASKS)
+
+    assert existing["gee_task_id"] == "T1"
+    assert "Not allowed to list gs://b" in caplog.text
@@ -0,0 +1,205 @@
+import io
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import ee
+import numpy as np
+import pytest
+import rasterio
+import requests
+from rasterio.transform import Affine
+
+from wildfire_analyser.fire_assessment.exporters import local
+from wildfire_analyser.fire_assessment.exporters.local import (
+    download_tiles_to_geotiff,
+    export_geotiff_to_local,
+    plan_tiles,
+    utm_crs,
+)
+
+from conftest import ROI_GEOMETRY
+
+BANDS = ["dNBR", "RBR"]
+
+
+def synthetic_grid(width, height):
+    """
+    (bands, rows, cols) values identifying every band, row and column.
+    """
+    rows, cols = np.mgrid[0:height, 0:width].astype("float32")
+    return np.stack([b * 1_000_000 + rows * width + cols for b in range(len(BANDS))])
+
+
+def npy_tile(data):
+    """
+    NPY payload as Earth Engine returns it: a structured array with one
+    field per band.
+    """
+    tile = np.zeros(data.shape[1:], dtype=[(name, "<f4") for name in BANDS])
+    for i, name in enumerate(BANDS):
+        tile[name] = data[i]
+    buffer = io.BytesIO()
+    np.save(buffer, tile)
+    return buffer.getvalue()
+
+
+class TileHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        query = {k: int(v[0]) for k, v in parse_qs(urlsplit(self.path).query).items()}
+        self.server.requests.append(query)
+        col, row, w, h = query["col"], query["row"], query["w"], query["h"]
+
+        if (col, row) in self.server.failing:
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = npy_tile(self.server.grid[:, row:row + h, col:col + w])
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def tile_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), TileHandler)
+    server.requests = []
+    server.failing = set()
+    server.url = "http://127.0.0.1:%d/tile" % server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def window_url(server):
+    def tile_url(window):
+        col, row, w, h = window
+        return f"{server.url}?col={col}&row={row}&w={w}&h={h}"
+    return tile_url
+
+
+def test_plan_tiles_covers_grid_under_request_limit():
+    tiles = plan_tiles(3000, 60, band_count=2)
+
+    side = int(np.sqrt(local.MAX_REQUEST_BYTES * local.REQUEST_SIZE_MARGIN // 8))
+    assert tiles == [(0, 0, side, 60), (side, 0, 3000 - side, 60)]
+
+    coverage = np.zeros((7, 5), dtype=int)
+    small = plan_tiles(5, 7, band_count=1, max_request_bytes=40, max_tile_dim=3)
+    for col, row, w, h in small:
+        assert w * h * 4 <= 40 and max(w, h) <= 3
+        coverage[row:row + h, col:col + w] += 1
+    assert (coverage == 1).all()
+
+    with pytest.raises(ValueError):
+        plan_tiles(0, 10, band_count=1)
+
+
+def test_tiles_are_mosaicked_into_geotiff(tmp_path, tile_server):
+    width, height = 3000, 60
+    tile_server.grid = synthetic_grid(width, height)
+    transform = Affine(10, 0, 500_000, 0, -10, 4_440_000)
+    path = tmp_path / "out" / "dnbr.tif"
+
+    tiles = download_tiles_to_geotiff(
+        path, window_url(tile_server), width, height, len(BANDS), transform,
+        "EPSG:32635", band_names=BANDS, session=requests.Session(), max_workers=2,
+    )
+
+    assert tiles == len(tile_server.requests) == 2
+    assert not path.with_name("dnbr.tif.part").exists()
+    with rasterio.open(path) as src:
+        assert (src.width, src.height, src.count) == (width, height, 2)
+        assert src.crs.to_epsg() == 32635
+        assert src.transform == transform
+        assert src.descriptions == tuple(BANDS)
+        assert src.nodata == local.DEFAULT_NODATA
+        np.testing.assert_array_equal(src.read(), tile_server.grid)
+
+
+def test_failed_tile_leaves_no_partial_file(tmp_path, tile_server):
+    width, height = 3000, 60
+    tile_server.grid = synthetic_grid(width, height)
+    side = plan_tiles(width, height, len(BANDS))[1][0]
+    tile_server.failing.add((side, 0))
+    path = tmp_path / "dnbr.tif"
+
+    with pytest.raises(requests.HTTPError):
+        download_tiles_to_geotiff(
+            path, window_url(tile_server), width, height, len(BANDS),
+            Affine(10, 0, 0, 0, -10, 0), "EPSG:32635",
+            session=requests.Session(), max_workers=2,
+        )
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_tile_of_wrong_shape_is_rejected(tmp_path, tile_server):
+    tile_server.grid = synthetic_grid(10, 10)
+    path = tmp_path / "dnbr.tif"
+
+    with pytest.raises(RuntimeError, match="expected"):
+        download_tiles_to_geotiff(
+            path, window_url(tile_server), 10, 10, 3,
+            Affine(10, 0, 0, 0, -10, 0), "EPSG:32635", session=requests.Session(),
+        )
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_utm_crs_of_roi():
+    assert utm_crs(ROI_GEOMETRY) == "EPSG:32635"
+    assert utm_crs({"type": "Point", "coordinates": [-47.9, -15.8]}) == "EPSG:32723"
+    assert utm_crs({"type": "Point", "coordinates": [180.0, 10.0]}) == "EPSG:32660"
+
+
+def test_export_downloads_roi_grid_in_utm(offline_ee, monkeypatch, tmp_path, tile_server):
+    crs = utm_crs(ROI_GEOMETRY)
+    # ROI bounds in the UTM zone; the grid snaps outwards to 10 m
+    xmin, ymin, xmax, ymax = 440_003.0, 4_438_991.0, 440_121.0, 4_439_052.0
+    tile_server.grid = synthetic_grid(13, 7)
+    download_params = []
+
+    class FakeClient:
+        def get_info(self, obj):
+            return {
+                "bounds": {"coordinates": [[
+                    [xmin, ymin], [xmax, ymin], [xmax, ymax], [xmin, ymax], [xmin, ymin]
+                ]]},
+                "bands": BANDS,
+            }
+
+        def download_url(self, image, params):
+            download_params.append(params)
+            a, _, x0, _, e, y0 = params["crs_transform"]
+            col, row = round((x0 - 440_000) / a), round((y0 - 4_439_060) / e)
+            w, h = params["dimensions"]
+            return f"{tile_server.url}?col={col}&row={row}&w={w}&h={h}"
+
+    monkeypatch.setattr(local, "get_client", lambda: FakeClient())
+
+    result = export_geotiff_to_local(
+        ee.Image.constant([1, 2]), ee.Geometry(ROI_GEOMETRY), tmp_path / "dnbr.tif",
+        crs=crs, session=requests.Session(),
+    )
+
+    assert result == {"path": str(tmp_path / "dnbr.tif"), "tiles": 1}
+    assert download_params == [{
+        "format": "NPY",
+        "crs": crs,
+        "crs_transform": [10, 0, 440_000, 0, -10, 4_439_060],
+        "dimensions": [13, 7],
+    }]
+    with rasterio.open(result["path"]) as src:
+        assert src.crs.to_epsg() == 32635
+        assert src.transform == Affine(10, 0, 440_000, 0, -10, 4_439_060)
+        np.testing.assert_array_equal(src.read(), tile_server.grid)
@@ -0,0 +1,117 @@
+import ee
+import pytest
+
+from wildfire_analyser.fire_assessment import post_fire_assessment, preflight
+from wildfire_analyser.fire_assessment.deliverables import Deliverable
+from wildfire_analyser.fire_assessment.post_fire_assessment import PostFireAssessment
+from wildfire_analyser.fire_assessment.preflight import candidate_settings, run_preflight
+
+from conftest import ROI_GEOMETRY
+
+POST_WINDOWS = [("2023-08-21", "2023-08-31"), ("2024-01-21", "2024-01-31")]
+
+
+class FakeClient:
+    """
+    Scene summaries where the winter window only has scenes once the
+    cloud threshold reaches 80.
+    """
+
+    def __init__(self, candidates):
+        self.candidates = candidates
+        self.requests = []
+
+    def get_info(self, dictionary):
+        summaries = {}
+        # Client-side dictionary of the request (one summary per key)
+        for key in dictionary._dictionary:
+            i = int(key.split("/")[0])
+            _, cloud = self.candidates[i]
+            empty = key.endswith("/post_fire/1") and cloud < 80
+            summaries[key] = {"scenes": 0 if empty else 4, "coverage": 0.0 if empty else 1.0}
+        self.requests.append(sorted(summaries))
+        return summaries
+
+
+def test_time_series_preflight_checks_every_post_window(offline_ee, monkeypatch):
+    candidates = candidate_settings(10, 60, max_cloud_threshold=80)
+    client = FakeClient(candidates)
+    monkeypatch.setattr(preflight, "get_client", lambda: client)
+
+    result = run_preflight(
+        ee.Geometry(ROI_GEOMETRY), "2023-07-01", "2023-07-21", 10, 60,
+        max_cloud_threshold=80, post_windows=POST_WINDOWS,
+    )
+
+    assert len(client.requests) == 1
+    assert "0/post_fire" not in client.requests[0]
+    assert {"0/pre_fire", "0/post_fire/0", "0/post_fire/1"} <= set(client.requests[0])
+    assert (result["days_before_after"], result["cloud_threshold"]) == (10, 80)
+    assert result["widened"]
+    assert [w["start"] for w in result["post_windows"]] == ["2023-08-21", "2024-01-21"]
+
+    with pytest.raises(RuntimeError, match="post-fire 2024-01-21..2024-01-31 0 scenes"):
+        run_preflight(
+            ee.Geometry(ROI_GEOMETRY), "2023-07-01", "2023-07-21", 10, 60,
+            post_windows=POST_WINDOWS,
+        )
+
+
+class PreflightRan(Exception):
+    pass
+
+
+def test_run_time_series_runs_preflight_first(offline_ee, monkeypatch):
+    calls = []
+
+    def fake_preflight(**kwargs):
+        calls.append(kwargs)
+        return {"days_before_after": 20, "cloud_threshold": 80, "widened": True}
+
+    def stop(deliverables, context):
+        raise PreflightRan(dict(context.inputs))
+
+    monkeypatch.setattr(post_fire_assessment, "run_preflight", fake_preflight)
+    monkeypatch.setattr(post_fire_assessment, "execute_dag", stop)
+
+    runner = PostFireAssessment(
+        None, None, "2023-07-01", "2023-07-21",
+        [Deliverable.DNBR_AREA_STATISTICS],
+        roi_geometry=ROI_GEOMETRY,
+        days_before_after=10,
+        cloud_threshold=60,
+        preflight=True,
+        max_days_before_after=20,
+        max_cloud_threshold=80,
+    )
+
+    with pytest.raises(PreflightRan) as ran:
+        runner.run_time_series(POST_WINDOWS)
+
+    assert len(calls) == 1
+    assert calls[0]["post_windows"] == POST_WINDOWS
+    # The DAG is built with the widened setting
+    inputs = ran.value.args[0]
+    assert (inputs["days_before_after"], inputs["cloud_threshold"]) == (20, 80)
+    assert inputs["post_fire_window"] == POST_WINDOWS[0]
+
+
+def test_run_time_series_fails_fast_on_insufficient_coverage(offline_ee, monkeypatch):
+    def fake_preflight(**kwargs):
+        raise RuntimeError("Insufficient Sentinel-2 coverage")
+
+    def never(deliverables, context):
+        raise AssertionError("DAG built despite failed preflight")
+
+    monkeypatch.setattr(post_fire_assessment, "run_preflight", fake_preflight)
+    monkeypatch.setattr(post_fire_assessment, "execute_dag", never)
+
+    runner = PostFireAssessment(
+        None, None, "2023-07-01", "2023-07-21",
+        [Deliverable.DNBR_AREA_STATISTICS],
+        roi_geometry=ROI_GEOMETRY,
+        preflight=True,
+    )
+
+    with pytest.raises(RuntimeError, match="Insufficient"):
+        runner.run_time_series(POST_WINDOWS)
@@ -0,0 +1,96 @@
+import json
+
+import ee
+import pytest
+
+from wildfire_analyser.fire_assessment.deliverables import Deliverable
+from wildfire_analyser.fire_assessment.post_fire_assessment import PostFireAssessment
+from wildfire_analyser.fire_assessment.sentinel2 import COLLECTION_ID, select_scenes
+from wildfire_analyser.service import normalize_request
+
+from conftest import ROI_GEOMETRY
+
+
+def test_complete_coverage_requires_max_scenes(offline_ee):
+    with pytest.raises(ValueError, match="requires max_scenes_per_window"):
+        PostFireAssessment(
+            None, None, "2023-07-01", "2023-07-21",
+            [Deliverable.DNBR],
+            roi_geometry=ROI_GEOMETRY,
+            complete_coverage=True,
+        )
+
+    PostFireAssessment(
+        None, None, "2023-07-01", "2023-07-21",
+        [Deliverable.DNBR],
+        roi_geometry=ROI_GEOMETRY,
+        max_scenes_per_window=2,
+        complete_coverage=True,
+    )
+
+
+def test_service_rejects_complete_coverage_alone():
+    body = {
+        "roi": ROI_GEOMETRY,
+        "start_date": "2023-07-01",
+        "end_date": "2023-07-21",
+        "complete_coverage": True,
+    }
+    with pytest.raises(ValueError, match="requires max_scenes_per_window"):
+        normalize_request(body)
+
+    assert normalize_request({**body, "max_scenes_per_window": 2})["complete_coverage"]
+
+
+
+def _invocations(node):
+    """
+    Every function invocation in a readable EE graph.
+    """
+    if isinstance(node, dict):
+        if "functionInvocationValue" in node:
+            yield node["functionInvocationValue"]
+        for value in node.values():
+            yield from _invocations(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _invocations(value)
+
+
+def _source(invocation):
+    """
+    Follow the `collection` arguments down to the collection that was loaded.
+    """
+    while "collection" in invocation["arguments"]:
+        invocation = invocation["arguments"]["collection"]["functionInvocationValue"]
+    return invocation
+
+
+def test_complete_coverage_matches_scenes_on_unprefixed_ids(offline_ee):
+    selected = select_scenes(
+        ee.ImageCollection(COLLECTION_ID),
+        ee.Geometry(ROI_GEOMETRY),
+        max_scenes_per_tile=2,
+        complete_coverage=True,
+    )
+    graph = json.loads(ee.serializer.toReadableJSON(selected))
+    invocations = list(_invocations(graph))
+
+    # flatten() of the per-tile collections prefixes system:index, so the
+    # least cloudy scenes would never match the candidates again
+    assert not [
+        i for i in invocations
+        if i["functionName"].endswith("Collection.flatten")
+    ]
+
+    index_arrays = [
+        i for i in invocations
+        if i["functionName"] == "AggregateFeatureCollection.array"
+        and i["arguments"]["property"] == {"constantValue": "system:index"}
+    ]
+    assert index_arrays
+    for array in index_arrays:
+        assert _source(array) == {
+            "functionName": "ImageCollection.load",
+            "arguments": {"id": {"constantValue": COLLECTION_ID}},
+        }
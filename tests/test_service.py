@@ -0,0 +1,142 @@
+import asyncio
+import json
+import threading
+
+from wildfire_analyser.service import AssessmentService
+
+from conftest import ROI_GEOMETRY
+
+BODY = {
+    "roi": ROI_GEOMETRY,
+    "start_date": "2023-07-01",
+    "end_date": "2023-07-21",
+    "deliverables": ["dnbr_area_statistics"],
+}
+
+
+class FakeRunner:
+    def __init__(self, params, started, release):
+        self.params = params
+        self.started = started
+        self.release = release
+
+    def run(self):
+        self.started.set()
+        assert self.release.wait(10)
+        return {
+            "statistics": {"DNBR_AREA_STATISTICS": {"area_ha": 1.0}},
+            "visual": {},
+            "scientific": {},
+            "provenance": {"pre_fire": []},
+        }
+
+
+async def _request(port, method, path, body=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = json.dumps(body).encode() if body is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: test\r\n"
+        f"Content-Length: {len(data)}\r\n\r\n".encode() + data
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+def _serve(service, test):
+    async def main():
+        server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await test(port)
+        finally:
+            server.close()
+            await server.wait_closed()
+            service.close()
+
+    return asyncio.run(main())
+
+
+def test_identical_concurrent_requests_run_once():
+    runners = []
+    started, release = threading.Event(), threading.Event()
+
+    def factory(params):
+        runners.append(FakeRunner(params, started, release))
+        return runners[-1]
+
+    service = AssessmentService(factory)
+
+    async def test(port):
+        first = asyncio.create_task(_request(port, "POST", "/assessments", BODY))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 10)
+
+        # Same request spelled differently joins the in-flight run
+        second = asyncio.create_task(_request(
+            port, "POST", "/assessments",
+            {**BODY, "deliverables": ["DNBR_AREA_STATISTICS"], "cloud_threshold": 70},
+        ))
+        while service.counters["coalesced"] == 0:
+            await asyncio.sleep(0.01)
+        release.set()
+
+        return await first, await second, await _request(port, "GET", "/health")
+
+    (s1, r1), (s2, r2), (_, health) = _serve(service, test)
+
+    assert len(runners) == 1
+    assert runners[0].params["deliverables"] == ["DNBR_AREA_STATISTICS"]
+    assert (s1, s2) == (200, 200)
+    assert (r1["coalesced"], r2["coalesced"]) == (False, True)
+    assert r1["key"] == r2["key"]
+    assert r1["statistics"] == r2["statistics"] == {
+        "DNBR_AREA_STATISTICS": {"area_ha": 1.0}
+    }
+    assert health == {"status": "ok", "in_flight": 0, "requests": 2, "runs": 1, "coalesced": 1}
+
+
+def test_bad_request_body_is_rejected():
+    def factory(params):
+        raise AssertionError("no assessment for an invalid request")
+
+    service = AssessmentService(factory)
+
+    async def test(port):
+        return [
+            await _request(port, "POST", "/assessments", {**BODY, "start_date": "July"}),
+            await _request(port, "POST", "/assessments", {**BODY, "deliverables": ["NOPE"]}),
+            await _request(port, "POST", "/assessments", ["not", "an", "object"]),
+            await _request(port, "POST", "/assessments", {**BODY, "roi": None}),
+        ]
+
+    responses = _serve(service, test)
+
+    assert [status for status, _ in responses] == [400, 400, 400, 400]
+    assert "start_date" in responses[0][1]["error"]
+    assert "NOPE" in responses[1][1]["error"]
+
+
+def test_task_status_goes_through_injected_lookup():
+    calls = []
+
+    def task_status(task_id):
+        calls.append(task_id)
+        return {"id": task_id, "state": "COMPLETED"}
+
+    service = AssessmentService(lambda params: None, task_status=task_status)
+
+    async def test(port):
+        return (
+            await _request(port, "GET", "/tasks/ABC_123-x"),
+            await _request(port, "GET", "/tasks/../etc"),
+        )
+
+    (status, payload), (missing, _) = _serve(service, test)
+
+    assert status == 200
+    assert payload == {"id": "ABC_123-x", "state": "COMPLETED"}
+    assert calls == ["ABC_123-x"]
+    assert missing == 404
@@ -0,0 +1,265 @@
+import json
+import socketserver
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from wildfire_analyser import gee_task_monitor
+from wildfire_analyser.fire_assessment import task_registry
+from wildfire_analyser.fire_assessment.notifications import (
+    NotificationDispatcher,
+    SmtpSettings,
+)
+from wildfire_analyser.fire_assessment.task_registry import TaskRegistry
+
+TASK_ID = "GWPUZIDAD4TGMXCLWOJNBRFT"
+URL = "https://storage.googleapis.com/bucket/dnbr.tif"
+
+
+class FakeSmtpHandler(socketserver.StreamRequestHandler):
+    """
+    Just enough SMTP for smtplib.send_message without STARTTLS.
+    """
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        self.reply("220 fake ESMTP")
+        envelope = {"rcpt": [], "data": ""}
+        while True:
+            line = self.rfile.readline().decode().rstrip("\r\n")
+            if not line:
+                return
+            command = line.split(" ", 1)[0].upper()
+            if command == "EHLO":
+                self.reply("250 fake")
+            elif command == "MAIL":
+                self.reply("250 OK")
+            elif command == "RCPT":
+                envelope["rcpt"].append(line.split(":", 1)[1].strip(" <>"))
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while (data := self.rfile.readline()) not in (b".\r\n", b""):
+                    lines.append(data.decode())
+                envelope["data"] = "".join(lines)
+                self.server.messages.append(envelope)
+                envelope = {"rcpt": [], "data": ""}
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.payloads.append(json.loads(body))
+        status = 500 if self.server.failing else 204
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def smtp_server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), FakeSmtpHandler)
+    server.daemon_threads = True
+    server.messages = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def webhook_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), WebhookHandler)
+    server.payloads = []
+    server.failing = False
+    server.url = "http://127.0.0.1:%d/hook" % server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class FakeClient:
+    """
+    Stand-in for the EE client's bulk task listing.
+    """
+
+    def __init__(self, states):
+        self.states = states
+
+    def task_list(self):
+        return [{"id": task_id, "state": state} for task_id, state in self.states.items()]
+
+    def task_status(self, task_ids):
+        return [{"id": task_id, "state": "UNKNOWN"} for task_id in task_ids]
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    client = FakeClient({})
+    monkeypatch.setattr(gee_task_monitor, "get_client", lambda: client)
+    return client
+
+
+def _dispatcher(registry, smtp_server):
+    return NotificationDispatcher(
+        registry,
+        smtp=SmtpSettings("127.0.0.1", smtp_server.server_address[1], starttls=False),
+    )
+
+
+def _notifications(registry):
+    with sqlite3.connect(registry.path) as conn:
+        conn.row_factory = sqlite3.Row
+        return [dict(row) for row in conn.execute("SELECT * FROM notifications ORDER BY id")]
+
+
+def _record(registry, webhook_server):
+    registry.record_export(
+        TASK_ID, "DNBR", url=URL, requester="user@example.com", webhook=webhook_server.url
+    )
+
+
+def _wait_idle(dispatcher):
+    deadline = time.monotonic() + 10
+    while not dispatcher.idle():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_terminal_state_notifies_each_channel_once(
+    tmp_path, fake_client, smtp_server, webhook_server
+):
+    registry = TaskRegistry(tmp_path / "tasks.sqlite")
+    _record(registry, webhook_server)
+
+    fake_client.states[TASK_ID] = "RUNNING"
+    assert gee_task_monitor.refresh_registry(registry) == 0
+    assert registry.exports()[0]["state"] == "RUNNING"
+
+    fake_client.states[TASK_ID] = "COMPLETED"
+    assert gee_task_monitor.refresh_registry(registry) == 2
+    assert gee_task_monitor.refresh_registry(registry) == 0
+    assert registry.active_task_ids() == []
+
+    dispatcher = _dispatcher(registry, smtp_server)
+    gee_task_monitor.monitor_registry(registry, dispatcher, poll_interval=0, once=True)
+    dispatcher.close()
+
+    assert registry.notification_counts() == {"sent": 2}
+    assert [m["rcpt"] for m in smtp_server.messages] == [["user@example.com"]]
+    assert "DNBR is ready" in smtp_server.messages[0]["data"]
+    assert URL in smtp_server.messages[0]["data"]
+    assert webhook_server.payloads == [{
+        "task_id": TASK_ID,
+        "deliverable": "DNBR",
+        "state": "COMPLETED",
+        "url": URL,
+        "error": None,
+    }]
+
+
+def test_failed_deliveries_back_off_until_failed(
+    tmp_path, monkeypatch, webhook_server
+):
+    clock = [1000.0]
+
+    class FakeTime:
+        @staticmethod
+        def time():
+            return clock[0]
+
+    monkeypatch.setattr(task_registry, "time", FakeTime)
+    webhook_server.failing = True
+
+    registry = TaskRegistry(tmp_path / "tasks.sqlite", max_attempts=3, retry_delay=10)
+    registry.record_export(TASK_ID, "DNBR", webhook=webhook_server.url)
+    registry.update_state(TASK_ID, "FAILED", "Quota exceeded")
+    dispatcher = NotificationDispatcher(registry)
+
+    schedule = []
+    for now in (1000.0, 1010.0, 1030.0):
+        clock[0] = now
+        assert dispatcher.dispatch() == 1
+        _wait_idle(dispatcher)
+        # Not due again until the backoff has elapsed
+        assert dispatcher.dispatch() == 0
+        (row,) = _notifications(registry)
+        schedule.append((row["status"], row["attempts"], row["next_attempt_at"]))
+
+    assert schedule == [
+        ("pending", 1, 1010.0),
+        ("pending", 2, 1030.0),
+        ("failed", 3, 1070.0),
+    ]
+    assert "500" in row["last_error"]
+
+    clock[0] = 10_000.0
+    assert dispatcher.dispatch() == 0
+    dispatcher.close()
+
+    assert len(webhook_server.payloads) == 3
+    assert webhook_server.payloads[0]["error"] == "Quota exceeded"
+
+
+def test_recover_requeues_notifications_of_crashed_monitor(
+    tmp_path, fake_client, smtp_server, webhook_server
+):
+    path = tmp_path / "tasks.sqlite"
+    registry = TaskRegistry(path)
+    _record(registry, webhook_server)
+    registry.update_state(TASK_ID, "COMPLETED")
+
+    # Claimed, then the monitor dies before delivering
+    assert len(registry.claim_due_notifications(10)) == 2
+    assert registry.notification_counts() == {"sending": 2}
+
+    restarted = TaskRegistry(path)
+    assert restarted.claim_due_notifications(10) == []
+
+    dispatcher = _dispatcher(restarted, smtp_server)
+    gee_task_monitor.monitor_registry(restarted, dispatcher, poll_interval=0, once=True)
+    dispatcher.close()
+
+    assert restarted.notification_counts() == {"sent": 2}
+    assert len(smtp_server.messages) == 1
+    assert len(webhook_server.payloads) == 1
+    assert restarted.recover() == 0
+
+
+def test_record_export_is_idempotent_across_restarts(tmp_path, webhook_server):
+    path = tmp_path / "tasks.sqlite"
+
+    registry = TaskRegistry(path)
+    _record(registry, webhook_server)
+    _record(registry, webhook_server)
+    assert registry.update_state(TASK_ID, "COMPLETED") == 2
+
+    restarted = TaskRegistry(path)
+    _record(restarted, webhook_server)
+
+    (export,) = restarted.exports()
+    assert export["state"] == "COMPLETED"
+    assert restarted.update_state(TASK_ID, "COMPLETED") == 0
+    assert restarted.notification_counts() == {"pending": 2}
+
+    # Another requester of the same task is a separate export
+    restarted.record_export(TASK_ID, "DNBR", requester="other@example.com")
+    assert len(restarted.exports()) == 2
+    assert restarted.active_task_ids() == [TASK_ID]
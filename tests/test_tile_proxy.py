@@ -0,0 +1,103 @@
+import json
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+import requests
+
+from wildfire_analyser.tile_proxy import TileCache, TileProxy, make_handler
+
+EE_TILES = "https://earthengine.googleapis.com/v1/projects/p/maps/abc/tiles/{z}/{x}/{y}"
+
+
+class FakeSession:
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url, timeout=None):
+        self.urls.append(url)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"\x89PNG tile"
+        return response
+
+
+@pytest.fixture
+def proxy_server(tmp_path):
+    session = FakeSession()
+    proxy = TileProxy(tmp_path, 1024, session=session)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(proxy))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "http://127.0.0.1:%d" % server.server_address[1], proxy, session
+    server.shutdown()
+    server.server_close()
+
+
+def test_index_skips_partial_writes(tmp_path):
+    cache = TileCache(tmp_path, max_bytes=1024)
+    tile = cache.path_for("ab12", 3, 4, 5)
+    cache.put(tile, b"tile")
+    leftover = tile.parent / "tmpx1y2.tmp"
+    leftover.write_bytes(b"partial" * 100)
+
+    reloaded = TileCache(tmp_path, max_bytes=1024)
+
+    assert not leftover.exists()
+    assert reloaded._size == 4
+    assert reloaded.get(tile) == b"tile"
+
+
+@pytest.mark.parametrize(
+    "url_format",
+    [
+        "http://169.254.169.254/latest/meta-data/{z}/{x}/{y}",
+        "http://earthengine.googleapis.com/v1/tiles/{z}/{x}/{y}",
+        "https://earthengine.googleapis.com.evil.example/{z}/{x}/{y}",
+        "https://user@earthengine.googleapis.com/{z}/{x}/{y}",
+        "https://earthengine.googleapis.com:8443/{z}/{x}/{y}",
+        "https://earthengine.googleapis.com/v1/tiles/{z}/{x}",
+        "https://earthengine.googleapis.com/{z}/{x}/{y}/{0.__class__}",
+        ["https://earthengine.googleapis.com/{z}/{x}/{y}"],
+    ],
+)
+def test_register_rejects_non_earth_engine_urls(proxy_server, tmp_path, url_format):
+    base_url, proxy, session = proxy_server
+
+    response = requests.post(
+        f"{base_url}/layers", json={"key": "ab12", "url_format": url_format}, timeout=10
+    )
+
+    assert response.status_code == 400
+    assert "ab12" not in proxy._layers
+    assert not (tmp_path / "layers.json").exists()
+    assert requests.get(f"{base_url}/tiles/ab12/1/2/3", timeout=10).status_code == 404
+    assert session.urls == []
+
+
+def test_register_and_fetch_earth_engine_tiles(proxy_server):
+    base_url, proxy, session = proxy_server
+
+    response = requests.post(
+        f"{base_url}/layers", json={"key": "ab12", "url_format": EE_TILES}, timeout=10
+    )
+    assert response.status_code == 200
+    assert response.json()["url_format"].endswith("/tiles/ab12/{z}/{x}/{y}")
+
+    tile = requests.get(f"{base_url}/tiles/ab12/7/64/42", timeout=10)
+
+    assert tile.status_code == 200
+    assert tile.content == b"\x89PNG tile"
+    assert session.urls == [
+        "https://earthengine.googleapis.com/v1/projects/p/maps/abc/tiles/7/64/42"
+    ]
+
+
+def test_persisted_layers_are_revalidated(tmp_path):
+    (tmp_path / "layers.json").write_text(
+        json.dumps({"ab12": EE_TILES, "cd34": "http://10.0.0.1/{z}/{x}/{y}"})
+    )
+
+    proxy = TileProxy(tmp_path, 1024, session=FakeSession())
+
+    assert proxy._layers == {"ab12": EE_TILES}
@@ -0,0 +1,82 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from wildfire_analyser.fire_assessment.work_queue import WorkQueue
+
+LEASE_SECONDS = 2
+
+# One worker process: runs the shared queue with stand-in runners. The
+# first attempt at "hang" blocks (as a stuck run would) after leaving a
+# marker with its pid, so the test can kill that worker mid-job.
+WORKER = """
+import sys, time
+from pathlib import Path
+from wildfire_analyser.fire_assessment.batch import run_queue
+from wildfire_analyser.fire_assessment.work_queue import WorkQueue
+
+directory = Path(sys.argv[1])
+
+class Runner:
+    def __init__(self, entry):
+        self.name = entry["name"]
+
+    def run(self):
+        marker = directory / "hang.pid"
+        if self.name == "hang" and not marker.exists():
+            marker.write_text(str(__import__("os").getpid()))
+            time.sleep(600)
+        time.sleep(0.2)
+        with open(directory / "done.txt", "a") as f:
+            f.write(self.name + "\\n")
+        return {"statistics": {}, "scientific": {}, "visual": {}, "provenance": {}}
+
+entries = [
+    {"name": name, "roi": "r", "start_date": "2023-07-01", "end_date": "2023-07-21"}
+    for name in ["a", "hang", "b", "c", "d", "e"]
+]
+queue = WorkQueue(directory / "queue.sqlite", lease_seconds=float(sys.argv[2]))
+print(run_queue(queue, entries, Runner, {}))
+"""
+
+
+def wait_for(condition, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def test_crashed_worker_job_is_reclaimed(tmp_path):
+    env = dict(os.environ, PYTHONPATH=str(Path(__file__).resolve().parents[1]))
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-c", WORKER, str(tmp_path), str(LEASE_SECONDS)],
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        for _ in range(3)
+    ]
+
+    marker = tmp_path / "hang.pid"
+    assert wait_for(marker.exists, 30)
+    pid = int(marker.read_text())
+    os.kill(pid, signal.SIGKILL)
+
+    survivors = [w for w in workers if w.pid != pid]
+    for worker in survivors:
+        worker.wait(timeout=60)
+        assert worker.returncode == 0
+    for worker in workers:
+        worker.wait(timeout=10)
+
+    done = (tmp_path / "done.txt").read_text().split()
+    assert sorted(done) == ["a", "b", "c", "d", "e", "hang"]
+    assert WorkQueue(tmp_path / "queue.sqlite").counts() == {"done": 6}
@@ -0,0 +1,323 @@
+# python3 -m wildfire_analyser.benchmark \
+#   --statistics-scales 10 20 30 \
+#   --statistics-max-pixels 1e9 1e13 \
+#   --days-before-after 1 3 \
+#   --cloud-thresholds 30 70 \
+#   --output benchmark.json
+#
+# Speed-versus-accuracy benchmark against the paper's Table 7.
+#
+# Runs the statistics deliverables of a paper preset for every combination
+# of the parameter grid, recording per configuration the runtime, the
+# number of Earth Engine calls and the error versus PAPER_TABLE_7_STATS
+# (percent of the ROI total area, as in compare_with_paper_table_7). The
+# report (JSON, or CSV for a .csv output) flags the Pareto frontier of
+# runtime against mean absolute error.
+#
+# Earth Engine caches identical computations server-side, so runtimes of
+# configurations that share windows and scale are optimistic after the
+# first one; compare orders of magnitude rather than seconds.
+
+import argparse
+import csv
+import itertools
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+from dotenv import load_dotenv
+
+from wildfire_analyser.client import (
+    PAPER_PRESETS,
+    PAPER_TABLE_7_STATS,
+    compare_with_paper_table_7,
+)
+from wildfire_analyser.fire_assessment.ee_client import get_client
+from wildfire_analyser.fire_assessment.post_fire_assessment import PostFireAssessment
+from wildfire_analyser.fire_assessment.products import (
+    DEFAULT_STATISTICS_MAX_PIXELS,
+    DEFAULT_STATISTICS_SCALE,
+)
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+DEFAULT_PRESET = "PAPER_DENIZ_FUSUN_RAMAZAN"
+DEFAULT_CLOUD_THRESHOLD = 70
+
+# Minimised together to build the Pareto frontier
+OBJECTIVES = ("runtime_s", "mean_abs_error_pct")
+
+CSV_FIELDS = [
+    "config",
+    "statistics_scale",
+    "statistics_max_pixels",
+    "days_before_after",
+    "cloud_threshold",
+    "status",
+    "runtime_s",
+    "ee_calls",
+    "mean_abs_error_pct",
+    "max_abs_error_pct",
+    "pareto",
+    "error",
+]
+
+
+def parameter_grid(
+    scales: Sequence[float],
+    max_pixels: Sequence[float],
+    days_before_after: Sequence[int | None],
+    cloud_thresholds: Sequence[int],
+) -> List[Dict[str, Any]]:
+    """
+    All combinations of the swept parameters. A `days_before_after` of
+    None keeps each preset run's own window.
+    """
+    return [
+        {
+            "statistics_scale": scale,
+            "statistics_max_pixels": pixels,
+            "days_before_after": days,
+            "cloud_threshold": cloud,
+        }
+        for scale, pixels, days, cloud in itertools.product(
+            scales, max_pixels, days_before_after, cloud_thresholds
+        )
+    ]
+
+
+def table_7_errors(name: str, statistics: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """
+    Percent error of every class against Table 7, per statistic of one
+    preset run.
+    """
+    errors = {}
+    for stat_name, values in statistics.items():
+        reference = PAPER_TABLE_7_STATS.get(name, {}).get(stat_name)
+        if reference is None:
+            continue
+        compared = compare_with_paper_table_7(values, reference)
+        errors[stat_name] = {
+            cls: item["percent_error"] for cls, item in compared.items()
+        }
+    return errors
+
+
+def run_configuration(
+    gee_key_json: str,
+    preset: Dict[str, Any],
+    config: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Run the statistics deliverables of every preset run with one
+    configuration.
+    """
+    deliverables = [
+        d for d in preset["deliverables"] if d.name.endswith("_AREA_STATISTICS")
+    ]
+    calls_before = get_client().total_calls()
+    start = time.perf_counter()
+
+    try:
+        errors = {}
+        for cfg in preset["runs"]:
+            days = config["days_before_after"]
+            # Runs one by one: clustered ROIs would share one grouped
+            # reduction without the maxPixels limit being swept.
+            result = PostFireAssessment(
+                gee_key_json=gee_key_json,
+                geojson_path=str(Path(cfg["roi"]).expanduser().resolve()),
+                start_date=cfg["start_date"],
+                end_date=cfg["end_date"],
+                deliverables=deliverables,
+                days_before_after=cfg["days_before_after"] if days is None else days,
+                cloud_threshold=config["cloud_threshold"],
+                statistics_scale=config["statistics_scale"],
+                statistics_max_pixels=config["statistics_max_pixels"],
+            ).run()
+            errors[cfg["name"]] = table_7_errors(cfg["name"], result["statistics"])
+    except Exception as e:
+        logger.warning("Configuration %s failed: %s", config, e)
+        return {
+            **config,
+            "status": "failed",
+            "runtime_s": round(time.perf_counter() - start, 2),
+            "ee_calls": get_client().total_calls() - calls_before,
+            "error": str(e),
+        }
+
+    values = [
+        abs(error)
+        for run in errors.values()
+        for stat in run.values()
+        for error in stat.values()
+    ]
+    if not values:
+        raise RuntimeError("No Table 7 reference statistics for this preset")
+
+    return {
+        **config,
+        "status": "ok",
+        "runtime_s": round(time.perf_counter() - start, 2),
+        "ee_calls": get_client().total_calls() - calls_before,
+        "mean_abs_error_pct": round(sum(values) / len(values), 3),
+        "max_abs_error_pct": round(max(values), 3),
+        "errors": errors,
+    }
+
+
+def pareto_frontier(
+    rows: List[Dict[str, Any]],
+    objectives: Sequence[str] = OBJECTIVES,
+) -> List[int]:
+    """
+    Indices of the successful rows not dominated by another one (no worse
+    on every objective and better on at least one).
+    """
+    candidates = [i for i, row in enumerate(rows) if row["status"] == "ok"]
+
+    def dominates(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+        return (
+            all(a[k] <= b[k] for k in objectives)
+            and any(a[k] < b[k] for k in objectives)
+        )
+
+    return [
+        i for i in candidates
+        if not any(dominates(rows[j], rows[i]) for j in candidates if j != i)
+    ]
+
+
+def write_report(
+    path: Path,
+    preset_name: str,
+    rows: List[Dict[str, Any]],
+    frontier: List[int],
+) -> None:
+    """
+    Write the report as CSV (one row per configuration, no per-class
+    errors) for a .csv path, JSON otherwise.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rows = [
+        {"config": i, **row, "pareto": i in frontier} for i, row in enumerate(rows)
+    ]
+
+    if path.suffix.lower() == ".csv":
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+        return
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "preset": preset_name,
+                "objectives": list(OBJECTIVES),
+                "configurations": rows,
+                "pareto": frontier,
+            },
+            f,
+            indent=2,
+        )
+
+
+def main():
+    logging.basicConfig(format="%(levelname)s:%(name)s:%(message)s")
+
+    parser = argparse.ArgumentParser(
+        description=(
+            "Sweep statistics scale, maxPixels, days_before_after and cloud "
+            "threshold over a paper preset and report runtime, EE calls and "
+            "error versus the paper's Table 7"
+        )
+    )
+    parser.add_argument(
+        "--preset",
+        default=DEFAULT_PRESET,
+        choices=sorted(PAPER_PRESETS),
+        help=f"Paper preset (default: {DEFAULT_PRESET})",
+    )
+    parser.add_argument(
+        "--statistics-scales",
+        nargs="+",
+        type=float,
+        default=[DEFAULT_STATISTICS_SCALE],
+        help="Statistics reduction scales (m) (default: 10)",
+    )
+    parser.add_argument(
+        "--statistics-max-pixels",
+        nargs="+",
+        type=float,
+        default=[DEFAULT_STATISTICS_MAX_PIXELS],
+        help="Statistics reduction maxPixels values (default: 1e13)",
+    )
+    parser.add_argument(
+        "--days-before-after",
+        nargs="+",
+        type=int,
+        help="Window lengths (days) (default: each preset run's own)",
+    )
+    parser.add_argument(
+        "--cloud-thresholds",
+        nargs="+",
+        type=int,
+        default=[DEFAULT_CLOUD_THRESHOLD],
+        help="Cloud thresholds (default: 70)",
+    )
+    parser.add_argument(
+        "--output",
+        default="benchmark.json",
+        help="Report path; .csv writes CSV, anything else JSON (default: benchmark.json)",
+    )
+
+    args = parser.parse_args()
+
+    load_dotenv()
+    gee_key_json = os.getenv("GEE_PRIVATE_KEY_JSON")
+    if not gee_key_json:
+        raise RuntimeError("GEE_PRIVATE_KEY_JSON not set")
+
+    preset = PAPER_PRESETS[args.preset]
+    grid = parameter_grid(
+        args.statistics_scales,
+        args.statistics_max_pixels,
+        args.days_before_after or [None],
+        args.cloud_thresholds,
+    )
+    logger.info("Benchmarking %s over %d configurations", args.preset, len(grid))
+
+    rows = []
+    for i, config in enumerate(grid):
+        row = run_configuration(gee_key_json, preset, config)
+        rows.append(row)
+        logger.info(
+            "[%d/%d] %s -> %s, %.2f s, %d EE calls, mean |err| %s%%",
+            i + 1, len(grid), config, row["status"], row["runtime_s"],
+            row["ee_calls"], row.get("mean_abs_error_pct", "-"),
+        )
+
+    frontier = pareto_frontier(rows)
+    write_report(Path(args.output), args.preset, rows, frontier)
+
+    logger.info("Pareto frontier (runtime vs mean |error|):")
+    for i in sorted(frontier, key=lambda i: rows[i]["runtime_s"]):
+        row = rows[i]
+        logger.info(
+            "  scale=%s maxPixels=%s days=%s cloud=%s | %.2f s | %d calls | "
+            "mean |err| %.3f%% | max |err| %.3f%%",
+            row["statistics_scale"], row["statistics_max_pixels"],
+            row["days_before_after"], row["cloud_threshold"],
+            row["runtime_s"], row["ee_calls"],
+            row["mean_abs_error_pct"], row["max_abs_error_pct"],
+        )
+    logger.info("Report written to %s", args.output)
+
+
+if __name__ == "__main__":
+    main()
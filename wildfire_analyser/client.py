@@ -1,3 +1,4 @@
+import json
 import logging
 import os
 from dotenv import load_dotenv
@@ -6,6 +7,31 @@ from pathlib import Path
 
 from wildfire_analyser.fire_assessment.post_fire_assessment import PostFireAssessment
 from wildfire_analyser.fire_assessment.deliverables import Deliverable
+from wildfire_analyser.fire_assessment.dependencies import Dependency
+from wildfire_analyser.fire_assessment.asset_checkpoints import (
+    DEFAULT_NODES as DEFAULT_CHECKPOINT_NODES,
+    AssetCheckpoints,
+)
+from wildfire_analyser.fire_assessment.cassette import RECORD, REPLAY, use_cassette
+from wildfire_analyser.fire_assessment.batch import (
+    CheckpointJournal,
+    open_result_sink,
+    run_batch,
+    run_queue,
+    shard_entries,
+)
+from wildfire_analyser.fire_assessment.work_queue import (
+    DEFAULT_LEASE_SECONDS,
+    WorkQueue,
+)
+from wildfire_analyser.fire_assessment.manifest import load_manifest
+from wildfire_analyser.fire_assessment.roi_catalogue import open_roi_catalogue
+from wildfire_analyser.fire_assessment.roi_clusters import DEFAULT_MAX_CLUSTER_KM
+from wildfire_analyser.fire_assessment.exporters.scheduler import ExportScheduler
+from wildfire_analyser.fire_assessment.time_windows import (
+    parse_window,
+    recovery_windows,
+)
 
 
 # ─────────────────────────────
@@ -168,6 +194,19 @@ def compare_with_paper_table_7(computed: dict, reference: dict):
 
     return result
 
+def roi_arguments(roi: str, roi_catalogue) -> dict:
+    """
+    PostFireAssessment ROI arguments for an ROI given as a catalogue
+    name or as a GeoJSON path.
+    """
+    if roi_catalogue is not None and roi in roi_catalogue:
+        return {"geojson_path": None, "roi_geometry": roi_catalogue.geometry(roi)}
+
+    path = Path(roi).expanduser().resolve()
+    if not path.exists():
+        raise FileNotFoundError(f"GeoJSON not found: {path}")
+    return {"geojson_path": str(path)}
+
 # ─────────────────────────────
 # Main
 # ─────────────────────────────
@@ -177,12 +216,8 @@ def main():
         load_dotenv()
 
         gee_key_json = os.getenv("GEE_PRIVATE_KEY_JSON")
-        if not gee_key_json:
-            raise RuntimeError("GEE_PRIVATE_KEY_JSON not set")
 
         gcs_bucket_name = os.getenv("GCS_BUCKET_NAME")
-        if not gcs_bucket_name:
-            raise RuntimeError("GCS_BUCKET_NAME not set")
 
         parser = argparse.ArgumentParser(
             description="Post-fire assessment using Google Earth Engine"
@@ -219,8 +254,374 @@ def main():
             ),
         )
 
+        parser.add_argument(
+            "--output-dir",
+            help=(
+                "Download scientific GeoTIFFs directly to this directory "
+                "instead of exporting them to GCS"
+            ),
+        )
+
+        parser.add_argument(
+            "--image-store",
+            help=(
+                "Directory of the local image store. Visual thumbnails are "
+                "downloaded and cached there, keyed by their inputs"
+            ),
+        )
+
+        parser.add_argument(
+            "--visual-mode",
+            choices=["thumbnail", "tiles", "local"],
+            default="thumbnail",
+            help=(
+                "How visual deliverables are returned: a 1024 px JPEG "
+                "thumbnail URL, an XYZ tile URL template, or a PNG rendered "
+                "locally from the downloaded index raster (requires "
+                "--output-dir) (default: thumbnail)"
+            ),
+        )
+
+        parser.add_argument(
+            "--tile-proxy",
+            help=(
+                "URL of a running wildfire_analyser.tile_proxy. XYZ layers "
+                "are registered there and served through its tile cache"
+            ),
+        )
+
+        parser.add_argument(
+            "--post-windows",
+            nargs="+",
+            help=(
+                "Recovery time series: inclusive post-fire windows as "
+                "START:END (YYYY-MM-DD:YYYY-MM-DD). Only statistics "
+                "deliverables are computed, against one shared pre-fire baseline"
+            ),
+        )
+
+        parser.add_argument(
+            "--recovery-months",
+            nargs="+",
+            type=int,
+            help=(
+                "Recovery time series: post-fire windows starting N months "
+                "after --end-date, each --days-before-after days long. "
+                "Example: --recovery-months 1 3 6 12"
+            ),
+        )
+
+        parser.add_argument(
+            "--max-scenes-per-window",
+            type=int,
+            help=(
+                "Keep only the N least cloudy scenes per MGRS tile in each "
+                "pre/post-fire window (default: all scenes under the threshold)"
+            ),
+        )
+
+        parser.add_argument(
+            "--complete-coverage",
+            action="store_true",
+            help=(
+                "With --max-scenes-per-window, add further scenes (least cloudy "
+                "first) only until the ROI is fully covered"
+            ),
+        )
+
+        parser.add_argument(
+            "--max-cluster-km",
+            type=float,
+            default=DEFAULT_MAX_CLUSTER_KM,
+            help=(
+                "Paper preset mode: ROIs with the same windows within this "
+                "extent share one collection, mosaic and statistics request "
+                f"(default: {DEFAULT_MAX_CLUSTER_KM}; 0 disables clustering)"
+            ),
+        )
+
+        parser.add_argument(
+            "--roi-catalogue",
+            help=(
+                "GeoPackage / FlatGeobuf ROI catalogue (see "
+                "wildfire_analyser.roi_catalogue); --roi and manifest 'roi' "
+                "entries may then be catalogue ROI names"
+            ),
+        )
+
+        parser.add_argument(
+            "--scene-catalogue",
+            help=(
+                "Path to a local SQLite Sentinel-2 scene catalogue; scene "
+                "metadata is synced incrementally and windows are selected "
+                "client-side from it"
+            ),
+        )
+
+        parser.add_argument(
+            "--preflight",
+            action="store_true",
+            help=(
+                "Check scene counts and ROI coverage of both windows before "
+                "running, and fail fast (or widen) if coverage is insufficient"
+            ),
+        )
+
+        parser.add_argument(
+            "--min-coverage",
+            type=float,
+            default=0.99,
+            help="Minimum ROI coverage fraction per window for --preflight (default: 0.99)",
+        )
+
+        parser.add_argument(
+            "--max-days-before-after",
+            type=int,
+            help="With --preflight, widen --days-before-after step by step up to this limit",
+        )
+
+        parser.add_argument(
+            "--max-cloud-threshold",
+            type=int,
+            help="With --preflight, raise --cloud-threshold step by step up to this limit",
+        )
+
+        parser.add_argument(
+            "--max-running-exports",
+            type=int,
+            help=(
+                "Queue GCS exports client-side and keep at most N of them "
+                "running at a time (batch runs are queued behind interactive ones)"
+            ),
+        )
+
+        parser.add_argument(
+            "--partition-cell-km",
+            type=float,
+            help=(
+                "Compute statistics per grid cell of this size (km), concurrently, "
+                "and merge them; 0 disables (default: automatic for ROIs above "
+                "10 000 km2)"
+            ),
+        )
+
+        parser.add_argument(
+            "--statistics-scale",
+            type=float,
+            help="Scale (m) of the area statistics reductions (default: 10)",
+        )
+
+        parser.add_argument(
+            "--statistics-max-pixels",
+            type=float,
+            help="maxPixels of the area statistics reductions (default: 1e13)",
+        )
+
+        parser.add_argument(
+            "--perimeter-scale",
+            type=float,
+            help="*_BURN_PERIMETERS: vectorisation scale in metres (default: 30)",
+        )
+
+        parser.add_argument(
+            "--perimeter-tile-scale",
+            type=float,
+            help="*_BURN_PERIMETERS: reduceToVectors tileScale (default: 4)",
+        )
+
+        parser.add_argument(
+            "--min-mapping-unit-ha",
+            type=float,
+            default=1.0,
+            help="*_BURN_PERIMETERS: drop patches smaller than this (default: 1 ha)",
+        )
+
+        parser.add_argument(
+            "--simplify-tolerance",
+            type=float,
+            help="*_BURN_PERIMETERS: simplification tolerance in metres (default: the scale)",
+        )
+
+        parser.add_argument(
+            "--perimeter-format",
+            choices=["geojson", "flatgeobuf"],
+            default="geojson",
+            help="*_BURN_PERIMETERS file format with --output-dir (default: geojson)",
+        )
+
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help=(
+                "Print the execution plan and estimated cost (ROI size, scenes "
+                "per window, Earth Engine calls) without running anything"
+            ),
+        )
+
+        cassette_group = parser.add_mutually_exclusive_group()
+        cassette_group.add_argument(
+            "--record-cassette",
+            metavar="PATH",
+            help="Record every Earth Engine response of the run to a cassette file",
+        )
+        cassette_group.add_argument(
+            "--replay-cassette",
+            metavar="PATH",
+            help=(
+                "Serve Earth Engine responses from a recorded cassette "
+                "(no credentials or network needed)"
+            ),
+        )
+
+        parser.add_argument(
+            "--asset-checkpoints",
+            metavar="FOLDER",
+            help=(
+                "Earth Engine asset folder (e.g. projects/<project>/assets/"
+                "checkpoints) where expensive nodes are exported once and "
+                "reused by later runs"
+            ),
+        )
+
+        parser.add_argument(
+            "--asset-checkpoint-nodes",
+            nargs="+",
+            default=[dep.name for dep in DEFAULT_CHECKPOINT_NODES],
+            help=(
+                "DAG nodes to checkpoint (default: "
+                f"{' '.join(dep.name for dep in DEFAULT_CHECKPOINT_NODES)})"
+            ),
+        )
+
+        parser.add_argument(
+            "--asset-manifest",
+            default="asset_checkpoints.sqlite",
+            help="Local manifest of the asset checkpoints (default: asset_checkpoints.sqlite)",
+        )
+
+        parser.add_argument(
+            "--asset-max-age-days",
+            type=float,
+            help="Evict checkpoints not used for this many days",
+        )
+
+        parser.add_argument(
+            "--asset-max-count",
+            type=int,
+            help="Keep at most this many checkpoints (least recently used are evicted)",
+        )
+
+        parser.add_argument(
+            "--task-registry",
+            help=(
+                "Record GCS exports in this SQLite task registry, monitored by "
+                "'gee_task_monitor --registry' to notify requesters"
+            ),
+        )
+
+        parser.add_argument(
+            "--requester",
+            help="With --task-registry, email address notified when exports finish",
+        )
+
+        parser.add_argument(
+            "--notify-webhook",
+            help="With --task-registry, URL POSTed a JSON notice when exports finish",
+        )
+
+        parser.add_argument(
+            "--manifest",
+            help=(
+                "Batch mode: JSON manifest of runs (name, roi, start_date, "
+                "end_date and optional days_before_after / cloud_threshold)"
+            ),
+        )
+
+        parser.add_argument(
+            "--results",
+            help=(
+                "Batch mode: append one record per finished run to this "
+                "results sink (*.jsonl file, or a Parquet dataset directory)"
+            ),
+        )
+
+        parser.add_argument(
+            "--checkpoint",
+            help=(
+                "Batch mode: checkpoint journal; runs already completed "
+                "with the same parameters are skipped on restart"
+            ),
+        )
+
+        parser.add_argument(
+            "--shard-index",
+            type=int,
+            help="Batch mode: run only this shard of the manifest (0-based)",
+        )
+
+        parser.add_argument(
+            "--shard-count",
+            type=int,
+            help="Batch mode: total number of shards (hash partition by run name)",
+        )
+
+        parser.add_argument(
+            "--work-queue",
+            help=(
+                "Batch mode: SQLite work queue on a directory shared by all "
+                "workers; each worker claims runs until none is left"
+            ),
+        )
+
+        parser.add_argument(
+            "--lease-seconds",
+            type=float,
+            default=DEFAULT_LEASE_SECONDS,
+            help=(
+                "Batch mode: work-queue lease; runs of crashed workers are "
+                f"reclaimed after it expires (default: {DEFAULT_LEASE_SECONDS})"
+            ),
+        )
+
         args = parser.parse_args()
 
+        if args.complete_coverage and not args.max_scenes_per_window:
+            parser.error("--complete-coverage requires --max-scenes-per-window")
+
+        if args.record_cassette:
+            use_cassette(args.record_cassette, RECORD)
+        elif args.replay_cassette:
+            use_cassette(args.replay_cassette, REPLAY)
+
+        if not gee_key_json and not args.replay_cassette:
+            raise RuntimeError("GEE_PRIVATE_KEY_JSON not set")
+
+        if not gcs_bucket_name and not args.output_dir:
+            raise RuntimeError("GCS_BUCKET_NAME not set")
+
+        roi_catalogue = (
+            open_roi_catalogue(args.roi_catalogue) if args.roi_catalogue else None
+        )
+
+        asset_checkpoints = None
+        if args.asset_checkpoints:
+            try:
+                nodes = [Dependency[name.upper()] for name in args.asset_checkpoint_nodes]
+            except KeyError as e:
+                raise ValueError(f"Invalid checkpoint node '{e.args[0]}'")
+            asset_checkpoints = AssetCheckpoints(
+                args.asset_checkpoints,
+                args.asset_manifest,
+                nodes=nodes,
+                max_age_days=args.asset_max_age_days,
+                max_assets=args.asset_max_count,
+            )
+
+        scheduler = (
+            ExportScheduler(max_running=args.max_running_exports)
+            if args.max_running_exports else None
+        )
+
         # ─────────────────────────────
         # PAPER PRESET MODE
         # ─────────────────────────────
@@ -243,31 +644,55 @@ def main():
 
             logger.info("Number of runs: %d", len(runs))
 
+            # Runners are built first so neighbouring ROIs with the same
+            # windows can share collections, mosaics and statistics requests.
+            runners = []
             for cfg in runs:
-                logger.info("────────────────────────────────────")
-                logger.info("Processing %s", cfg["name"])
-
                 roi_path = Path(cfg["roi"]).expanduser().resolve()
                 if not roi_path.exists():
                     raise FileNotFoundError(f"GeoJSON not found: {roi_path}")
 
-                runner = PostFireAssessment(
+                runners.append(PostFireAssessment(
                     gee_key_json=gee_key_json,
                     geojson_path=str(roi_path),
                     start_date=cfg["start_date"],
                     end_date=cfg["end_date"],
                     days_before_after=cfg["days_before_after"],
                     cloud_threshold=args.cloud_threshold, 
+                    max_scenes_per_window=args.max_scenes_per_window,
+                    complete_coverage=args.complete_coverage,
+                    scene_catalogue=args.scene_catalogue,
+                    partition_cell_km=args.partition_cell_km,
+                    statistics_scale=args.statistics_scale,
+                    statistics_max_pixels=args.statistics_max_pixels,
+                    perimeter_scale=args.perimeter_scale,
+                    perimeter_tile_scale=args.perimeter_tile_scale,
+                    min_mapping_unit_ha=args.min_mapping_unit_ha,
+                    simplify_tolerance=args.simplify_tolerance,
+                    perimeter_format=args.perimeter_format,
+                    preflight=args.preflight,
+                    min_coverage=args.min_coverage,
+                    max_days_before_after=args.max_days_before_after,
+                    max_cloud_threshold=args.max_cloud_threshold,
                     deliverables=preset["deliverables"],
                     gcs_bucket=gcs_bucket_name,
+                    asset_checkpoints=asset_checkpoints,
+                    output_dir=args.output_dir,
+                    image_store_dir=args.image_store,
+                    visual_mode=args.visual_mode,
+                    tile_proxy_url=args.tile_proxy,
                     verbose=True,
-                )
+                ))
 
-                result = runner.run()
+            results = PostFireAssessment.run_many(runners, args.max_cluster_km)
+
+            for cfg, result in zip(runs, results):
+                logger.info("────────────────────────────────────")
+                logger.info("Processing %s", cfg["name"])
 
                 logger.info("Visual outputs:")
                 for name, item in result["visual"].items():
-                    logger.info("  %s -> %s", name, item["url"])
+                    logger.info("  %s -> %s", name, item.get("path") or item["url"])
 
                 logger.info("Statistics:")
                 for stat_name, stat_value in result["statistics"].items():
@@ -322,54 +747,266 @@ def main():
         else:
             deliverables = list(Deliverable)
 
+        # ─────────────────────────────
+        # BATCH (MANIFEST) MODE
+        # ─────────────────────────────
+
+        if args.manifest:
+            entries = load_manifest(args.manifest, roi_catalogue)
+
+            if (args.shard_index is None) != (args.shard_count is None):
+                raise ValueError("--shard-index and --shard-count go together")
+            if args.shard_count is not None:
+                entries = shard_entries(entries, args.shard_index, args.shard_count)
+                logger.info(
+                    "Shard %d/%d: %d runs",
+                    args.shard_index,
+                    args.shard_count,
+                    len(entries),
+                )
+
+            # Everything that changes the outputs of a run is part of the
+            # checkpoint key, so changed parameters never skip stale jobs.
+            params = {
+                "deliverables": [d.name for d in deliverables],
+                "days_before_after": args.days_before_after,
+                "cloud_threshold": args.cloud_threshold,
+                "max_scenes_per_window": args.max_scenes_per_window,
+                "complete_coverage": args.complete_coverage,
+                "preflight": args.preflight,
+                "min_coverage": args.min_coverage,
+                "max_days_before_after": args.max_days_before_after,
+                "max_cloud_threshold": args.max_cloud_threshold,
+                "output_dir": args.output_dir,
+                "visual_mode": args.visual_mode,
+                "statistics_scale": args.statistics_scale,
+                "statistics_max_pixels": args.statistics_max_pixels,
+            }
+            # Restored checkpoints are resampled to their export grid
+            if asset_checkpoints is not None:
+                params["asset_checkpoints"] = {
+                    "nodes": sorted(dep.name for dep in asset_checkpoints.nodes),
+                    "crs": asset_checkpoints.crs,
+                    "scale": asset_checkpoints.scale,
+                }
+            if any(d.name.endswith("_BURN_PERIMETERS") for d in deliverables):
+                params["perimeters"] = {
+                    "scale": args.perimeter_scale,
+                    "tile_scale": args.perimeter_tile_scale,
+                    "min_mapping_unit_ha": args.min_mapping_unit_ha,
+                    "simplify_tolerance": args.simplify_tolerance,
+                    "format": args.perimeter_format,
+                }
+
+            def make_runner(entry):
+                return PostFireAssessment(
+                    gee_key_json=gee_key_json,
+                    **roi_arguments(entry["roi"], roi_catalogue),
+                    start_date=entry["start_date"],
+                    end_date=entry["end_date"],
+                    days_before_after=entry.get(
+                        "days_before_after", args.days_before_after
+                    ),
+                    cloud_threshold=entry.get("cloud_threshold", args.cloud_threshold),
+                    max_scenes_per_window=args.max_scenes_per_window,
+                    complete_coverage=args.complete_coverage,
+                    scene_catalogue=args.scene_catalogue,
+                    partition_cell_km=args.partition_cell_km,
+                    statistics_scale=args.statistics_scale,
+                    statistics_max_pixels=args.statistics_max_pixels,
+                    perimeter_scale=args.perimeter_scale,
+                    perimeter_tile_scale=args.perimeter_tile_scale,
+                    min_mapping_unit_ha=args.min_mapping_unit_ha,
+                    simplify_tolerance=args.simplify_tolerance,
+                    perimeter_format=args.perimeter_format,
+                    preflight=args.preflight,
+                    min_coverage=args.min_coverage,
+                    max_days_before_after=args.max_days_before_after,
+                    max_cloud_threshold=args.max_cloud_threshold,
+                    deliverables=deliverables,
+                    gcs_bucket=gcs_bucket_name,
+                    export_scheduler=scheduler,
+                    export_priority="bulk",
+                    asset_checkpoints=asset_checkpoints,
+                    task_registry=args.task_registry,
+                    requester=args.requester,
+                    notify_webhook=args.notify_webhook,
+                    output_dir=args.output_dir,
+                    image_store_dir=args.image_store,
+                    visual_mode=args.visual_mode,
+                    tile_proxy_url=args.tile_proxy,
+                    verbose=True,
+                )
+
+            if args.dry_run:
+                totals = {}
+                for entry in entries:
+                    plan = make_runner(entry).explain()
+                    for call_class, n in plan["calls"].items():
+                        totals[call_class] = totals.get(call_class, 0) + n
+                    logger.info(
+                        "  %-24s | %10.2f ha | %12d px (statistics at %g m) | "
+                        "scenes pre=%d post=%d | calls=%d",
+                        entry["name"],
+                        plan["roi"]["area_ha"],
+                        plan["statistics"]["pixels"],
+                        plan["statistics"]["scale_m"],
+                        plan["windows"]["pre_fire"]["scenes"],
+                        plan["windows"]["post_fire"]["scenes"],
+                        sum(plan["calls"].values()),
+                    )
+                logger.info("Dry run of %d runs, Earth Engine calls: %s", len(entries), totals)
+                return
+
+            sink = open_result_sink(args.results) if args.results else None
+            journal = CheckpointJournal(args.checkpoint) if args.checkpoint else None
+
+            if args.work_queue:
+                summary = run_queue(
+                    WorkQueue(args.work_queue, lease_seconds=args.lease_seconds),
+                    entries,
+                    make_runner,
+                    params,
+                    sink=sink,
+                    journal=journal,
+                )
+            else:
+                summary = run_batch(
+                    entries, make_runner, params, sink=sink, journal=journal
+                )
+
+            if scheduler is not None:
+                logger.info("Submitting %d queued exports", scheduler.pending())
+                scheduler.close()
+
+            logger.info(
+                "Batch finished: %d completed, %d skipped, %d failed",
+                summary["completed"],
+                summary["skipped"],
+                summary["failed"],
+            )
+            return
+
         if not args.roi or not args.start_date or not args.end_date:
             raise ValueError("--roi, --start-date and --end-date are required")
 
-        geojson_path = Path(args.roi).expanduser().resolve()
-        if not geojson_path.exists():
-            raise FileNotFoundError(f"GeoJSON not found: {geojson_path}")
-
         runner = PostFireAssessment(
             gee_key_json=gee_key_json,
-            geojson_path=str(geojson_path),
+            **roi_arguments(args.roi, roi_catalogue),
             start_date=args.start_date,
             end_date=args.end_date,
             days_before_after=args.days_before_after,
             cloud_threshold=args.cloud_threshold, 
+            max_scenes_per_window=args.max_scenes_per_window,
+            complete_coverage=args.complete_coverage,
+            scene_catalogue=args.scene_catalogue,
+            partition_cell_km=args.partition_cell_km,
+            statistics_scale=args.statistics_scale,
+            statistics_max_pixels=args.statistics_max_pixels,
+            perimeter_scale=args.perimeter_scale,
+            perimeter_tile_scale=args.perimeter_tile_scale,
+            min_mapping_unit_ha=args.min_mapping_unit_ha,
+            simplify_tolerance=args.simplify_tolerance,
+            perimeter_format=args.perimeter_format,
+            preflight=args.preflight,
+            min_coverage=args.min_coverage,
+            max_days_before_after=args.max_days_before_after,
+            max_cloud_threshold=args.max_cloud_threshold,
             deliverables=deliverables,
             gcs_bucket=gcs_bucket_name,
+            export_scheduler=scheduler,
+            asset_checkpoints=asset_checkpoints,
+            task_registry=args.task_registry,
+            requester=args.requester,
+            notify_webhook=args.notify_webhook,
+            output_dir=args.output_dir,
+            image_store_dir=args.image_store,
+            visual_mode=args.visual_mode,
+            tile_proxy_url=args.tile_proxy,
             verbose=True,
         )
 
+        if args.dry_run:
+            logger.info("Dry run:\n%s", json.dumps(runner.explain(), indent=2))
+            return
+
+        # ─────────────────────────────
+        # RECOVERY TIME SERIES MODE
+        # ─────────────────────────────
+
+        if args.post_windows or args.recovery_months:
+            post_windows = [parse_window(w) for w in args.post_windows or []]
+            if args.recovery_months:
+                post_windows += recovery_windows(
+                    args.end_date, args.recovery_months, args.days_before_after
+                )
+
+            series = runner.run_time_series(post_windows)
+
+            logger.info("Recovery time series:")
+            for row in series["table"]:
+                logger.info(
+                    "  %s..%s | %-22s | %-20s | Area (ha): %8.2f | Ratio (%%): %6.2f",
+                    row["window_start"],
+                    row["window_end"],
+                    row["statistic"],
+                    row["class"],
+                    row["area_ha"],
+                    row["ratio_percent"],
+                )
+            return
+
         result = runner.run()
 
+        if scheduler is not None:
+            scheduler.close()
+            for name, handle in runner.export_handles.items():
+                result["scientific"][name].update(handle.as_dict())
+
         # ─────────────────────────────
         # Provenance (GEE images used)
         # ─────────────────────────────
 
         prov = result.get("provenance", {})
 
+        preflight = prov.get("preflight")
+        if preflight:
+            logger.info(
+                "Preflight: days_before_after=%d cloud_threshold=%d%s",
+                preflight["days_before_after"],
+                preflight["cloud_threshold"],
+                " (widened)" if preflight["widened"] else "",
+            )
+
         logger.info("Pre-fire images used:")
         for img in prov.get("pre_fire", {}).get("images", []):
             logger.info(
-                "  %s | %s | cloud=%.1f",
+                "  %s | %s | tile=%s | cloud=%.1f",
                 img["date"],
                 img["id"],
+                img.get("tile"),
                 img["cloud_percent"],
             )
 
         logger.info("Post-fire images used:")
         for img in prov.get("post_fire", {}).get("images", []):
             logger.info(
-                "  %s | %s | cloud=%.1f",
+                "  %s | %s | tile=%s | cloud=%.1f",
                 img["date"],
                 img["id"],
+                img.get("tile"),
                 img["cloud_percent"],
             )
 
         if result["scientific"]:
             logger.info("Scientific outputs:")
             for name, item in result["scientific"].items():
+                if "path" in item:
+                    logger.info("  %s -> %s", name, item["path"])
+                    continue
+                if "geojson" in item:
+                    logger.info("  %s -> inline GeoJSON (%d features)", name, item["features"])
+                    continue
                 logger.info(
                     "  %s -> %s (gee_task_id=%s)",
                     name,
@@ -379,7 +1016,7 @@ def main():
 
         logger.info("Visual outputs:")
         for name, item in result["visual"].items():
-            logger.info("  %s -> %s", name, item["url"])
+            logger.info("  %s -> %s", name, item.get("path") or item["url"])
 
         logger.info("Statistics:")
         for stat_name, stat_value in result["statistics"].items():
@@ -0,0 +1,325 @@
+# wildfire_analyser/fire_assessment/asset_checkpoints.py
+#
+# Earth Engine asset checkpoints of expensive DAG nodes.
+#
+# Selected image nodes (e.g. PRE_FIRE_MOSAIC, DNBR) are exported once to an
+# asset whose id ends with a hash of everything that determines the node
+# (ROI, dates, window and scene settings, export grid). Later runs, from
+# any user sharing the asset folder, load the node with ee.Image(asset_id)
+# instead of rebuilding it from raw scenes. A local SQLite manifest tracks
+# the checkpoints (exporting / ready, last use), so ready nodes are loaded
+# without any request, and drives the eviction of old assets.
+
+import logging
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
+
+import ee
+
+from wildfire_analyser.fire_assessment.dependencies import Dependency
+from wildfire_analyser.fire_assessment.ee_client import get_client
+from wildfire_analyser.fire_assessment.exporters.local import utm_crs
+from wildfire_analyser.fire_assessment.fingerprint import fingerprint
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NODES = (Dependency.PRE_FIRE_MOSAIC, Dependency.DNBR)
+DEFAULT_SCALE = 10  # m
+
+REFLECTANCE_BANDS = ["B2_refl", "B3_refl", "B4_refl", "B8_refl", "B12_refl"]
+
+# Image nodes that can be checkpointed, with the bands kept in the asset
+# (None: all bands). Mosaic consumers only read the reflectance bands.
+CHECKPOINTABLE: Dict[Dependency, List[str] | None] = {
+    Dependency.PRE_FIRE_MOSAIC: REFLECTANCE_BANDS,
+    Dependency.POST_FIRE_MOSAIC: REFLECTANCE_BANDS,
+    Dependency.RGB_PRE_FIRE: None,
+    Dependency.RGB_POST_FIRE: None,
+    Dependency.NDVI_PRE_FIRE: None,
+    Dependency.NDVI_POST_FIRE: None,
+    Dependency.NBR_PRE_FIRE: None,
+    Dependency.NBR_POST_FIRE: None,
+    Dependency.DNDVI: None,
+    Dependency.DNBR: None,
+    Dependency.RBR: None,
+    Dependency.DNBR_SEVERITY: None,
+    Dependency.DNDVI_SEVERITY: None,
+    Dependency.RBR_SEVERITY: None,
+}
+
+# Class images are pyramided by mode, continuous ones by mean
+CLASS_NODES = {
+    Dependency.DNBR_SEVERITY,
+    Dependency.DNDVI_SEVERITY,
+    Dependency.RBR_SEVERITY,
+}
+
+# Context inputs that determine the content of a node
+NODE_INPUTS = (
+    "start_date",
+    "end_date",
+    "cloud_threshold",
+    "days_before_after",
+    "max_scenes_per_window",
+    "complete_coverage",
+    "post_fire_window",
+)
+
+EXPORTING = "EXPORTING"
+READY = "READY"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    asset_id TEXT PRIMARY KEY,
+    node TEXT NOT NULL,
+    task_id TEXT,
+    state TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS assets_state ON assets (state, last_used_at);
+"""
+
+
+class AssetCheckpoints:
+    """
+    Asset checkpoints of DAG nodes under an EE asset folder, tracked in a
+    local SQLite manifest.
+
+    `max_age_days` / `max_assets` set the eviction policy applied each
+    time a new checkpoint is exported (see evict). Without `crs`, each
+    checkpoint is exported in the UTM zone of its ROI, like the GCS and
+    local GeoTIFF exports.
+    """
+
+    def __init__(
+        self,
+        folder: str,
+        manifest: str | Path,
+        nodes: Iterable[Dependency] = DEFAULT_NODES,
+        crs: str | None = None,
+        scale: float = DEFAULT_SCALE,
+        max_age_days: float | None = None,
+        max_assets: int | None = None,
+    ):
+        self.folder = folder.rstrip("/")
+        self.nodes = set(nodes)
+        unsupported = [dep.name for dep in self.nodes if dep not in CHECKPOINTABLE]
+        if unsupported:
+            raise ValueError(
+                f"Nodes cannot be checkpointed: {', '.join(unsupported)} "
+                f"(valid: {', '.join(dep.name for dep in CHECKPOINTABLE)})"
+            )
+        self.crs = crs
+        self.scale = scale
+        self.max_age_days = max_age_days
+        self.max_assets = max_assets
+        self._folder_checked = False
+
+        self.path = Path(manifest)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def asset_id(self, dep: Dependency, context) -> str:
+        """
+        Deterministic asset id of a node for the inputs of `context`.
+        """
+        inputs = context.inputs
+        digest = fingerprint({
+            "node": dep.name,
+            "roi": inputs["roi_geometry"],
+            **{key: inputs.get(key) for key in NODE_INPUTS},
+            "crs": self._crs(context),
+            "scale": self.scale,
+        })
+        return f"{self.folder}/{dep.name.lower()}_{digest[:20]}"
+
+    def _crs(self, context) -> str:
+        return self.crs or utm_crs(context.inputs["roi_geometry"])
+
+    # ─────────────────────────────
+    # DAG hooks (see resolver.execute_dependencies)
+    # ─────────────────────────────
+
+    def restore(self, dep: Dependency, context) -> bool:
+        """
+        Seed the context cache with the node's checkpoint if it is ready.
+        """
+        if dep not in self.nodes or dep in context.cache:
+            return False
+
+        asset_id = self.asset_id(dep, context)
+        if not self._is_ready(dep, asset_id):
+            return False
+
+        logger.info("[CHECKPOINT] %s loaded from %s", dep.name, asset_id)
+        context.set(dep, ee.Image(asset_id))
+        return True
+
+    def save(self, dep: Dependency, image: ee.Image, context) -> str | None:
+        """
+        Start the export of a freshly computed node, unless its checkpoint
+        is already exporting. Returns the task id of a new export.
+        """
+        if dep not in self.nodes:
+            return None
+
+        asset_id = self.asset_id(dep, context)
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT state FROM assets WHERE asset_id = ?", (asset_id,)
+            ).fetchone()
+        if row is not None:
+            return None
+
+        self._ensure_folder()
+
+        bands = CHECKPOINTABLE[dep]
+        if bands is not None:
+            image = image.select(bands)
+
+        if dep in CLASS_NODES:
+            image, policy = image.toInt8(), "mode"
+        else:
+            image, policy = image.toFloat(), "mean"
+
+        task = ee.batch.Export.image.toAsset(
+            image=image,
+            description=asset_id.rsplit("/", 1)[-1],
+            assetId=asset_id,
+            region=context.inputs["roi"],
+            crs=self._crs(context),
+            scale=self.scale,
+            maxPixels=1e13,
+            pyramidingPolicy={".default": policy},
+        )
+        get_client().start_task(task)
+
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO assets
+                    (asset_id, node, task_id, state, created_at, last_used_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (asset_id, dep.name, task.id, EXPORTING, now, now),
+            )
+
+        logger.info("[CHECKPOINT] Exporting %s to %s (task %s)", dep.name, asset_id, task.id)
+
+        if self.max_age_days is not None or self.max_assets is not None:
+            self.evict()
+        return task.id
+
+    # ─────────────────────────────
+    # Manifest
+    # ─────────────────────────────
+
+    def _is_ready(self, dep: Dependency, asset_id: str) -> bool:
+        """
+        Whether a checkpoint can be loaded: ready in the manifest, its
+        export has completed since, or (e.g. created by another user) the
+        asset exists in Earth Engine.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT state, task_id FROM assets WHERE asset_id = ?", (asset_id,)
+            ).fetchone()
+
+        if row is not None and row["state"] == EXPORTING:
+            status = get_client().task_status(row["task_id"])[0]
+            state = status.get("state")
+            if state in ("FAILED", "CANCELLED"):
+                logger.warning(
+                    "[CHECKPOINT] Export of %s %s: %s",
+                    asset_id, state.lower(), status.get("error_message"),
+                )
+                self._forget(asset_id)
+                return False
+            if state != "COMPLETED":
+                return False
+        elif row is None and get_client().get_asset(asset_id) is None:
+            return False
+
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO assets (asset_id, node, task_id, state, created_at, last_used_at)
+                VALUES (?, ?, NULL, ?, ?, ?)
+                ON CONFLICT (asset_id) DO UPDATE SET state = ?, last_used_at = ?
+                """,
+                (asset_id, dep.name, READY, now, now, READY, now),
+            )
+        return True
+
+    def _forget(self, asset_id: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM assets WHERE asset_id = ?", (asset_id,))
+
+    def _ensure_folder(self) -> None:
+        if self._folder_checked:
+            return
+        if get_client().get_asset(self.folder) is None:
+            logger.info("[CHECKPOINT] Creating asset folder %s", self.folder)
+            get_client().create_folder(self.folder)
+        self._folder_checked = True
+
+    def checkpoints(self) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM assets ORDER BY last_used_at DESC"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def evict(
+        self,
+        max_age_days: float | None = None,
+        max_assets: int | None = None,
+    ) -> List[str]:
+        """
+        Delete ready checkpoints not used for `max_age_days`, then the
+        least recently used ones beyond `max_assets` (both default to the
+        instance policy). Exports still running are left alone. Returns the
+        deleted asset ids.
+        """
+        if max_age_days is None:
+            max_age_days = self.max_age_days
+        if max_assets is None:
+            max_assets = self.max_assets
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT asset_id, last_used_at FROM assets WHERE state = ? "
+                "ORDER BY last_used_at DESC",
+                (READY,),
+            ).fetchall()
+
+        cutoff = time.time() - max_age_days * 86400 if max_age_days is not None else None
+        evicted = []
+        for i, row in enumerate(rows):
+            expired = cutoff is not None and row["last_used_at"] < cutoff
+            surplus = max_assets is not None and i >= max_assets
+            if expired or surplus:
+                get_client().delete_asset(row["asset_id"])
+                self._forget(row["asset_id"])
+                evicted.append(row["asset_id"])
+
+        if evicted:
+            logger.info("[CHECKPOINT] Evicted %d assets", len(evicted))
+        return evicted
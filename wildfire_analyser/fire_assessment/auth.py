@@ -4,10 +4,39 @@ import json
 from dotenv import load_dotenv
 from google.oauth2.service_account import Credentials
 
+from wildfire_analyser.fire_assessment.cassette import REPLAY, active_cassette
+
+SCOPES = [
+    "https://www.googleapis.com/auth/earthengine",
+    # Leitura dos objetos exportados (ver exporters.gcs)
+    "https://www.googleapis.com/auth/devstorage.read_only",
+]
+
+_credentials: Credentials | None = None
+
+
+def gee_credentials() -> Credentials | None:
+    """
+    Credenciais da service account usadas na última autenticação (None
+    antes dela ou em modo replay).
+    """
+    return _credentials
+
+
 def authenticate_gee(env_path: str | None = None) -> None:
     """
     Autentica no Google Earth Engine usando o método moderno com Scopes explícitos.
+
+    Com um cassette em modo replay ativo, inicializa o EE offline (sem
+    credenciais); em modo record, grava as assinaturas dos algoritmos.
     """
+    global _credentials
+
+    cassette = active_cassette()
+    if cassette is not None and cassette.mode == REPLAY:
+        cassette.initialize_offline()
+        return
+
     # Tenta carregar variáveis de ambiente (se já não estiverem carregadas)
     if env_path and os.path.exists(env_path):
         load_dotenv(env_path)
@@ -36,17 +65,19 @@ def authenticate_gee(env_path: str | None = None) -> None:
 
     # 3. Autentica com os ESCOPOS CORRETOS (A correção principal está aqui)
     try:
-        SCOPES = ['https://www.googleapis.com/auth/earthengine']
-        
         credentials = Credentials.from_service_account_info(
             key_dict, 
             scopes=SCOPES
         )
         
         ee.Initialize(credentials=credentials)
+        _credentials = credentials
         
     except Exception as e:
         raise RuntimeError(f"Falha ao autenticar no Google Earth Engine. Detalhes: {e}")
+
+    if cassette is not None:
+        cassette.record_algorithms()
 # # wildfire_analyser/fire_assessment/auth.py
 
 # import ee
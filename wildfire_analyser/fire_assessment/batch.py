@@ -0,0 +1,334 @@
+# wildfire_analyser/fire_assessment/batch.py
+#
+# Resumable batch runs over a manifest of ROIs.
+#
+# Each finished run is appended to a results sink (JSONL, or a directory of
+# Parquet part files) as soon as it completes, so partial results can be
+# consumed while the batch is still running. A checkpoint journal records
+# the fingerprint of every completed ROI/parameter combination; a restarted
+# batch skips those and only pays for the remaining work.
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Set
+
+from wildfire_analyser.fire_assessment.fingerprint import fingerprint
+from wildfire_analyser.fire_assessment.work_queue import WorkQueue, default_worker_id
+
+logger = logging.getLogger(__name__)
+
+
+def job_fingerprint(entry: Dict[str, Any], params: Dict[str, Any]) -> str:
+    """
+    Identity of one batch job: the manifest entry plus the run parameters.
+    """
+    return fingerprint({"entry": entry, "params": params})
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class CheckpointJournal:
+    """
+    Append-only JSONL journal of completed jobs.
+
+    Every line is flushed and fsync'ed, so a crash loses at most the job
+    that was running.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.completed: Set[str] = set()
+
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        self.completed.add(json.loads(line)["job"])
+                    except (ValueError, KeyError):
+                        # Torn last line from an interrupted write
+                        logger.warning("[BATCH] Ignoring malformed checkpoint line")
+
+    def is_done(self, job: str) -> bool:
+        return job in self.completed
+
+    def mark_done(self, job: str, name: str) -> None:
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"job": job, "name": name, "finished_at": _utc_now()}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.completed.add(job)
+
+
+class JsonlResultSink:
+    """
+    One JSON record per line, appended and flushed per run.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, default=str, ensure_ascii=False)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+
+
+class ParquetResultSink:
+    """
+    Directory of Parquet part files, one per run, readable as a dataset
+    (e.g. pandas.read_parquet(path)) while the batch is running.
+
+    Nested fields (statistics, provenance, outputs) are stored as JSON
+    strings. Requires pyarrow.
+    """
+
+    NESTED_FIELDS = ("params", "statistics", "scientific", "visual", "provenance")
+    STRING_FIELDS = (
+        "job", "name", "roi", "start_date", "end_date",
+        "status", "error", "started_at", "finished_at",
+    )
+
+    def __init__(self, path: str | Path):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise RuntimeError(
+                "Parquet results require pyarrow (pip install pyarrow)"
+            ) from e
+
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # Fixed schema, so part files of failed and completed runs unify
+        schema = pa.schema(
+            [(k, pa.string()) for k in self.STRING_FIELDS + self.NESTED_FIELDS]
+            + [("duration_seconds", pa.float64())]
+        )
+        row = {
+            k: json.dumps(v, default=str, ensure_ascii=False)
+            if k in self.NESTED_FIELDS and v is not None else v
+            for k, v in record.items()
+        }
+        table = pa.Table.from_pylist([row], schema=schema)
+
+        name = f"part-{int(time.time() * 1000)}-{record['job'][:16]}.parquet"
+        tmp = self.path / f".{name}.tmp"
+        pq.write_table(table, tmp)
+        tmp.replace(self.path / name)
+
+
+def open_result_sink(path: str | Path):
+    """
+    JSONL sink for *.jsonl / *.json paths, Parquet dataset otherwise
+    (*.parquet or a directory).
+    """
+    path = Path(path)
+    if path.suffix.lower() in (".jsonl", ".json", ".ndjson"):
+        return JsonlResultSink(path)
+    return ParquetResultSink(path)
+
+
+def shard_entries(
+    entries: List[Dict[str, Any]],
+    shard_index: int,
+    shard_count: int,
+) -> List[Dict[str, Any]]:
+    """
+    Deterministic hash partition of the manifest: entry names are hashed
+    with SHA-256, so every node computes the same split.
+    """
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        raise ValueError(
+            f"Invalid shard {shard_index}/{shard_count}: "
+            "expected 0 <= shard_index < shard_count"
+        )
+
+    return [
+        entry for entry in entries
+        if int(fingerprint(entry["name"]), 16) % shard_count == shard_index
+    ]
+
+
+def _run_job(
+    entry: Dict[str, Any],
+    job: str,
+    make_runner: Callable[[Dict[str, Any]], Any],
+    params: Dict[str, Any],
+    sink=None,
+) -> Dict[str, Any]:
+    """
+    Run one job and write its record to `sink`. Never raises for run
+    errors; the record's status tells how it went.
+    """
+    t0 = time.perf_counter()
+    record = {
+        "job": job,
+        "name": entry["name"],
+        "roi": entry["roi"],
+        "start_date": entry["start_date"],
+        "end_date": entry["end_date"],
+        "params": params,
+        "started_at": _utc_now(),
+        "statistics": None,
+        "scientific": None,
+        "visual": None,
+        "provenance": None,
+    }
+
+    try:
+        result = make_runner(entry).run()
+    except Exception as e:
+        logger.exception("[BATCH] %s failed", entry["name"])
+        record.update(
+            status="failed",
+            error=str(e),
+            finished_at=_utc_now(),
+            duration_seconds=round(time.perf_counter() - t0, 3),
+        )
+    else:
+        record.update(
+            status="completed",
+            error=None,
+            finished_at=_utc_now(),
+            duration_seconds=round(time.perf_counter() - t0, 3),
+            statistics=result["statistics"],
+            scientific=result["scientific"],
+            visual=result["visual"],
+            provenance=result["provenance"],
+        )
+        logger.info(
+            "[BATCH] %s completed in %.1fs", entry["name"], record["duration_seconds"]
+        )
+
+    if sink is not None:
+        sink.write(record)
+    return record
+
+
+def run_batch(
+    entries: List[Dict[str, Any]],
+    make_runner: Callable[[Dict[str, Any]], Any],
+    params: Dict[str, Any],
+    sink=None,
+    journal: CheckpointJournal | None = None,
+) -> Dict[str, Any]:
+    """
+    Run `make_runner(entry).run()` for every manifest entry, streaming
+    one record per run into `sink` and skipping jobs already completed
+    according to `journal`.
+
+    Failed runs are recorded with their error and not checkpointed, so a
+    restart retries them.
+    """
+    summary = {"completed": 0, "skipped": 0, "failed": 0}
+
+    for entry in entries:
+        job = job_fingerprint(entry, params)
+
+        if journal is not None and journal.is_done(job):
+            logger.info("[BATCH] Skipping %s (checkpointed)", entry["name"])
+            summary["skipped"] += 1
+            continue
+
+        record = _run_job(entry, job, make_runner, params, sink)
+        if record["status"] != "completed":
+            summary["failed"] += 1
+            continue
+
+        if journal is not None:
+            journal.mark_done(job, entry["name"])
+        summary["completed"] += 1
+
+    return summary
+
+
+def run_queue(
+    queue: WorkQueue,
+    entries: List[Dict[str, Any]],
+    make_runner: Callable[[Dict[str, Any]], Any],
+    params: Dict[str, Any],
+    sink=None,
+    journal: CheckpointJournal | None = None,
+    worker: str | None = None,
+) -> Dict[str, Any]:
+    """
+    Work-queue mode: enqueue the whole manifest (idempotent across
+    workers), then claim and run jobs until none is pending or leased.
+
+    The lease is renewed in the background while a job runs, so only
+    crashed workers lose their jobs to others. While other workers still
+    hold leases, the queue is polled every third of the lease, so the job
+    of a worker that crashes is picked up when its lease expires.
+    """
+    worker = worker or default_worker_id()
+    queue.enqueue([
+        (job_fingerprint(entry, params), entry["name"], entry) for entry in entries
+    ])
+
+    summary = {"completed": 0, "skipped": 0, "failed": 0}
+
+    while True:
+        claimed = queue.claim(worker)
+        if claimed is None:
+            counts = queue.counts()
+            if not counts.get("pending") and not counts.get("leased"):
+                break
+            time.sleep(queue.lease_seconds / 3)
+            continue
+        job, entry = claimed
+
+        if journal is not None and journal.is_done(job):
+            logger.info("[QUEUE] Skipping %s (checkpointed)", entry["name"])
+            queue.complete(job, worker)
+            summary["skipped"] += 1
+            continue
+
+        logger.info("[QUEUE] %s claimed %s", worker, entry["name"])
+
+        stop = threading.Event()
+
+        def renew_lease():
+            while not stop.wait(queue.lease_seconds / 3):
+                if not queue.heartbeat(job, worker):
+                    logger.warning("[QUEUE] Lost lease on %s", entry["name"])
+                    return
+
+        heartbeat = threading.Thread(target=renew_lease, daemon=True)
+        heartbeat.start()
+        try:
+            record = _run_job(entry, job, make_runner, params, sink)
+        finally:
+            stop.set()
+            heartbeat.join()
+
+        if record["status"] != "completed":
+            queue.fail(job, worker, record["error"])
+            summary["failed"] += 1
+            continue
+
+        queue.complete(job, worker)
+        if journal is not None:
+            journal.mark_done(job, entry["name"])
+        summary["completed"] += 1
+
+    return summary
@@ -0,0 +1,210 @@
+# wildfire_analyser/fire_assessment/cassette.py
+#
+# Record/replay of Earth Engine responses.
+#
+# In record mode, every call made through ee_client (getInfo, thumbnail /
+# tile / download URLs, task start, task status and listing) is appended to
+# a JSONL cassette, keyed by a stable hash of the call kind and the
+# serialized request (the EE expression graph for computations). The EE
+# algorithm signatures are recorded too, so replay mode can initialise the
+# client library offline and serve every response from the cassette with
+# no credentials and no network.
+#
+# Responses to the same request are replayed in recording order (the last
+# one repeats), so polling loops see the same state transitions.
+
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import ee
+
+logger = logging.getLogger(__name__)
+
+RECORD = "record"
+REPLAY = "replay"
+MODES = (RECORD, REPLAY)
+
+ALGORITHMS_KEY = "algorithms"
+REPLAY_PROJECT = "cassette-replay"
+
+
+def serialize_request(value: Any) -> Any:
+    """
+    JSON-compatible form of a request: EE objects (also nested in task
+    configs) become their serialized expression graph.
+    """
+    if isinstance(value, ee.ComputedObject):
+        return json.loads(value.serialize(for_cloud_api=True))
+    if isinstance(value, dict):
+        return {str(k): serialize_request(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [serialize_request(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return repr(value)
+
+
+def request_key(kind: str, request: Any) -> str:
+    payload = json.dumps([kind, request], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class Cassette:
+    """
+    JSONL cassette of EE responses in `record` or `replay` mode.
+
+    Recording appends to an existing cassette, so new requests can be
+    added by re-running in record mode.
+    """
+
+    def __init__(self, path: str | Path, mode: str):
+        if mode not in MODES:
+            raise ValueError(f"Cassette mode must be one of {MODES} (got '{mode}')")
+
+        self.path = Path(path)
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._responses: Dict[str, List[Any]] = {}
+        self._replayed: Dict[str, int] = {}
+        self._offline = False
+        self._patched: List[tuple] = []
+
+        if mode == REPLAY and not self.path.exists():
+            raise FileNotFoundError(f"Cassette not found: {self.path}")
+
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        logger.warning("[CASSETTE] Ignoring malformed line")
+                        continue
+                    self._responses.setdefault(entry["key"], []).append(entry["response"])
+
+        if mode == RECORD:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def __len__(self) -> int:
+        return sum(len(r) for r in self._responses.values())
+
+    def _append(self, key: str, kind: str, response: Any) -> None:
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(
+                    {"key": key, "kind": kind, "response": response},
+                    separators=(",", ":"),
+                ) + "\n")
+            self._responses.setdefault(key, []).append(response)
+
+    def play(
+        self,
+        kind: str,
+        request: Any,
+        fn: Callable[[], Any],
+        encode: Callable[[Any], Any] = lambda r: r,
+        decode: Callable[[Any], Any] = lambda r: r,
+    ) -> Any:
+        """
+        Record `fn()`'s response, or replay the recorded one.
+        """
+        key = request_key(kind, request)
+
+        if self.mode == RECORD:
+            response = fn()
+            self._append(key, kind, encode(response))
+            return response
+
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                raise KeyError(
+                    f"No recorded {kind} response for request {key[:16]} in {self.path}"
+                )
+            index = self._replayed.get(key, 0)
+            self._replayed[key] = index + 1
+            response = responses[min(index, len(responses) - 1)]
+
+        return decode(response)
+
+    # ─────────────────────────────
+    # Client library initialisation
+    # ─────────────────────────────
+
+    def record_algorithms(self) -> None:
+        """
+        Store the EE algorithm signatures of an initialised session (once).
+        """
+        if ALGORITHMS_KEY not in self._responses:
+            self._append(ALGORITHMS_KEY, ALGORITHMS_KEY, ee.data.getAlgorithms())
+
+    def initialize_offline(self) -> None:
+        """
+        Initialise the EE client library from the recorded algorithm
+        signatures, without credentials or network access.
+        """
+        if self._offline:
+            return
+
+        algorithms = self._responses.get(ALGORITHMS_KEY)
+        if not algorithms:
+            raise RuntimeError(
+                f"Cassette {self.path} has no recorded algorithm signatures; "
+                "record it first"
+            )
+        signatures = algorithms[-1]
+
+        ee.Reset()
+        # Same hooks the EE client library uses for its offline test setup:
+        # no API discovery document, static signatures, no deprecation feed.
+        # The originals are put back by close().
+        self._patch(ee.data, "_install_cloud_api_resource", lambda: None)
+        self._patch(ee.data, "getAlgorithms", lambda: json.loads(json.dumps(signatures)))
+        self._patch(ee.deprecation, "_FetchDataCatalogStac", lambda: {})
+        ee.Initialize(None, project=REPLAY_PROJECT)
+        self._offline = True
+
+    def _patch(self, module: Any, name: str, value: Any) -> None:
+        self._patched.append((module, name, getattr(module, name)))
+        setattr(module, name, value)
+
+    def close(self) -> None:
+        """
+        Undo the offline initialisation: restore the patched EE client
+        library hooks and reset it, so it can be initialised for real.
+        """
+        if not self._offline:
+            return
+
+        while self._patched:
+            module, name, original = self._patched.pop()
+            setattr(module, name, original)
+        ee.Reset()
+        self._offline = False
+
+
+_active: Cassette | None = None
+
+
+def active_cassette() -> Cassette | None:
+    return _active
+
+
+def use_cassette(path: str | Path | None, mode: str = REPLAY) -> Cassette | None:
+    """
+    Activate (or, with `path=None`, deactivate) the process-wide cassette
+    used by ee_client and authenticate_gee. The previous cassette is
+    closed, undoing any offline initialisation.
+    """
+    global _active
+    if _active is not None:
+        _active.close()
+    _active = Cassette(path, mode) if path else None
+    return _active
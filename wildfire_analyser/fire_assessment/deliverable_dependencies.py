@@ -18,6 +18,10 @@ DELIVERABLE_DEPENDENCIES = {
     Deliverable.DNDVI_AREA_STATISTICS: {Dependency.DNDVI_AREA_STATISTICS},
     Deliverable.RBR_AREA_STATISTICS: {Dependency.RBR_AREA_STATISTICS},
 
+    Deliverable.DNBR_BURN_PERIMETERS: {Dependency.DNBR_BURN_PERIMETERS},
+    Deliverable.DNDVI_BURN_PERIMETERS: {Dependency.DNDVI_BURN_PERIMETERS},
+    Deliverable.RBR_BURN_PERIMETERS: {Dependency.RBR_BURN_PERIMETERS},
+
     # visuals (same data, different representation)
     Deliverable.RGB_PRE_FIRE_VISUAL: {Dependency.RGB_PRE_FIRE},
     Deliverable.RGB_POST_FIRE_VISUAL: {Dependency.RGB_POST_FIRE},
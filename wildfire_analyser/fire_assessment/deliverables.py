@@ -27,6 +27,13 @@ class Deliverable(Enum):
     DNDVI_AREA_STATISTICS = auto()
     RBR_AREA_STATISTICS = auto()
 
+    # ─────────────────────────────
+    # Perímetros (GeoJSON / FlatGeobuf)
+    # ─────────────────────────────
+    DNBR_BURN_PERIMETERS = auto()
+    DNDVI_BURN_PERIMETERS = auto()
+    RBR_BURN_PERIMETERS = auto()
+
     # ─────────────────────────────
     # Visuais (JPEG / Thumbnail)
     # ─────────────────────────────
@@ -40,9 +40,23 @@ class Dependency(Enum):
 
     RBR = auto()
 
+    # ─────────────────────────────
+    # Severity classes
+    # ─────────────────────────────
+    DNBR_SEVERITY = auto()
+    DNDVI_SEVERITY = auto()
+    RBR_SEVERITY = auto()
+
     # ─────────────────────────────
     # Fire metrics
     # ─────────────────────────────
     DNBR_AREA_STATISTICS = auto()
     DNDVI_AREA_STATISTICS = auto()
     RBR_AREA_STATISTICS = auto()
+
+    # ─────────────────────────────
+    # Burn perimeters (vectors)
+    # ─────────────────────────────
+    DNBR_BURN_PERIMETERS = auto()
+    DNDVI_BURN_PERIMETERS = auto()
+    RBR_BURN_PERIMETERS = auto()
@@ -41,15 +41,25 @@ DEPENDENCY_GRAPH = {
         Dependency.NBR_PRE_FIRE,
     },
 
+    # Severity classes
+    Dependency.DNBR_SEVERITY: {Dependency.DNBR},
+    Dependency.DNDVI_SEVERITY: {Dependency.DNDVI},
+    Dependency.RBR_SEVERITY: {Dependency.RBR},
+
     Dependency.DNBR_AREA_STATISTICS: {
-        Dependency.DNBR,
+        Dependency.DNBR_SEVERITY,
     },
 
-      Dependency.DNDVI_AREA_STATISTICS: {
-       Dependency.DNDVI,
+    Dependency.DNDVI_AREA_STATISTICS: {
+        Dependency.DNDVI_SEVERITY,
     },
 
     Dependency.RBR_AREA_STATISTICS: {
-       Dependency.RBR,
+        Dependency.RBR_SEVERITY,
     },
+
+    # Burn perimeters
+    Dependency.DNBR_BURN_PERIMETERS: {Dependency.DNBR_SEVERITY},
+    Dependency.DNDVI_BURN_PERIMETERS: {Dependency.DNDVI_SEVERITY},
+    Dependency.RBR_BURN_PERIMETERS: {Dependency.RBR_SEVERITY},
 }
@@ -34,3 +34,20 @@ def resolve_dependencies(requested: List[Dependency]) -> List[Dependency]:
         visit(dependency)
 
     return result
+
+
+def dependency_ancestors(dep: Dependency) -> Set[Dependency]:
+    """
+    Return every dependency that `dep` transitively depends on.
+    """
+    ancestors: Set[Dependency] = set()
+    stack = list(DEPENDENCY_GRAPH.get(dep, set()))
+
+    while stack:
+        parent = stack.pop()
+        if parent in ancestors:
+            continue
+        ancestors.add(parent)
+        stack.extend(DEPENDENCY_GRAPH.get(parent, set()))
+
+    return ancestors
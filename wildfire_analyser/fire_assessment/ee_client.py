@@ -0,0 +1,382 @@
+# wildfire_analyser/fire_assessment/ee_client.py
+#
+# Central, quota-aware gateway for every Earth Engine call.
+#
+# Calls are grouped into classes with separate quotas (interactive compute,
+# media URLs, task submission, task status, task listing). Each class has a
+# token bucket (sustained rate + burst) and a max-in-flight semaphore, and
+# retryable failures (429 / "Too many concurrent aggregations", quota and
+# transient 5xx errors) are retried with jittered exponential backoff
+# instead of failing the whole run. Per-class counters are kept for
+# monitoring and benchmarking.
+#
+# When a cassette is active (see cassette.py), every helper call is
+# recorded to it, or served from it without touching the network.
+
+import logging
+import random
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List
+
+import ee
+
+from wildfire_analyser.fire_assessment.cassette import REPLAY, active_cassette, serialize_request
+
+logger = logging.getLogger(__name__)
+
+COMPUTE = "compute"          # getInfo
+MEDIA = "media"              # getThumbURL / getMapId / getDownloadURL
+TASK_START = "task_start"    # Export task.start()
+TASK_STATUS = "task_status"  # getTaskStatus
+TASK_LIST = "task_list"      # getTaskList
+ASSET = "asset"              # getAsset / createAsset / deleteAsset
+
+
+@dataclass(frozen=True)
+class CallLimits:
+    rate: float          # sustained calls per second
+    burst: int           # token bucket capacity
+    max_in_flight: int   # concurrent calls
+
+
+DEFAULT_LIMITS: Dict[str, CallLimits] = {
+    COMPUTE: CallLimits(rate=10.0, burst=20, max_in_flight=20),
+    MEDIA: CallLimits(rate=10.0, burst=20, max_in_flight=16),
+    TASK_START: CallLimits(rate=2.0, burst=5, max_in_flight=4),
+    TASK_STATUS: CallLimits(rate=5.0, burst=10, max_in_flight=4),
+    TASK_LIST: CallLimits(rate=1.0, burst=2, max_in_flight=1),
+    ASSET: CallLimits(rate=5.0, burst=10, max_in_flight=4),
+}
+
+DEFAULT_MAX_RETRIES = 6
+DEFAULT_BASE_DELAY = 1.0   # seconds
+DEFAULT_MAX_DELAY = 60.0   # seconds
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+RETRYABLE_MESSAGES = (
+    "too many concurrent aggregations",
+    "too many requests",
+    "quota exceeded",
+    "rate limit",
+    "internal error",
+    "service unavailable",
+    "backend error",
+    "deadline exceeded",
+    "connection reset",
+)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Whether an EE call failure is transient (quota / overload / 5xx).
+    """
+    if isinstance(error, (ConnectionError, socket.timeout, TimeoutError)):
+        return True
+
+    # ee.data translates googleapiclient HttpErrors into EEExceptions
+    # raised while handling them, so the HTTP status is on the context.
+    for exc in (error, error.__cause__, error.__context__):
+        status = getattr(getattr(exc, "resp", None), "status", None)
+        if status is not None and int(status) in RETRYABLE_STATUS:
+            return True
+
+    message = str(error).lower()
+    return any(m in message for m in RETRYABLE_MESSAGES)
+
+
+def _is_not_found(error: BaseException) -> bool:
+    message = str(error).lower()
+    return "not found" in message or "does not exist" in message
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket; `acquire` blocks until a token is available
+    and returns the time spent waiting.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+
+                delay = (1 - self.tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+
+class _CallClass:
+    def __init__(self, name: str, limits: CallLimits):
+        self.name = name
+        self.bucket = TokenBucket(limits.rate, limits.burst)
+        self.slots = threading.BoundedSemaphore(limits.max_in_flight)
+        self.lock = threading.Lock()
+        self.counters = {
+            "calls": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "retries": 0,
+            "throttled_seconds": 0.0,
+            "backoff_seconds": 0.0,
+            "in_flight": 0,
+            "max_in_flight": 0,
+            "replayed": 0,
+        }
+
+    def add(self, key: str, value: float = 1) -> None:
+        with self.lock:
+            self.counters[key] += value
+
+
+class EEClient:
+    """
+    Rate-limited, retrying wrapper around Earth Engine calls.
+
+    Use the module-level `get_client()` instance so limits are shared by
+    all modules in the process.
+    """
+
+    def __init__(
+        self,
+        limits: Dict[str, CallLimits] | None = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ):
+        limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.classes = {name: _CallClass(name, l) for name, l in limits.items()}
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def call(self, call_class: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run `fn(*args, **kwargs)` under the quota of `call_class`,
+        retrying retryable failures with full-jitter exponential backoff.
+        """
+        cls = self.classes[call_class]
+        attempt = 0
+
+        while True:
+            cls.add("throttled_seconds", cls.bucket.acquire())
+
+            with cls.slots:
+                with cls.lock:
+                    cls.counters["calls"] += 1
+                    cls.counters["in_flight"] += 1
+                    cls.counters["max_in_flight"] = max(
+                        cls.counters["max_in_flight"], cls.counters["in_flight"]
+                    )
+                try:
+                    result = fn(*args, **kwargs)
+                except Exception as e:
+                    error = e
+                else:
+                    cls.add("succeeded")
+                    return result
+                finally:
+                    cls.add("in_flight", -1)
+
+            if attempt >= self.max_retries or not is_retryable(error):
+                cls.add("failed")
+                raise error
+
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+            attempt += 1
+            cls.add("retries")
+            cls.add("backoff_seconds", delay)
+            logger.warning(
+                "[EE] %s call failed (%s); retry %d/%d in %.1fs",
+                call_class, error, attempt, self.max_retries, delay,
+            )
+            time.sleep(delay)
+
+    def replayable(
+        self,
+        call_class: str,
+        request: Any,
+        fn: Callable[..., Any],
+        *args,
+        encode: Callable[[Any], Any] = lambda r: r,
+        decode: Callable[[Any], Any] = lambda r: r,
+    ) -> Any:
+        """
+        `call(call_class, fn, *args)` through the active cassette, if any.
+
+        `request` (the serialized call) keys the recorded response;
+        `encode` / `decode` convert responses that are not plain JSON.
+        """
+        cassette = active_cassette()
+        if cassette is None:
+            return self.call(call_class, fn, *args)
+
+        if cassette.mode == REPLAY:
+            self.classes[call_class].add("replayed")
+            return cassette.play(call_class, request, None, decode=decode)
+
+        return cassette.play(
+            call_class,
+            request,
+            lambda: self.call(call_class, fn, *args),
+            encode=encode,
+        )
+
+    # ─────────────────────────────
+    # Call helpers
+    # ─────────────────────────────
+
+    def get_info(self, obj) -> Any:
+        return self.replayable(COMPUTE, serialize_request(obj), obj.getInfo)
+
+    def thumb_url(self, image: ee.Image, params: Dict[str, Any]) -> str:
+        request = serialize_request(["thumb", image, params])
+        return self.replayable(MEDIA, request, image.getThumbURL, params)
+
+    def map_id(self, image: ee.Image, vis_params: Dict[str, Any] | None = None) -> Dict[str, Any]:
+        def encode(response):
+            return {
+                "mapid": response["mapid"],
+                "token": response["token"],
+                "url_format": response["tile_fetcher"].url_format,
+            }
+
+        def decode(response):
+            return {
+                "mapid": response["mapid"],
+                "token": response["token"],
+                "tile_fetcher": ee.data.TileFetcher(
+                    response["url_format"], map_name=response["mapid"]
+                ),
+                "image": image,
+            }
+
+        request = serialize_request(["map", image, vis_params])
+        return self.replayable(
+            MEDIA, request, image.getMapId, vis_params, encode=encode, decode=decode
+        )
+
+    def download_url(self, image: ee.Image, params: Dict[str, Any]) -> str:
+        request = serialize_request(["download", image, params])
+        return self.replayable(MEDIA, request, image.getDownloadURL, params)
+
+    def start_task(self, task) -> None:
+        # Serialized before start(), which adds a workload tag to the config
+        request = serialize_request([task.task_type, task.config])
+
+        def start():
+            task.start()
+            return {"id": task.id, "name": task.name}
+
+        started = self.replayable(TASK_START, request, start)
+        task.id = started["id"]
+        task.name = started["name"]
+
+    def task_status(self, task_ids: str | List[str]) -> List[Dict[str, Any]]:
+        return self.replayable(
+            TASK_STATUS, serialize_request(task_ids), ee.data.getTaskStatus, task_ids
+        )
+
+    def task_list(self) -> List[Dict[str, Any]]:
+        return self.replayable(TASK_LIST, None, ee.data.getTaskList)
+
+    def get_asset(self, asset_id: str) -> Dict[str, Any] | None:
+        """
+        Asset metadata, or None if the asset does not exist.
+        """
+        def fetch():
+            try:
+                return ee.data.getAsset(asset_id)
+            except ee.EEException as e:
+                if _is_not_found(e):
+                    return None
+                raise
+
+        return self.replayable(ASSET, ["get", asset_id], fetch)
+
+    def create_folder(self, asset_id: str) -> None:
+        self.replayable(
+            ASSET,
+            ["create_folder", asset_id],
+            ee.data.createAsset,
+            {"type": "FOLDER"},
+            asset_id,
+            encode=lambda r: None,
+        )
+
+    def delete_asset(self, asset_id: str) -> None:
+        def delete():
+            try:
+                ee.data.deleteAsset(asset_id)
+            except ee.EEException as e:
+                if not _is_not_found(e):
+                    raise
+
+        self.replayable(ASSET, ["delete", asset_id], delete)
+
+    # ─────────────────────────────
+    # Counters
+    # ─────────────────────────────
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Snapshot of the per-class counters.
+        """
+        snapshot = {}
+        for name, cls in self.classes.items():
+            with cls.lock:
+                snapshot[name] = dict(cls.counters)
+        return snapshot
+
+    def total_calls(self) -> int:
+        return sum(c["calls"] for c in self.stats().values())
+
+
+_client: EEClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> EEClient:
+    """
+    Process-wide EE client.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = EEClient()
+        return _client
+
+
+def configure(
+    limits: Dict[str, CallLimits] | None = None,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    base_delay: float = DEFAULT_BASE_DELAY,
+    max_delay: float = DEFAULT_MAX_DELAY,
+) -> EEClient:
+    """
+    Replace the process-wide client (e.g. with project-specific quotas).
+    Counters start from zero.
+    """
+    global _client
+    with _client_lock:
+        _client = EEClient(limits, max_retries, base_delay, max_delay)
+        return _client
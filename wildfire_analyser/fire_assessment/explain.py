@@ -0,0 +1,56 @@
+# wildfire_analyser/fire_assessment/explain.py
+#
+# Client-side cost estimates for dry runs (PostFireAssessment.explain).
+#
+# ROI area and output grids are computed locally from the GeoJSON with
+# pyproj, so sizing a request needs no Earth Engine call at all.
+
+from typing import Any, Dict, Tuple
+
+from pyproj import Geod, Transformer
+from shapely.geometry import shape
+
+from wildfire_analyser.fire_assessment.dependencies import Dependency
+from wildfire_analyser.fire_assessment.exporters.local import plan_tiles, utm_crs
+
+_GEOD = Geod(ellps="WGS84")
+
+# Bands of each exportable image (all index images are single-band)
+BAND_COUNTS = {
+    Dependency.RGB_PRE_FIRE: 3,
+    Dependency.RGB_POST_FIRE: 3,
+}
+
+
+def roi_area_m2(geometry: Dict[str, Any]) -> float:
+    """
+    Geodesic area of a GeoJSON (Multi)Polygon on the WGS84 ellipsoid.
+    """
+    area, _ = _GEOD.geometry_area_perimeter(shape(geometry))
+    return abs(area)
+
+
+def roi_grid(
+    geometry: Dict[str, Any],
+    scale: float,
+    crs: str | None = None,
+) -> Tuple[int, int]:
+    """
+    Width and height in pixels of the `scale` grid covering the ROI bounds
+    in `crs` (default: the ROI's UTM zone, the grid of exports).
+    """
+    crs = crs or utm_crs(geometry)
+    transformer = Transformer.from_crs("EPSG:4326", crs, always_xy=True)
+    xmin, ymin, xmax, ymax = transformer.transform_bounds(*shape(geometry).bounds)
+
+    width = max(1, int(-(-(xmax - xmin) // scale)))
+    height = max(1, int(-(-(ymax - ymin) // scale)))
+    return width, height
+
+
+def local_download_requests(width: int, height: int, dep: Dependency) -> int:
+    """
+    getDownloadURL requests of one local GeoTIFF download (tiles only;
+    the grid lookup is a separate getInfo).
+    """
+    return len(plan_tiles(width, height, BAND_COUNTS.get(dep, 1)))
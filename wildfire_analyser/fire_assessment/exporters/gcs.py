@@ -1,28 +1,202 @@
+import logging
+from typing import Any, Dict, List
+
 import ee
+import google.auth
+import google.auth.exceptions
+import requests
+from google.auth.transport.requests import AuthorizedSession
 
+from wildfire_analyser.fire_assessment.auth import gee_credentials
+from wildfire_analyser.fire_assessment.cassette import active_cassette
+from wildfire_analyser.fire_assessment.ee_client import get_client
 
-def export_geotiff_to_gcs(
+logger = logging.getLogger(__name__)
+
+ACTIVE_TASK_STATES = ("UNSUBMITTED", "READY", "RUNNING")
+
+GCS_API_URL = "https://storage.googleapis.com/storage/v1"
+STORAGE_READ_SCOPE = "https://www.googleapis.com/auth/devstorage.read_only"
+
+
+def gcs_object_url(bucket: str, object_name: str, extension: str = "tif") -> str:
+    return f"https://storage.googleapis.com/{bucket}/{object_name}.{extension}"
+
+
+def list_export_tasks() -> List[Dict[str, Any]]:
+    """
+    List the account's recent EE tasks (newest first).
+    """
+    return get_client().task_list()
+
+
+def find_existing_export(
+    bucket: str,
+    object_name: str,
+    tasks: List[Dict[str, Any]],
+    extension: str = "tif",
+) -> dict | None:
+    """
+    Look for an export of `object_name` that is still in flight, or that
+    completed and whose object is still present in the bucket.
+
+    Export descriptions are the deterministic object names, so a match
+    means the same deliverable was already requested with the same inputs.
+    """
+    url = gcs_object_url(bucket, object_name, extension)
+
+    for task in tasks:
+        if task.get("description") != object_name:
+            continue
+
+        state = task.get("state")
+        if state in ACTIVE_TASK_STATES:
+            return {"url": url, "gee_task_id": task["id"], "state": state}
+
+        if state == "COMPLETED" and _object_exists(bucket, object_name, extension):
+            return {"url": url, "gee_task_id": task["id"], "state": state}
+
+    return None
+
+
+def _object_exists(bucket: str, object_name: str, extension: str) -> bool:
+    # The bucket may expire objects (lifecycle rule), so a completed task
+    # alone does not guarantee the export is still there.
+    cassette = active_cassette()
+    if cassette is not None:
+        return cassette.play(
+            "gcs_list",
+            [bucket, object_name, extension],
+            lambda: _export_objects_exist(bucket, object_name, extension),
+        )
+    return _export_objects_exist(bucket, object_name, extension)
+
+
+def _export_objects_exist(bucket: str, object_name: str, extension: str) -> bool:
+    """
+    Whether the bucket holds the export, as one object or as the
+    `<name>-<row>-<col>.<ext>` parts EE writes for large GeoTIFFs.
+
+    Listed with the service-account credentials (private buckets). When
+    the listing is not allowed, the completed task is trusted.
+    """
+    credentials = gee_credentials()
+    if credentials is None:
+        try:
+            credentials, _ = google.auth.default(scopes=[STORAGE_READ_SCOPE])
+        except google.auth.exceptions.DefaultCredentialsError as e:
+            logger.warning(
+                "No credentials to check gs://%s/%s; trusting the completed task: %s",
+                bucket, object_name, e,
+            )
+            return True
+
+    try:
+        response = AuthorizedSession(credentials).get(
+            f"{GCS_API_URL}/b/{bucket}/o",
+            params={"prefix": object_name, "fields": "items(name)"},
+            timeout=30,
+        )
+    except requests.RequestException as e:
+        logger.warning("Could not check gs://%s/%s: %s", bucket, object_name, e)
+        return False
+
+    if response.status_code in (401, 403):
+        logger.warning(
+            "Not allowed to list gs://%s (HTTP %d); trusting the completed "
+            "export task of %s",
+            bucket, response.status_code, object_name,
+        )
+        return True
+    if response.status_code != 200:
+        logger.warning(
+            "Could not check gs://%s/%s: HTTP %d",
+            bucket, object_name, response.status_code,
+        )
+        return False
+
+    single = f"{object_name}.{extension}"
+    for item in response.json().get("items", []):
+        name = item["name"]
+        if name == single or (
+            name.startswith(f"{object_name}-") and name.endswith(f".{extension}")
+        ):
+            return True
+    return False
+
+
+def geotiff_export_task(
     image: ee.Image,
     roi: ee.Geometry,
     bucket: str,
     object_name: str,
     scale: int = 10,
     max_pixels: int = 1e13,
-) -> dict:
-    task = ee.batch.Export.image.toCloudStorage(
+    crs: str | None = None,
+) -> ee.batch.Task:
+    """
+    Build (without starting) the GeoTIFF export task of an image, on the
+    `scale` grid of `crs` (the image's default projection when None).
+    """
+    return ee.batch.Export.image.toCloudStorage(
         image=image,
         description=object_name,
         bucket=bucket,
         fileNamePrefix=object_name,
         region=roi,
         scale=scale,
+        crs=crs,
         maxPixels=max_pixels,
         fileFormat="GeoTIFF",
     )
-    task.start()
+
+
+def export_geotiff_to_gcs(
+    image: ee.Image,
+    roi: ee.Geometry,
+    bucket: str,
+    object_name: str,
+    scale: int = 10,
+    max_pixels: int = 1e13,
+    crs: str | None = None,
+) -> dict:
+    task = geotiff_export_task(image, roi, bucket, object_name, scale, max_pixels, crs)
+    # Retries are safe: the task keeps its request id across start() calls.
+    get_client().start_task(task)
+
+    return {
+        "url": gcs_object_url(bucket, object_name),
+        "gee_task_id": task.id,
+    }
+
+def table_export_task(
+    collection: ee.FeatureCollection,
+    bucket: str,
+    object_name: str,
+) -> ee.batch.Task:
+    """
+    Build (without starting) the GeoJSON table export task of a feature
+    collection (e.g. burn perimeters too large to return inline).
+    """
+    return ee.batch.Export.table.toCloudStorage(
+        collection=collection,
+        description=object_name,
+        bucket=bucket,
+        fileNamePrefix=object_name,
+        fileFormat="GeoJSON",
+    )
+
+
+def export_table_to_gcs(
+    collection: ee.FeatureCollection,
+    bucket: str,
+    object_name: str,
+) -> dict:
+    task = table_export_task(collection, bucket, object_name)
+    get_client().start_task(task)
 
     return {
-        "url": f"https://storage.googleapis.com/{bucket}/{object_name}.tif",
+        "url": gcs_object_url(bucket, object_name, "geojson"),
         "gee_task_id": task.id,
     }
 
@@ -31,7 +205,18 @@ def get_visual_thumbnail_url(
     roi: ee.Geometry,
 ) -> str:
     image = image.clip(roi.bounds()) 
-    return image.getThumbURL({
+    return get_client().thumb_url(image, {
         "dimensions": 1024,
         "format": "jpg",
     })
+
+def get_visual_tile_url(
+    image: ee.Image,
+    roi: ee.Geometry,
+) -> str:
+    """
+    Return an XYZ tile URL template ({z}/{x}/{y}) for a visual image.
+    """
+    image = image.clip(roi)
+    map_id = get_client().map_id(image)
+    return map_id["tile_fetcher"].url_format
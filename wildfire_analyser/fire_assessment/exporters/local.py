@@ -0,0 +1,267 @@
+# wildfire_analyser/fire_assessment/exporters/local.py
+#
+# Immediate (synchronous) GeoTIFF download, as an alternative to the
+# asynchronous GCS export for small and medium ROIs.
+#
+# The ROI grid is split into tiles that each fit under the Earth Engine
+# getDownloadURL request limits. Tiles are fetched concurrently through a
+# pooled HTTP session and written into the output GeoTIFF window by window
+# as they arrive, so the full mosaic is never held in memory.
+
+import io
+import logging
+import math
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import ee
+import numpy as np
+import rasterio
+import requests
+from rasterio.transform import Affine
+from rasterio.windows import Window
+from shapely.geometry import shape
+
+from wildfire_analyser.fire_assessment.ee_client import get_client
+from wildfire_analyser.fire_assessment.http_session import build_http_session
+
+logger = logging.getLogger(__name__)
+
+# getDownloadURL limits: 32 MB per request, 10000 px per grid dimension.
+MAX_REQUEST_BYTES = 32 * 1024 * 1024
+MAX_TILE_DIM = 10000
+# Headroom for the NPY header and EE's own request size accounting.
+REQUEST_SIZE_MARGIN = 0.9
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_NODATA = -9999.0
+REQUEST_TIMEOUT_SECONDS = 300
+
+TileWindow = Tuple[int, int, int, int]  # (col_off, row_off, width, height)
+
+
+def utm_crs(geometry: Dict[str, Any]) -> str:
+    """
+    WGS84 UTM zone of the ROI centroid, the native projection of the
+    Sentinel-2 scenes over it. Local downloads, GCS exports and asset
+    checkpoints all use it, so their grids match with true 10 m pixels.
+    """
+    lon, lat = shape(geometry).centroid.coords[0]
+    zone = min(60, int((lon + 180) // 6) + 1)
+    return f"EPSG:{(32600 if lat >= 0 else 32700) + zone}"
+
+
+def plan_tiles(
+    width: int,
+    height: int,
+    band_count: int,
+    dtype_size: int = 4,
+    max_request_bytes: int = MAX_REQUEST_BYTES,
+    max_tile_dim: int = MAX_TILE_DIM,
+) -> List[TileWindow]:
+    """
+    Split a width x height pixel grid into square-ish tiles whose
+    download size stays under the request limit.
+    """
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Invalid grid size {width}x{height}")
+
+    pixel_bytes = band_count * dtype_size
+    max_pixels = int(max_request_bytes * REQUEST_SIZE_MARGIN) // pixel_bytes
+    side = min(math.isqrt(max_pixels), max_tile_dim)
+    if side < 1:
+        raise ValueError("Request size limit is smaller than a single pixel")
+
+    return [
+        (col, row, min(side, width - col), min(side, height - row))
+        for row in range(0, height, side)
+        for col in range(0, width, side)
+    ]
+
+
+def decode_npy_tile(content: bytes) -> np.ndarray:
+    """
+    Decode an NPY download into a (bands, rows, cols) array.
+
+    Earth Engine returns a structured array with one field per band.
+    """
+    array = np.load(io.BytesIO(content), allow_pickle=False)
+    if array.dtype.names:
+        array = np.stack([array[name] for name in array.dtype.names])
+    elif array.ndim == 2:
+        array = array[np.newaxis, ...]
+    return array
+
+
+def download_tiles_to_geotiff(
+    path: Path,
+    tile_url: Callable[[TileWindow], str],
+    width: int,
+    height: int,
+    band_count: int,
+    transform: Affine,
+    crs: str,
+    band_names: List[str] | None = None,
+    nodata: float = DEFAULT_NODATA,
+    session: requests.Session | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> int:
+    """
+    Download all tiles of the grid concurrently and stream them into
+    a single tiled GeoTIFF at `path`.
+
+    `tile_url` maps a tile window to the URL serving its NPY payload.
+    At most `2 * max_workers` tiles are held in memory at any time.
+
+    Returns the number of tiles written.
+    """
+    tiles = plan_tiles(width, height, band_count)
+    session = session or build_http_session(pool_size=max_workers)
+
+    profile = {
+        "driver": "GTiff",
+        "width": width,
+        "height": height,
+        "count": band_count,
+        "dtype": "float32",
+        "crs": crs,
+        "transform": transform,
+        "nodata": nodata,
+        "tiled": True,
+        "blockxsize": 256,
+        "blockysize": 256,
+        "compress": "deflate",
+        "BIGTIFF": "IF_SAFER",
+    }
+
+    def fetch(window: TileWindow) -> Tuple[TileWindow, np.ndarray]:
+        response = session.get(tile_url(window), timeout=REQUEST_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        data = decode_npy_tile(response.content)
+
+        expected = (band_count, window[3], window[2])
+        if data.shape != expected:
+            raise RuntimeError(
+                f"Tile {window} has shape {data.shape}, expected {expected}"
+            )
+        return window, data.astype("float32", copy=False)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    logger.info("[LOCAL] Downloading %d tiles into %s", len(tiles), path)
+
+    # Write to a temporary name so an interrupted download never leaves
+    # a partial file under the final path.
+    partial = path.with_name(path.name + ".part")
+
+    max_in_flight = 2 * max_workers
+    in_flight = set()
+
+    try:
+        with rasterio.open(partial, "w", **profile) as dst, ThreadPoolExecutor(
+            max_workers=max_workers
+        ) as pool:
+            if band_names:
+                dst.descriptions = tuple(band_names)
+
+            for window in tiles:
+                in_flight.add(pool.submit(fetch, window))
+                if len(in_flight) < max_in_flight:
+                    continue
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                _write_tiles(dst, done)
+
+            done, _ = wait(in_flight)
+            _write_tiles(dst, done)
+
+        partial.replace(path)
+    finally:
+        partial.unlink(missing_ok=True)
+
+    return len(tiles)
+
+
+def _write_tiles(dst, futures) -> None:
+    for future in futures:
+        (col, row, w, h), data = future.result()
+        dst.write(data, window=Window(col, row, w, h))
+
+
+def _compute_grid(
+    image: ee.Image,
+    roi: ee.Geometry,
+    crs: str,
+    scale: float,
+) -> Tuple[int, int, Affine, List[str]]:
+    """
+    Compute the output pixel grid (snapped to `scale`) covering the ROI,
+    together with the image band names, in a single EE request.
+    """
+    info = get_client().get_info(ee.Dictionary({
+        "bounds": roi.bounds(maxError=1, proj=crs),
+        "bands": image.bandNames(),
+    }))
+
+    ring = info["bounds"]["coordinates"][0]
+    xs = [p[0] for p in ring]
+    ys = [p[1] for p in ring]
+
+    xmin = math.floor(min(xs) / scale) * scale
+    ymax = math.ceil(max(ys) / scale) * scale
+    width = max(1, math.ceil((max(xs) - xmin) / scale))
+    height = max(1, math.ceil((ymax - min(ys)) / scale))
+
+    transform = Affine(scale, 0, xmin, 0, -scale, ymax)
+    return width, height, transform, info["bands"]
+
+
+def export_geotiff_to_local(
+    image: ee.Image,
+    roi: ee.Geometry,
+    path: str | Path,
+    crs: str,
+    scale: int = 10,
+    nodata: float = DEFAULT_NODATA,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    session: requests.Session | None = None,
+) -> dict:
+    """
+    Download an image over the ROI straight to a local GeoTIFF on the
+    `scale` grid of `crs` (see utm_crs).
+
+    Pixels outside the ROI are written as `nodata`.
+    """
+    path = Path(path)
+    image = ee.Image(image).toFloat().clip(roi).unmask(nodata, False)
+
+    width, height, transform, band_names = _compute_grid(image, roi, crs, scale)
+
+    def tile_url(window: TileWindow) -> str:
+        col, row, w, h = window
+        x0 = transform.c + col * transform.a
+        y0 = transform.f + row * transform.e
+        return get_client().download_url(image, {
+            "format": "NPY",
+            "crs": crs,
+            "crs_transform": [transform.a, 0, x0, 0, transform.e, y0],
+            "dimensions": [w, h],
+        })
+
+    tiles = download_tiles_to_geotiff(
+        path=path,
+        tile_url=tile_url,
+        width=width,
+        height=height,
+        band_count=len(band_names),
+        transform=transform,
+        crs=crs,
+        band_names=band_names,
+        nodata=nodata,
+        session=session,
+        max_workers=max_workers,
+    )
+
+    return {
+        "path": str(path),
+        "tiles": tiles,
+    }
@@ -0,0 +1,289 @@
+# wildfire_analyser/fire_assessment/exporters/scheduler.py
+#
+# Client-side submission queue for Earth Engine export tasks.
+#
+# Earth Engine runs only a few batch tasks per account at a time; submitting
+# hundreds at once just queues them server-side (and some get rejected),
+# with no way to let an urgent export overtake a bulk reprocessing job.
+# The scheduler keeps at most `max_running` tasks active, holds the rest in
+# a local priority queue (interactive before bulk, FIFO within a priority)
+# and submits the next one as soon as a slot frees up. Task states are
+# refreshed with one bulk task listing per poll, not one request per task.
+
+import heapq
+import itertools
+import logging
+import threading
+from typing import Any, Callable, Dict, List
+
+import ee
+
+from wildfire_analyser.fire_assessment.ee_client import get_client
+from wildfire_analyser.fire_assessment.exporters.gcs import ACTIVE_TASK_STATES
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 0
+BULK = 10
+PRIORITIES = {"interactive": INTERACTIVE, "bulk": BULK}
+
+DEFAULT_MAX_RUNNING = 4
+DEFAULT_POLL_INTERVAL_SECONDS = 15
+
+TERMINAL_STATES = ("COMPLETED", "FAILED", "CANCELLED")
+
+
+class ExportHandle:
+    """
+    Handle of a scheduled export. `task_id` is only known once the task
+    has been submitted (EE assigns ids on start).
+    """
+
+    def __init__(self, description: str, url: str | None, priority: int):
+        self.description = description
+        self.url = url
+        self.priority = priority
+        self.state = "QUEUED"
+        self.task_id: str | None = None
+        self.error: str | None = None
+        self._submitted = threading.Event()
+        self._finished = threading.Event()
+        self._callbacks: List[Callable[["ExportHandle"], None]] = []
+        self._lock = threading.Lock()
+
+    def wait_submitted(self, timeout: float | None = None) -> str | None:
+        """
+        Block until the task has been started; returns its task id.
+        """
+        self._submitted.wait(timeout)
+        return self.task_id
+
+    def wait(self, timeout: float | None = None) -> str:
+        """
+        Block until the task reaches a terminal state; returns the state.
+        """
+        self._finished.wait(timeout)
+        return self.state
+
+    def done(self) -> bool:
+        return self._finished.is_set()
+
+    def add_submitted_callback(self, fn: Callable[["ExportHandle"], None]) -> None:
+        """
+        Call `fn(handle)` once the task has been started (immediately if it
+        already was). Not called for tasks that fail to start.
+        """
+        with self._lock:
+            if not self._submitted.is_set():
+                self._callbacks.append(fn)
+                return
+        if self.task_id is not None:
+            fn(self)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "gee_task_id": self.task_id,
+            "state": self.state,
+            "priority": self.priority,
+            "error": self.error,
+        }
+
+    def _mark_submitted(self, task_id: str) -> None:
+        with self._lock:
+            self.task_id = task_id
+            self.state = "READY"
+            self._submitted.set()
+            callbacks, self._callbacks = self._callbacks, []
+
+        for fn in callbacks:
+            try:
+                fn(self)
+            except Exception as e:
+                logger.error("[SCHEDULER] Submission callback of %s failed: %s", self.description, e)
+
+    def _mark_finished(self, state: str, error: str | None = None) -> None:
+        with self._lock:
+            self.state = state
+            self.error = error
+            self._submitted.set()
+            self._callbacks = []
+        self._finished.set()
+
+
+class ExportScheduler:
+    """
+    Priority submission queue keeping at most `max_running` export tasks
+    active per account.
+
+    With `account_wide=True`, tasks started outside this scheduler (other
+    processes, the Code Editor) also count against `max_running`.
+    """
+
+    def __init__(
+        self,
+        max_running: int = DEFAULT_MAX_RUNNING,
+        poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        account_wide: bool = False,
+    ):
+        if max_running < 1:
+            raise ValueError("max_running must be >= 1")
+
+        self.max_running = max_running
+        self.poll_interval = poll_interval
+        self.account_wide = account_wide
+
+        self._queue: List = []
+        self._seq = itertools.count()
+        self._running: Dict[str, ExportHandle] = {}
+        self._handles: Dict[str, ExportHandle] = {}
+        self._external_running = 0
+        self._cond = threading.Condition()
+        self._closing = False
+        self._drained = threading.Event()
+
+        self._thread = threading.Thread(
+            target=self._loop, name="export-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def submit(
+        self,
+        task: ee.batch.Task,
+        url: str | None = None,
+        priority: int = BULK,
+    ) -> ExportHandle:
+        """
+        Queue an unstarted export task. Lower priority values go first.
+
+        A task with the same description as one still queued or running
+        (i.e. the same deterministic object name) is not queued again; the
+        existing handle is returned instead.
+        """
+        description = task.config.get("description", "")
+
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("ExportScheduler is closed")
+
+            existing = self._handles.get(description)
+            if existing is not None and not existing.done():
+                return existing
+
+            handle = ExportHandle(description, url, priority)
+            self._handles[description] = handle
+            heapq.heappush(self._queue, (priority, next(self._seq), task, handle))
+            self._cond.notify()
+
+        return handle
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def running(self) -> int:
+        with self._cond:
+            return len(self._running)
+
+    def close(self, wait_submitted: bool = True) -> None:
+        """
+        Stop accepting tasks. With `wait_submitted`, block until every
+        queued task has been started (not until it completes). Running
+        tasks keep being polled, so their handles still resolve.
+        """
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+
+        if wait_submitted:
+            self._drained.wait()
+
+    # ─────────────────────────────
+    # Scheduler loop
+    # ─────────────────────────────
+
+    def _free_slots(self) -> int:
+        return self.max_running - len(self._running) - self._external_running
+
+    def _loop(self) -> None:
+        while True:
+            self._submit_ready()
+
+            with self._cond:
+                if self._closing and not self._queue:
+                    self._drained.set()
+                    if not self._running:
+                        return
+                if not self._running and not self._queue:
+                    self._cond.wait()
+                    continue
+                # Wake up early on new submissions while slots are free
+                if self._queue and self._free_slots() > 0:
+                    continue
+                self._cond.wait(self.poll_interval)
+
+            if self._running or self.account_wide:
+                self._poll()
+
+    def _submit_ready(self) -> None:
+        while True:
+            with self._cond:
+                if not self._queue or self._free_slots() <= 0:
+                    return
+                _, _, task, handle = heapq.heappop(self._queue)
+
+            try:
+                get_client().start_task(task)
+            except Exception as e:
+                logger.error("[SCHEDULER] Could not start %s: %s", handle.description, e)
+                handle._mark_finished("FAILED", str(e))
+                continue
+
+            with self._cond:
+                self._running[task.id] = handle
+            handle._mark_submitted(task.id)
+            logger.info(
+                "[SCHEDULER] Started %s (task %s, priority %d)",
+                handle.description, task.id, handle.priority,
+            )
+
+    def _poll(self) -> None:
+        try:
+            tasks = get_client().task_list()
+        except Exception as e:
+            logger.warning("[SCHEDULER] Task listing failed: %s", e)
+            return
+
+        by_id = {t["id"]: t for t in tasks}
+
+        with self._cond:
+            ours = list(self._running.items())
+            if self.account_wide:
+                self._external_running = sum(
+                    1 for t in tasks
+                    if t.get("state") in ACTIVE_TASK_STATES and t["id"] not in self._running
+                )
+
+        # Tasks too recent to show up in the listing are looked up directly
+        missing = [task_id for task_id, _ in ours if task_id not in by_id]
+        if missing:
+            try:
+                for status in get_client().task_status(missing):
+                    by_id[status["id"]] = status
+            except Exception as e:
+                logger.warning("[SCHEDULER] Task status lookup failed: %s", e)
+
+        for task_id, handle in ours:
+            status = by_id.get(task_id)
+            if status is None:
+                continue
+
+            state = status.get("state")
+            if state not in TERMINAL_STATES:
+                handle.state = state
+                continue
+
+            with self._cond:
+                self._running.pop(task_id, None)
+            handle._mark_finished(state, status.get("error_message"))
+            logger.info("[SCHEDULER] %s %s", handle.description, state)
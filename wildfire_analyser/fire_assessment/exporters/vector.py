@@ -0,0 +1,37 @@
+# wildfire_analyser/fire_assessment/exporters/vector.py
+#
+# Local vector outputs (burn perimeters) as GeoJSON or FlatGeobuf.
+
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+VECTOR_FORMATS = {"geojson": ".geojson", "flatgeobuf": ".fgb"}
+
+
+def write_features(feature_collection: Dict[str, Any], path: str | Path) -> str:
+    """
+    Write a GeoJSON FeatureCollection (as returned by getInfo) to `path`.
+    The format follows the suffix: .fgb for FlatGeobuf, GeoJSON otherwise.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    features = feature_collection.get("features", [])
+
+    if path.suffix == ".fgb":
+        import geopandas as gpd
+
+        if features:
+            frame = gpd.GeoDataFrame.from_features(features, crs="EPSG:4326")
+        else:
+            frame = gpd.GeoDataFrame(geometry=[], crs="EPSG:4326")
+        frame.to_file(path, driver="FlatGeobuf")
+        return str(path)
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"type": "FeatureCollection", "features": features},
+            f,
+            separators=(",", ":"),
+        )
+    return str(path)
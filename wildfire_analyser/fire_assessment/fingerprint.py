@@ -0,0 +1,21 @@
+# wildfire_analyser/fire_assessment/fingerprint.py
+
+import hashlib
+import json
+from typing import Any, Dict
+
+
+def fingerprint(payload: Dict[str, Any]) -> str:
+    """
+    Return a stable SHA-256 hex digest of a JSON-serialisable payload.
+
+    Keys are sorted and whitespace is removed, so logically identical
+    payloads always hash to the same value.
+    """
+    canonical = json.dumps(
+        payload,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
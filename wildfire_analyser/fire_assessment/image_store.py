@@ -0,0 +1,44 @@
+# wildfire_analyser/fire_assessment/image_store.py
+
+import os
+import tempfile
+from pathlib import Path
+
+
+class ImageStore:
+    """
+    Content-addressed local store for rendered images.
+
+    Images are keyed by a fingerprint of the inputs that produced them
+    and laid out as `<root>/<key[:2]>/<key><suffix>`.
+    """
+
+    def __init__(self, root: str | Path, suffix: str = ".jpg"):
+        self.root = Path(root)
+        self.suffix = suffix
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}{self.suffix}"
+
+    def get(self, key: str) -> Path | None:
+        path = self.path_for(key)
+        return path if path.exists() else None
+
+    def put(self, key: str, content: bytes) -> Path:
+        """
+        Store `content` under `key`. The write is atomic, so concurrent
+        writers of the same key never expose a partial file.
+        """
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+        return path
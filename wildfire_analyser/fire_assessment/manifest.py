@@ -0,0 +1,70 @@
+# wildfire_analyser/fire_assessment/manifest.py
+#
+# Batch manifests: one entry per ROI / fire event, in the same shape as the
+# paper preset runs:
+#
+#   {"runs": [
+#       {"name": "Area_1", "roi": "polygons/a.geojson",
+#        "start_date": "2023-07-01", "end_date": "2023-07-21",
+#        "days_before_after": 30, "cloud_threshold": 70},
+#       ...
+#   ]}
+#
+# A bare list of entries is accepted too. Relative ROI paths are resolved
+# against the manifest's directory. With an ROI catalogue, `roi` may also
+# be the name of a catalogue ROI (e.g. "EEAngatuba").
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+from wildfire_analyser.fire_assessment.roi_catalogue import RoiCatalogue
+
+REQUIRED_FIELDS = ("name", "roi", "start_date", "end_date")
+
+
+def load_manifest(
+    path: str | Path,
+    roi_catalogue: RoiCatalogue | None = None,
+) -> List[Dict[str, Any]]:
+    """
+    Load and validate a batch manifest.
+
+    Raises ValueError on missing fields or duplicate names and
+    FileNotFoundError on missing ROI files.
+    """
+    path = Path(path).expanduser().resolve()
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    runs = data["runs"] if isinstance(data, dict) else data
+    if not isinstance(runs, list) or not runs:
+        raise ValueError(f"Manifest {path} has no runs")
+
+    seen = set()
+    entries = []
+
+    for i, run in enumerate(runs):
+        missing = [k for k in REQUIRED_FIELDS if not run.get(k)]
+        if missing:
+            raise ValueError(
+                f"Manifest entry {i} is missing {', '.join(missing)}"
+            )
+        if run["name"] in seen:
+            raise ValueError(f"Duplicate manifest entry name '{run['name']}'")
+        seen.add(run["name"])
+
+        if roi_catalogue is not None and run["roi"] in roi_catalogue:
+            entries.append(dict(run))
+            continue
+
+        roi = Path(run["roi"]).expanduser()
+        if not roi.is_absolute():
+            roi = path.parent / roi
+        roi = roi.resolve()
+        if not roi.exists():
+            raise FileNotFoundError(f"GeoJSON not found: {roi}")
+
+        entries.append({**run, "roi": str(roi)})
+
+    return entries
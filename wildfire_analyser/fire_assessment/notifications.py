@@ -0,0 +1,195 @@
+# wildfire_analyser/fire_assessment/notifications.py
+#
+# Delivery of export notifications (email over SMTP, JSON webhooks) from
+# the task registry outbox.
+#
+# The dispatcher claims due notifications from the registry and sends them
+# on a bounded thread pool, so a slow SMTP server or webhook endpoint never
+# stalls task polling. Failed deliveries go back to the outbox with
+# exponential backoff (see TaskRegistry.mark_failed_attempt).
+
+import logging
+import os
+import smtplib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from email.message import EmailMessage
+from typing import Any, Dict, Set, Tuple
+
+import requests
+
+from wildfire_analyser.fire_assessment.http_session import build_http_session
+from wildfire_analyser.fire_assessment.task_registry import TaskRegistry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+DEFAULT_TIMEOUT_SECONDS = 30
+
+
+@dataclass(frozen=True)
+class SmtpSettings:
+    host: str
+    port: int = 587
+    sender: str = "wildfire-analyser@localhost"
+    username: str | None = None
+    password: str | None = None
+    starttls: bool = True
+
+
+def smtp_settings_from_env() -> SmtpSettings | None:
+    """
+    SMTP settings from SMTP_HOST, SMTP_PORT, SMTP_SENDER, SMTP_USER,
+    SMTP_PASSWORD and SMTP_STARTTLS, or None when SMTP_HOST is not set.
+    """
+    host = os.getenv("SMTP_HOST")
+    if not host:
+        return None
+
+    return SmtpSettings(
+        host=host,
+        port=int(os.getenv("SMTP_PORT", "587")),
+        sender=os.getenv("SMTP_SENDER", SmtpSettings.sender),
+        username=os.getenv("SMTP_USER") or None,
+        password=os.getenv("SMTP_PASSWORD") or None,
+        starttls=os.getenv("SMTP_STARTTLS", "true").lower() not in ("0", "false", "no"),
+    )
+
+
+def notification_message(notification: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Subject and plain-text body for a finished export.
+    """
+    deliverable = notification["deliverable"]
+    state = notification["state"]
+
+    if state == "COMPLETED":
+        subject = f"[wildfire-analyser] {deliverable} is ready"
+        body = f"Your {deliverable} deliverable is ready.\n"
+        if notification.get("url"):
+            body += f"\n{notification['url']}\n"
+    else:
+        subject = f"[wildfire-analyser] {deliverable} export {state.lower()}"
+        body = (
+            f"The export of your {deliverable} deliverable ended in state {state}.\n"
+            f"Error: {notification.get('error') or 'unknown'}\n"
+        )
+
+    body += f"\nGEE task: {notification['task_id']}\n"
+    return subject, body
+
+
+def send_email(smtp: SmtpSettings, to: str, subject: str, body: str) -> None:
+    message = EmailMessage()
+    message["From"] = smtp.sender
+    message["To"] = to
+    message["Subject"] = subject
+    message.set_content(body)
+
+    with smtplib.SMTP(smtp.host, smtp.port, timeout=DEFAULT_TIMEOUT_SECONDS) as server:
+        if smtp.starttls:
+            server.starttls()
+        if smtp.username:
+            server.login(smtp.username, smtp.password or "")
+        server.send_message(message)
+
+
+def send_webhook(session: requests.Session, url: str, payload: Dict[str, Any]) -> None:
+    response = session.post(url, json=payload, timeout=DEFAULT_TIMEOUT_SECONDS)
+    response.raise_for_status()
+
+
+class NotificationDispatcher:
+    """
+    Sends due notifications from a TaskRegistry on at most `max_workers`
+    threads.
+    """
+
+    def __init__(
+        self,
+        registry: TaskRegistry,
+        smtp: SmtpSettings | None = None,
+        session: requests.Session | None = None,
+        max_workers: int = DEFAULT_WORKERS,
+    ):
+        self.registry = registry
+        self.smtp = smtp
+        self.session = session or build_http_session(pool_size=max_workers)
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="notify"
+        )
+        self._in_flight: Set[Future] = set()
+        self._lock = threading.Lock()
+
+    def dispatch(self) -> int:
+        """
+        Claim as many due notifications as there are idle workers and send
+        them in the background. Returns the number dispatched.
+        """
+        with self._lock:
+            free = self.max_workers - len(self._in_flight)
+        if free <= 0:
+            return 0
+
+        notifications = self.registry.claim_due_notifications(free)
+        for notification in notifications:
+            future = self._executor.submit(self._deliver, notification)
+            with self._lock:
+                self._in_flight.add(future)
+            future.add_done_callback(self._discard)
+
+        return len(notifications)
+
+    def _discard(self, future: Future) -> None:
+        with self._lock:
+            self._in_flight.discard(future)
+
+    def idle(self) -> bool:
+        with self._lock:
+            return not self._in_flight
+
+    def _send(self, notification: Dict[str, Any]) -> None:
+        channel = notification["channel"]
+
+        if channel == "email":
+            if self.smtp is None:
+                raise RuntimeError("SMTP is not configured (set SMTP_HOST)")
+            subject, body = notification_message(notification)
+            send_email(self.smtp, notification["target"], subject, body)
+        elif channel == "webhook":
+            send_webhook(self.session, notification["target"], {
+                "task_id": notification["task_id"],
+                "deliverable": notification["deliverable"],
+                "state": notification["state"],
+                "url": notification["url"],
+                "error": notification["error"],
+            })
+        else:
+            raise ValueError(f"Unknown notification channel '{channel}'")
+
+    def _deliver(self, notification: Dict[str, Any]) -> None:
+        try:
+            self._send(notification)
+        except Exception as e:
+            status = self.registry.mark_failed_attempt(notification["id"], str(e))
+            logger.warning(
+                "[NOTIFY] %s to %s failed (%s); %s",
+                notification["channel"],
+                notification["target"],
+                e,
+                "giving up" if status == "failed" else "will retry",
+            )
+            return
+
+        self.registry.mark_sent(notification["id"])
+        logger.info(
+            "[NOTIFY] %s %s sent to %s",
+            notification["deliverable"],
+            notification["state"],
+            notification["target"],
+        )
+
+    def close(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,150 @@
+# wildfire_analyser/fire_assessment/partitioned_stats.py
+#
+# Grid-partitioned area statistics for very large ROIs.
+#
+# A single reduceRegion over a state-scale fire complex eventually hits EE
+# computation timeouts or memory limits. Instead, the ROI bounds are split
+# into a grid of cells and each cell that intersects the ROI is reduced on
+# its own, concurrently. Cells are planar lon/lat rectangles that tile the
+# plane without gaps or overlaps, and the image is masked to the ROI, so
+# every pixel is counted in exactly one cell and the per-class sums merge
+# exactly client-side. A cell that fails with a computation limit error is
+# split into quadrants and retried; cells that succeeded are never redone.
+
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Tuple
+
+from pyproj import Transformer
+from shapely.geometry import box, shape
+
+from wildfire_analyser.fire_assessment.explain import roi_area_m2
+
+logger = logging.getLogger(__name__)
+
+# ROIs larger than this are partitioned automatically (10 000 km²)
+AUTO_PARTITION_AREA_HA = 1_000_000
+DEFAULT_CELL_KM = 50
+DEFAULT_MAX_WORKERS = 8
+# A failing cell is split at most this many times (into 4**n sub-cells)
+DEFAULT_MAX_SPLITS = 2
+
+SPLITTABLE_MESSAGES = (
+    "computation timed out",
+    "memory limit exceeded",
+    "too many pixels",
+    "too many concurrent aggregations",
+)
+
+Cell = Tuple[float, float, float, float]  # (west, south, east, north)
+
+
+def resolve_cell_km(geometry: Dict[str, Any], cell_km: float | None) -> float | None:
+    """
+    Cell size to partition the ROI with, or None for a single reduction.
+
+    None selects partitioning automatically by ROI area; 0 disables it.
+    """
+    if cell_km is None:
+        if roi_area_m2(geometry) / 10_000 > AUTO_PARTITION_AREA_HA:
+            return DEFAULT_CELL_KM
+        return None
+    if cell_km < 0:
+        raise ValueError(f"partition_cell_km must be >= 0 (got {cell_km})")
+    return cell_km or None
+
+
+def partition_cells(geometry: Dict[str, Any], cell_km: float) -> List[Cell]:
+    """
+    Grid cells of about `cell_km` x `cell_km` (Web Mercator) covering the
+    ROI bounds, keeping only those that intersect the ROI.
+    """
+    roi = shape(geometry)
+    to_mercator = Transformer.from_crs("EPSG:4326", "EPSG:3857", always_xy=True)
+    to_lonlat = Transformer.from_crs("EPSG:3857", "EPSG:4326", always_xy=True)
+
+    xmin, ymin, xmax, ymax = to_mercator.transform_bounds(*roi.bounds)
+    step = cell_km * 1000
+
+    cells = []
+    y = ymin
+    while y < ymax:
+        x = xmin
+        while x < xmax:
+            # Web Mercator rectangles are lon/lat rectangles
+            west, south = to_lonlat.transform(x, y)
+            east, north = to_lonlat.transform(min(x + step, xmax), min(y + step, ymax))
+            if roi.intersects(box(west, south, east, north)):
+                cells.append((west, south, east, north))
+            x += step
+        y += step
+
+    return cells
+
+
+def split_cell(cell: Cell) -> List[Cell]:
+    west, south, east, north = cell
+    mid_x = (west + east) / 2
+    mid_y = (south + north) / 2
+    return [
+        (west, south, mid_x, mid_y),
+        (mid_x, south, east, mid_y),
+        (west, mid_y, mid_x, north),
+        (mid_x, mid_y, east, north),
+    ]
+
+
+def _splittable(error: BaseException) -> bool:
+    message = str(error).lower()
+    return any(m in message for m in SPLITTABLE_MESSAGES)
+
+
+def reduce_cells(
+    reduce_cell: Callable[[Cell], Any],
+    cells: List[Cell],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_splits: int = DEFAULT_MAX_SPLITS,
+) -> List[Any]:
+    """
+    Run `reduce_cell` over all cells with bounded concurrency.
+
+    Cells failing with a computation limit error are split into quadrants
+    and retried (up to `max_splits` times); other errors are raised.
+    """
+    results = []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(reduce_cell, cell): (cell, 0) for cell in cells}
+
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                cell, depth = futures.pop(future)
+                try:
+                    results.append(future.result())
+                    continue
+                except Exception as e:
+                    if depth >= max_splits or not _splittable(e):
+                        for pending in futures:
+                            pending.cancel()
+                        raise RuntimeError(f"Statistics of cell {cell} failed: {e}") from e
+                    logger.warning("[STATS] Cell %s failed (%s); splitting", cell, e)
+
+                for sub in split_cell(cell):
+                    futures[pool.submit(reduce_cell, sub)] = (sub, depth + 1)
+
+    return results
+
+
+def merge_area_groups(results: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Sum per-cell grouped area outputs into one grouped output.
+    """
+    totals: Dict[int, float] = {}
+    for groups in results:
+        for item in groups:
+            cls = item["severity_class"]
+            totals[cls] = totals.get(cls, 0.0) + item["sum"]
+
+    return [{"severity_class": cls, "sum": totals[cls]} for cls in sorted(totals)]
@@ -1,44 +1,200 @@
 import ee
 from pathlib import Path
-from typing import List, Dict, Any
+from shapely.geometry import box, mapping, shape
+from typing import AsyncIterator, List, Dict, Any, Iterator, Tuple
 from datetime import datetime, date
-import uuid
+import asyncio
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
 
+from wildfire_analyser.fire_assessment.ee_client import (
+    ASSET,
+    COMPUTE,
+    MEDIA,
+    TASK_LIST,
+    TASK_START,
+    get_client,
+)
+from wildfire_analyser.fire_assessment.asset_checkpoints import AssetCheckpoints
 from wildfire_analyser.fire_assessment.auth import authenticate_gee
+from wildfire_analyser.fire_assessment.cassette import REPLAY, active_cassette
 from wildfire_analyser.fire_assessment.resolver import (
     DAGExecutionContext,
     execute_dag,
+    execute_dependencies,
 )
 from wildfire_analyser.fire_assessment.deliverables import Deliverable
 from wildfire_analyser.fire_assessment.visualization import VISUAL_RENDERERS
+from wildfire_analyser.fire_assessment.visualization.local import render_geotiff
+from wildfire_analyser.fire_assessment.deliverable_dependencies import (
+    DELIVERABLE_DEPENDENCIES,
+)
 from wildfire_analyser.fire_assessment.exporters.gcs import (
     export_geotiff_to_gcs,
+    export_table_to_gcs,
+    find_existing_export,
+    gcs_object_url,
+    geotiff_export_task,
     get_visual_thumbnail_url,
+    get_visual_tile_url,
+    list_export_tasks,
+    table_export_task,
+)
+from wildfire_analyser.fire_assessment.exporters.local import (
+    export_geotiff_to_local,
+    utm_crs,
+)
+from wildfire_analyser.fire_assessment.exporters.scheduler import (
+    PRIORITIES,
+    ExportScheduler,
+)
+from wildfire_analyser.fire_assessment.exporters.vector import (
+    VECTOR_FORMATS,
+    write_features,
 )
 from wildfire_analyser.fire_assessment.dependencies import Dependency
+from wildfire_analyser.fire_assessment.dependency_graph import DEPENDENCY_GRAPH
+from wildfire_analyser.fire_assessment.dependency_resolver import (
+    dependency_ancestors,
+    resolve_dependencies,
+)
+from wildfire_analyser.fire_assessment.explain import (
+    local_download_requests,
+    roi_area_m2,
+    roi_grid,
+)
+from wildfire_analyser.fire_assessment.products import (
+    DEFAULT_MIN_MAPPING_UNIT_HA,
+    DEFAULT_STATISTICS_MAX_PIXELS,
+    DEFAULT_STATISTICS_SCALE,
+    area_stats_groups_by_region,
+    catalogue_window_scenes,
+    format_area_statistics,
+    uses_scene_catalogue,
+    window_range,
+)
+from wildfire_analyser.fire_assessment.partitioned_stats import (
+    partition_cells,
+    resolve_cell_km,
+)
+from wildfire_analyser.fire_assessment.roi_clusters import (
+    DEFAULT_MAX_CLUSTER_KM,
+    cluster_rois,
+    merge_bounds,
+)
+from wildfire_analyser.fire_assessment.result_events import (
+    ExportSubmitted,
+    ProvenanceReady,
+    ResultEvent,
+    StatisticsReady,
+    VisualReady,
+)
+from wildfire_analyser.fire_assessment.scene_catalogue import SceneCatalogue
+from wildfire_analyser.fire_assessment.sentinel2 import COLLECTION_ID
+from wildfire_analyser.fire_assessment.task_registry import TaskRegistry
+from wildfire_analyser.fire_assessment.time_windows import parse_window
+from wildfire_analyser.fire_assessment.preflight import (
+    DEFAULT_MIN_COVERAGE,
+    run_preflight,
+)
+from wildfire_analyser.fire_assessment.fingerprint import fingerprint
+from wildfire_analyser.fire_assessment.http_session import build_http_session
+from wildfire_analyser.fire_assessment.image_store import ImageStore
+from wildfire_analyser.tile_proxy import register_tile_layer
 
 import logging
 
+logger = logging.getLogger(__name__)
+
+# Dependencies that do not depend on the post-fire window and can be
+# shared across the windows of a recovery time series.
+PRE_FIRE_DEPENDENCIES = {
+    dep for dep in Dependency
+    if dep is not Dependency.POST_FIRE_COLLECTION
+    and Dependency.POST_FIRE_COLLECTION not in dependency_ancestors(dep)
+}
+
+# Dependencies computed over the ROI itself; everything else can be shared
+# by the ROIs of a spatial cluster (see run_many).
+ROI_DEPENDENCIES = {
+    dep for dep in Dependency
+    if dep.name.endswith(("_AREA_STATISTICS", "_BURN_PERIMETERS"))
+}
+COLLECTION_DEPENDENCIES = {
+    Dependency.COLLECTION_GATHERING,
+    Dependency.PRE_FIRE_COLLECTION,
+    Dependency.POST_FIRE_COLLECTION,
+}
+
 
 class PostFireAssessment:
 
     DEFAULT_SCALE = 10
+    # Larger ROIs export burn perimeters to GCS instead of returning them
+    PERIMETERS_INLINE_MAX_AREA_HA = 100_000
+    # getInfo returns at most 5000 elements of a collection
+    PERIMETERS_INLINE_MAX_FEATURES = 5000
+    # Concurrent statistics / visual / export / provenance requests
+    RESULT_WORKERS = 8
+    VISUAL_MODES = ("thumbnail", "tiles", "local")
 
     def __init__(
         self,
         gee_key_json: str,
-        geojson_path: str,
+        geojson_path: str | None,
         start_date: str,
         end_date: str,
         deliverables: List[Deliverable],
         cloud_threshold: int = 70,
         days_before_after: int = 30,
+        max_scenes_per_window: int | None = None,
+        complete_coverage: bool = False,
+        preflight: bool = False,
+        min_coverage: float = DEFAULT_MIN_COVERAGE,
+        max_days_before_after: int | None = None,
+        max_cloud_threshold: int | None = None,
+        scene_catalogue: str | None = None,
+        partition_cell_km: float | None = None,
+        statistics_scale: float | None = None,
+        statistics_max_pixels: float | None = None,
+        perimeter_scale: float | None = None,
+        perimeter_tile_scale: float | None = None,
+        min_mapping_unit_ha: float = DEFAULT_MIN_MAPPING_UNIT_HA,
+        simplify_tolerance: float | None = None,
+        perimeter_format: str = "geojson",
         gcs_bucket: str | None = None,
+        export_scheduler: ExportScheduler | None = None,
+        export_priority: str = "interactive",
+        asset_checkpoints: AssetCheckpoints | None = None,
+        task_registry: str | None = None,
+        requester: str | None = None,
+        notify_webhook: str | None = None,
+        output_dir: str | None = None,
+        image_store_dir: str | None = None,
+        visual_mode: str = "thumbnail",
+        tile_proxy_url: str | None = None,
+        roi_geometry: Dict[str, Any] | None = None,
         verbose: bool = False,
     ):
         level = logging.INFO if verbose else logging.WARNING
         logging.getLogger("wildfire_analyser").setLevel(level)
 
+        # Local downloads and image-store fetches are plain HTTP requests
+        # the cassette cannot serve: replayed runs would not be offline.
+        cassette = active_cassette()
+        if cassette is not None and cassette.mode == REPLAY and (
+            output_dir or image_store_dir
+        ):
+            raise ValueError(
+                "output_dir and image_store_dir are not supported when "
+                "replaying a cassette"
+            )
+
         authenticate_gee(gee_key_json)
 
         start = self._parse_date(start_date, "start_date")
@@ -49,21 +205,88 @@ class PostFireAssessment:
                 f"(got {start_date} > {end_date})"
             )
 
-        self.roi = self._load_geojson(Path(geojson_path))
+        # An inline GeoJSON geometry (e.g. from the HTTP service) can be
+        # given instead of a file.
+        if roi_geometry is not None:
+            self.roi_geometry = roi_geometry
+        elif geojson_path is not None:
+            self.roi_geometry = self._load_geojson(Path(geojson_path))
+        else:
+            raise ValueError("Either geojson_path or roi_geometry is required")
+        self.roi = ee.Geometry(self.roi_geometry)
+        # Local downloads and GCS exports share this grid
+        self.export_crs = utm_crs(self.roi_geometry)
         self.deliverables = deliverables
         self.bucket = gcs_bucket
 
+        if export_priority not in PRIORITIES:
+            raise ValueError(
+                f"export_priority must be one of {tuple(PRIORITIES)} "
+                f"(got '{export_priority}')"
+            )
+        self.export_scheduler = export_scheduler
+        self.export_priority = PRIORITIES[export_priority]
+        self.export_handles = {}
+        # Exports are recorded for the long-running task monitor, which
+        # notifies the requester (email) and/or webhook when they finish.
+        self.task_registry = TaskRegistry(task_registry) if task_registry else None
+        self.requester = requester
+        self.notify_webhook = notify_webhook
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.image_store = ImageStore(image_store_dir) if image_store_dir else None
+
+        if visual_mode not in self.VISUAL_MODES:
+            raise ValueError(
+                f"visual_mode must be one of {self.VISUAL_MODES} "
+                f"(got '{visual_mode}')"
+            )
+        if visual_mode == "local" and self.output_dir is None:
+            raise ValueError("visual_mode 'local' requires output_dir")
+        self.visual_mode = visual_mode
+        self.tile_proxy_url = tile_proxy_url
+
+        # Coverage filling only tops up a bounded selection
+        if complete_coverage and not max_scenes_per_window:
+            raise ValueError("complete_coverage requires max_scenes_per_window")
+
+        if perimeter_format not in VECTOR_FORMATS:
+            raise ValueError(
+                f"perimeter_format must be one of {tuple(VECTOR_FORMATS)} "
+                f"(got '{perimeter_format}')"
+            )
+        self.perimeter_format = perimeter_format
+
+        self.preflight = preflight
+        self.min_coverage = min_coverage
+        self.max_days_before_after = max_days_before_after
+        self.max_cloud_threshold = max_cloud_threshold
+        self.preflight_result: Dict[str, Any] | None = None
+
+        self.scene_catalogue = (
+            SceneCatalogue(scene_catalogue) if scene_catalogue else None
+        )
+
         self.context = DAGExecutionContext(
             roi=self.roi,
+            roi_geometry=self.roi_geometry,
+            scene_catalogue=self.scene_catalogue,
             start_date=start_date,
             end_date=end_date,
             cloud_threshold=cloud_threshold,
             days_before_after=days_before_after,
+            max_scenes_per_window=max_scenes_per_window,
+            complete_coverage=complete_coverage,
+            partition_cell_km=partition_cell_km,
+            statistics_scale=statistics_scale,
+            statistics_max_pixels=statistics_max_pixels,
+            perimeter_scale=perimeter_scale,
+            perimeter_tile_scale=perimeter_tile_scale,
+            min_mapping_unit_ha=min_mapping_unit_ha,
+            simplify_tolerance=simplify_tolerance,
+            asset_checkpoints=asset_checkpoints,
         )
 
     def run(self) -> Dict[str, Any]:
-        outputs = execute_dag(self.deliverables, self.context)
-
         result = {
             "scientific": {},
             "visual": {},
@@ -71,80 +294,972 @@ class PostFireAssessment:
             "provenance": {},
         }
 
-        for d, value in outputs.items():
+        for event in self.iter_results():
+            result[event.section][event.name] = event.value
 
-            if d.name.endswith("_AREA_STATISTICS"):
-                result["statistics"][d.name] = value
-                continue
+        return result
 
-            if d in VISUAL_RENDERERS:
-                vis = VISUAL_RENDERERS[d](value, self.roi)
-                result["visual"][d.name] = {
-                    "url": get_visual_thumbnail_url(vis, self.roi)
-                }
-                continue
+    def iter_results(self) -> Iterator[ResultEvent]:
+        """
+        Run the assessment, yielding each deliverable as soon as it is
+        ready (see result_events) instead of waiting for the slowest one.
+
+        The image graph is built up front (lazy, no requests); statistics
+        requests, visual renderings, exports and provenance fetches then run
+        concurrently and are yielded in completion order. In local visual
+        mode, a visual whose index raster is also downloaded as a scientific
+        deliverable waits for that download and reuses it.
+        """
+        if self.preflight and self.preflight_result is None:
+            self._run_preflight()
+
+        self._sync_scene_catalogue([self.context])
+
+        statistics = [d for d in self.deliverables if d.name.endswith("_AREA_STATISTICS")]
+        perimeters = [d for d in self.deliverables if d.name.endswith("_BURN_PERIMETERS")]
+        visuals = [d for d in self.deliverables if d in VISUAL_RENDERERS]
+        rasters = [
+            d for d in self.deliverables
+            if d not in statistics and d not in perimeters and d not in visuals
+        ] if self.output_dir or self.bucket else []
+
+        # Build everything up to the statistics reductions here, so the
+        # workers never race on the shared context.
+        lazy = [self._dependency_of(d) for d in self.deliverables if d not in statistics]
+        for d in statistics:
+            lazy.extend(DEPENDENCY_GRAPH.get(self._dependency_of(d), set()))
+        execute_dependencies(lazy, self.context)
+
+        export_tasks = None
+        if self.bucket and not self.output_dir and (
+            rasters or (perimeters and not self._perimeters_inline())
+        ):
+            export_tasks = list_export_tasks()
+
+        local_rasters: Dict[Dependency, str] = {}
+        downloading = {self._dependency_of(d) for d in rasters} if self.output_dir else set()
+        waiting = list(visuals)
+        session = (
+            build_http_session(pool_size=self.RESULT_WORKERS) if self.image_store else None
+        )
+
+        pool = ThreadPoolExecutor(max_workers=self.RESULT_WORKERS)
+        futures: Dict[Future, Tuple[type, Deliverable | str]] = {}
+
+        def submit(event: type, name: Deliverable | str, fn, *args) -> None:
+            futures[pool.submit(fn, *args)] = (event, name)
+
+        def submit_visuals() -> None:
+            for d in list(waiting):
+                if self.visual_mode == "local" and self._dependency_of(d) in downloading:
+                    continue
+                waiting.remove(d)
+                submit(VisualReady, d, self._render_visual, d, local_rasters, session)
+
+        try:
+            for d in statistics:
+                submit(StatisticsReady, d, self._statistics_output, d)
+            for d in perimeters:
+                submit(ExportSubmitted, d, self._perimeters_output, d, export_tasks)
+            for d in rasters:
+                submit(ExportSubmitted, d, self._raster_output, d, local_rasters, export_tasks)
+            submit_visuals()
+            for key, dep in (
+                ("pre_fire", Dependency.PRE_FIRE_COLLECTION),
+                ("post_fire", Dependency.POST_FIRE_COLLECTION),
+            ):
+                submit(
+                    ProvenanceReady,
+                    key,
+                    lambda dep: {"images": self._window_provenance(dep, self.context)},
+                    dep,
+                )
+
+            yield ProvenanceReady("scene_selection", self._scene_selection())
+            if self.preflight_result is not None:
+                yield ProvenanceReady("preflight", self.preflight_result)
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    event, name = futures.pop(future)
+                    value = future.result()
+
+                    if isinstance(name, Deliverable):
+                        if event is ExportSubmitted:
+                            downloading.discard(self._dependency_of(name))
+                        name = name.name
+                    if waiting:
+                        submit_visuals()
+
+                    yield event(name, value)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    async def aiter_results(
+        self,
+        executor: Executor | None = None,
+    ) -> AsyncIterator[ResultEvent]:
+        """
+        Async counterpart of iter_results: the blocking generator is
+        advanced on `executor` (default: the loop's executor), so the event
+        loop stays free while requests are in flight.
+        """
+        loop = asyncio.get_running_loop()
+        events = self.iter_results()
+        done = object()
 
-            if self.bucket:
-                object_name = self._generate_object_name(
-                    deliverable=d.name.lower(),
-                    start_date=self.context.inputs["start_date"],
-                    end_date=self.context.inputs["end_date"],
+        try:
+            while True:
+                event = await loop.run_in_executor(executor, next, events, done)
+                if event is done:
+                    return
+                yield event
+        finally:
+            await loop.run_in_executor(executor, events.close)
+
+    def _statistics_output(self, d: Deliverable) -> Dict[str, Any]:
+        dep = self._dependency_of(d)
+        execute_dependencies([dep], self.context)
+        return self.context.get(dep)
+
+    def _perimeters_output(
+        self,
+        d: Deliverable,
+        export_tasks: List[Dict[str, Any]] | None,
+    ) -> Dict[str, Any]:
+        value = self.context.get(self._dependency_of(d))
+
+        if self._perimeters_inline():
+            inline = self._inline_perimeters(d, value)
+            if inline is not None:
+                return inline
+            if not self.bucket:
+                raise RuntimeError(
+                    f"{d.name}: more than {self.PERIMETERS_INLINE_MAX_FEATURES} "
+                    "perimeters, too many to return inline. Set GCS_BUCKET_NAME to "
+                    "export them, or raise the minimum mapping unit / perimeter scale."
                 )
+            logger.info(
+                "[EXPORT] %s: too many perimeters to return inline, exporting to GCS",
+                d.name,
+            )
 
-                export_result = export_geotiff_to_gcs(
+        export_result = self._export_perimeters(d, value, export_tasks)
+        if export_result["gee_task_id"] is not None:
+            self._register_export(
+                d.name, export_result["gee_task_id"], export_result["url"]
+            )
+        return {
+            "url": export_result["url"],
+            "gee_task_id": export_result["gee_task_id"],
+        }
+
+    def _raster_output(
+        self,
+        d: Deliverable,
+        local_rasters: Dict[Dependency, str],
+        export_tasks: List[Dict[str, Any]] | None,
+    ) -> Dict[str, Any]:
+        value = self.context.get(self._dependency_of(d))
+        object_name = self._generate_object_name(d)
+
+        # Local download takes precedence over the async GCS export
+        if self.output_dir:
+            path = self._download_local(value, f"{object_name}.tif")
+            local_rasters[self._dependency_of(d)] = path
+            return {"path": path}
+
+        # Identical requests map to the same object name: reuse an
+        # in-flight or completed export instead of starting a new task.
+        export_result = find_existing_export(
+            self.bucket, object_name, export_tasks
+        )
+        if export_result is not None:
+            logger.info(
+                "[EXPORT] Reusing %s task %s for %s",
+                export_result["state"],
+                export_result["gee_task_id"],
+                d.name,
+            )
+        elif self.export_scheduler is not None:
+            # Queued client-side; the task id is only known once the
+            # scheduler starts it (see self.export_handles).
+            handle = self.export_scheduler.submit(
+                geotiff_export_task(
                     image=value,
                     roi=self.roi,
                     bucket=self.bucket,
                     object_name=object_name,
                     scale=self.DEFAULT_SCALE,
+                    crs=self.export_crs,
+                ),
+                url=gcs_object_url(self.bucket, object_name),
+                priority=self.export_priority,
+            )
+            self.export_handles[d.name] = handle
+            if self.task_registry is not None:
+                handle.add_submitted_callback(
+                    lambda h: self._register_export(d.name, h.task_id, h.url)
                 )
+            export_result = handle.as_dict()
+        else:
+            export_result = export_geotiff_to_gcs(
+                image=value,
+                roi=self.roi,
+                bucket=self.bucket,
+                object_name=object_name,
+                scale=self.DEFAULT_SCALE,
+                crs=self.export_crs,
+            )
 
-                result["scientific"][d.name] = {
-                    "url": export_result["url"],
-                    "gee_task_id": export_result["gee_task_id"],
-                }
+        if export_result["gee_task_id"] is not None:
+            self._register_export(
+                d.name, export_result["gee_task_id"], export_result["url"]
+            )
 
-        # Provenance (image IDs, dates, cloud %)
-        pre_collection = self.context.get(Dependency.PRE_FIRE_COLLECTION)
-        post_collection = self.context.get(Dependency.POST_FIRE_COLLECTION)
+        return {
+            "url": export_result["url"],
+            "gee_task_id": export_result["gee_task_id"],
+        }
 
-        result["provenance"] = {
-            "pre_fire": {
-                "images": self._extract_collection_provenance(pre_collection)
-                if pre_collection is not None else []
+    def explain(self) -> Dict[str, Any]:
+        """
+        Dry run: the execution plan and estimated cost of run(), without
+        computing anything.
+
+        ROI area and pixel grids are computed locally. Scene counts take a
+        single metadata request (none when the scene catalogue is already
+        in sync). Call counts are upper bounds: exports that turn out to be
+        reusable are not started again.
+        """
+        plan = resolve_dependencies(
+            [self._dependency_of(d) for d in self.deliverables]
+        )
+
+        area_m2 = roi_area_m2(self.roi_geometry)
+        width, height = roi_grid(self.roi_geometry, self.DEFAULT_SCALE, self.export_crs)
+        windows, metadata_requests = self._explain_windows()
+
+        inputs = self.context.inputs
+        statistics_scale = inputs["statistics_scale"] or DEFAULT_STATISTICS_SCALE
+
+        return {
+            "deliverables": [d.name for d in self.deliverables],
+            "dag": [dep.name for dep in plan],
+            "roi": {
+                "area_ha": round(area_m2 / 10_000, 2),
+                "scale_m": self.DEFAULT_SCALE,
+                "pixels": round(area_m2 / self.DEFAULT_SCALE ** 2),
+                "grid": {"width": width, "height": height, "crs": self.export_crs},
             },
-            "post_fire": {
-                "images": self._extract_collection_provenance(post_collection)
-                if post_collection is not None else []
+            # Area statistics reduce the ROI at their own scale
+            "statistics": {
+                "scale_m": statistics_scale,
+                "pixels": round(area_m2 / statistics_scale ** 2),
+                "max_pixels": (
+                    inputs["statistics_max_pixels"] or DEFAULT_STATISTICS_MAX_PIXELS
+                ),
             },
+            "windows": windows,
+            "calls": self._planned_calls(width, height),
+            "metadata_requests": metadata_requests,
         }
 
-        return result
+    def _explain_windows(self) -> Tuple[Dict[str, Any], int]:
+        """
+        Date range, scene and MGRS tile count of both windows.
+        """
+        deps = {
+            "pre_fire": Dependency.PRE_FIRE_COLLECTION,
+            "post_fire": Dependency.POST_FIRE_COLLECTION,
+        }
+        windows = {
+            name: dict(zip(("start", "end"), window_range(dep, self.context)))
+            for name, dep in deps.items()
+        }
+
+        if uses_scene_catalogue(self.context):
+            start = min(w["start"] for w in windows.values())
+            end = max(w["end"] for w in windows.values())
+            missing = self.scene_catalogue.missing_intervals(
+                shape(self.roi_geometry).bounds, start, end
+            )
+            self._sync_scene_catalogue([self.context])
+
+            for name, dep in deps.items():
+                scenes = catalogue_window_scenes(dep, self.context)
+                windows[name]["scenes"] = len(scenes)
+                windows[name]["tiles"] = len({scene["tile"] for scene in scenes})
+            return windows, 1 if missing else 0
+
+        # Collections are lazy: building them on a scratch context costs
+        # nothing until their sizes are requested, all in one call.
+        scratch = DAGExecutionContext(**self.context.inputs)
+        execute_dependencies(deps.values(), scratch)
+
+        counts = {}
+        for name, dep in deps.items():
+            collection = scratch.get(dep)
+            counts[f"{name}/scenes"] = collection.size()
+            counts[f"{name}/tiles"] = collection.aggregate_count_distinct("MGRS_TILE")
+        values = get_client().get_info(ee.Dictionary(counts))
+
+        for name in deps:
+            windows[name]["scenes"] = values[f"{name}/scenes"]
+            windows[name]["tiles"] = values[f"{name}/tiles"]
+        return windows, 1
+
+    def _planned_calls(self, width: int, height: int) -> Dict[str, int]:
+        """
+        Earth Engine calls run() would make, per ee_client call class.
+        """
+        calls = {COMPUTE: 0, MEDIA: 0, TASK_LIST: 0, TASK_START: 0}
+
+        if self.preflight and self.preflight_result is None:
+            calls[COMPUTE] += 1
+        if not uses_scene_catalogue(self.context):
+            calls[COMPUTE] += 2  # pre/post provenance
+
+        def download(dep: Dependency, path: Path) -> None:
+            if not path.exists():
+                calls[COMPUTE] += 1  # output grid
+                calls[MEDIA] += local_download_requests(width, height, dep)
+
+        cell_km = resolve_cell_km(
+            self.roi_geometry, self.context.inputs["partition_cell_km"]
+        )
+        stats_calls = len(partition_cells(self.roi_geometry, cell_km)) if cell_km else 1
+
+        # Upper bound: one lookup and one export per checkpointed node
+        checkpoints = self.context.inputs["asset_checkpoints"]
+        if checkpoints is not None:
+            plan = resolve_dependencies([self._dependency_of(d) for d in self.deliverables])
+            for dep in plan:
+                if dep in checkpoints.nodes:
+                    calls[ASSET] = calls.get(ASSET, 0) + 1
+                    calls[TASK_START] += 1
+
+        local_rasters = set()
+
+        for d in self.deliverables:
+            dep = self._dependency_of(d)
+
+            if d.name.endswith("_AREA_STATISTICS"):
+                calls[COMPUTE] += stats_calls
+            elif d.name.endswith("_BURN_PERIMETERS"):
+                if not self._perimeters_inline():
+                    calls[TASK_LIST] = 1
+                    calls[TASK_START] += 1
+                elif not (self.output_dir and self._perimeters_path(d).exists()):
+                    calls[COMPUTE] += 1
+            elif d in VISUAL_RENDERERS:
+                continue
+            elif self.output_dir:
+                download(dep, self.output_dir / f"{self._generate_object_name(d)}.tif")
+                local_rasters.add(dep)
+            elif self.bucket:
+                calls[TASK_LIST] = 1
+                calls[TASK_START] += 1
+
+        for d in self.deliverables:
+            if d not in VISUAL_RENDERERS:
+                continue
+            dep = self._dependency_of(d)
+
+            if self.visual_mode == "local":
+                if dep not in local_rasters:
+                    object_name = self._generate_object_name(d)
+                    download(dep, self.output_dir / f"{object_name}_source.tif")
+            elif self.visual_mode == "tiles":
+                calls[MEDIA] += 1
+            elif (
+                self.image_store is None
+                or self.image_store.get(self._fingerprint_inputs(d)) is None
+            ):
+                calls[MEDIA] += 1
+
+        return calls
+
+    def _perimeters_inline(self) -> bool:
+        """
+        Burn perimeters are returned inline (or written to output_dir)
+        unless the ROI is large and can be exported to GCS instead. Inline
+        perimeters still fall back to the export when there are too many
+        features (see _inline_perimeters).
+        """
+        if self.output_dir or not self.bucket:
+            return True
+        return roi_area_m2(self.roi_geometry) / 10_000 <= self.PERIMETERS_INLINE_MAX_AREA_HA
+
+    def _inline_perimeters(
+        self,
+        d: Deliverable,
+        perimeters: ee.FeatureCollection,
+    ) -> Dict[str, Any] | None:
+        """
+        Fetch the perimeters with their count in one request, or return
+        None when there are more than fit in a single getInfo.
+        """
+        if self.output_dir:
+            path = self._perimeters_path(d)
+            if path.exists():
+                logger.info("[EXPORT] Reusing local file %s", path)
+                return {"path": str(path)}
+
+        count = perimeters.size()
+        response = get_client().get_info(ee.Dictionary({
+            "count": count,
+            # Only materialised when it fits in a single getInfo
+            "features": ee.Algorithms.If(
+                count.lte(self.PERIMETERS_INLINE_MAX_FEATURES), perimeters, None
+            ),
+        }))
+
+        geojson = response.get("features")
+        if geojson is None:
+            logger.warning(
+                "[EXPORT] %s has %d perimeters (inline limit %d)",
+                d.name, response["count"], self.PERIMETERS_INLINE_MAX_FEATURES,
+            )
+            return None
+
+        count = len(geojson["features"])
+        if self.output_dir:
+            return {"path": write_features(geojson, path), "features": count}
+        return {"geojson": geojson, "features": count}
+
+    def _perimeters_path(self, d: Deliverable) -> Path:
+        suffix = VECTOR_FORMATS[self.perimeter_format]
+        return self.output_dir / f"{self._generate_object_name(d)}{suffix}"
+
+    def _export_perimeters(
+        self,
+        d: Deliverable,
+        perimeters: ee.FeatureCollection,
+        export_tasks: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        object_name = self._generate_object_name(d)
+        if export_tasks is None:
+            export_tasks = list_export_tasks()
+
+        existing = find_existing_export(
+            self.bucket, object_name, export_tasks, extension="geojson"
+        )
+        if existing is not None:
+            logger.info(
+                "[EXPORT] Reusing %s task %s for %s",
+                existing["state"],
+                existing["gee_task_id"],
+                d.name,
+            )
+            return existing
+
+        if self.export_scheduler is not None:
+            handle = self.export_scheduler.submit(
+                table_export_task(perimeters, self.bucket, object_name),
+                url=gcs_object_url(self.bucket, object_name, "geojson"),
+                priority=self.export_priority,
+            )
+            self.export_handles[d.name] = handle
+            if self.task_registry is not None:
+                handle.add_submitted_callback(
+                    lambda h: self._register_export(d.name, h.task_id, h.url)
+                )
+            return handle.as_dict()
+
+        return export_table_to_gcs(perimeters, self.bucket, object_name)
+
+    def _register_export(self, deliverable: str, task_id: str, url: str | None) -> None:
+        if self.task_registry is None:
+            return
+        self.task_registry.record_export(
+            task_id,
+            deliverable,
+            url=url,
+            requester=self.requester,
+            webhook=self.notify_webhook,
+        )
+
+    def _run_preflight(self, post_windows: List[Tuple[str, str]] | None = None) -> None:
+        """
+        Check scene availability before building the DAG, widening
+        days_before_after / cloud_threshold up to the configured limits.
+        `post_windows` checks the windows of a time series instead of the
+        regular post-fire window.
+
+        Raises RuntimeError (fail fast) when coverage stays insufficient.
+        """
+        inputs = self.context.inputs
+
+        self.preflight_result = run_preflight(
+            roi=self.roi,
+            start_date=inputs["start_date"],
+            end_date=inputs["end_date"],
+            days_before_after=inputs["days_before_after"],
+            cloud_threshold=inputs["cloud_threshold"],
+            min_coverage=self.min_coverage,
+            max_days_before_after=self.max_days_before_after,
+            max_cloud_threshold=self.max_cloud_threshold,
+            post_windows=post_windows,
+        )
+
+        inputs["days_before_after"] = self.preflight_result["days_before_after"]
+        inputs["cloud_threshold"] = self.preflight_result["cloud_threshold"]
+
+    def run_time_series(
+        self,
+        post_windows: List[Tuple[str, str]],
+    ) -> Dict[str, Any]:
+        """
+        Run the statistics deliverables for several post-fire windows
+        (e.g. 1, 3, 6 and 12 months after the fire) against one shared
+        pre-fire baseline.
+
+        The pre-fire branch (collection, mosaic, NBR/NDVI) is built once
+        and reused by every window. All statistics and provenance for the
+        whole series are materialised in a single request.
+
+        `post_windows` holds inclusive (start, end) date pairs.
+        """
+        if not post_windows:
+            raise ValueError("post_windows must not be empty")
+
+        for start, end in post_windows:
+            parse_window(f"{start}:{end}")
+
+        # Pre-fire window plus every post-fire window, before the DAG
+        if self.preflight and self.preflight_result is None:
+            self._run_preflight(post_windows)
+
+        deliverables = [
+            d for d in self.deliverables if d.name.endswith("_AREA_STATISTICS")
+        ]
+        skipped = [d.name for d in self.deliverables if d not in deliverables]
+        if skipped:
+            logger.warning(
+                "[SERIES] Only statistics are computed per window; ignoring %s",
+                ", ".join(skipped),
+            )
+        if not deliverables:
+            raise ValueError("Time series mode requires *_AREA_STATISTICS deliverables")
+
+        series_inputs = dict(self.context.inputs, defer_statistics=True)
+        contexts = [
+            DAGExecutionContext(**series_inputs, post_fire_window=window)
+            for window in post_windows
+        ]
+        self._sync_scene_catalogue(contexts)
+
+        from_catalogue = uses_scene_catalogue(self.context)
+        shared_cache: Dict[Dependency, Any] = {}
+        batch: Dict[str, Any] = {}
+
+        for i, context in enumerate(contexts):
+            context.cache.update(shared_cache)
+
+            outputs = execute_dag(deliverables, context)
+
+            for d, stats in outputs.items():
+                batch[f"{i}/{d.name}"] = stats
+            if not from_catalogue:
+                batch[f"{i}/provenance"] = self._collection_provenance_request(
+                    context.get(Dependency.POST_FIRE_COLLECTION)
+                )
+
+            for dep, value in context.cache.items():
+                if dep in PRE_FIRE_DEPENDENCIES:
+                    shared_cache.setdefault(dep, value)
+
+        if not from_catalogue:
+            batch["pre_fire/provenance"] = self._collection_provenance_request(
+                shared_cache[Dependency.PRE_FIRE_COLLECTION]
+            )
+
+        logger.info(
+            "[SERIES] Materialising %d windows in one request", len(post_windows)
+        )
+        values = get_client().get_info(ee.Dictionary(batch))
+
+        windows = []
+        table = []
+
+        for i, (start, end) in enumerate(post_windows):
+            statistics = {
+                d.name: format_area_statistics(values[f"{i}/{d.name}"])
+                for d in deliverables
+            }
+            windows.append({
+                "start": start,
+                "end": end,
+                "statistics": statistics,
+                "provenance": {
+                    "images": self._window_provenance(
+                        Dependency.POST_FIRE_COLLECTION, contexts[i], values, f"{i}"
+                    ),
+                },
+            })
+
+            for stat_name, classes in statistics.items():
+                for cls, item in classes.items():
+                    table.append({
+                        "window_start": start,
+                        "window_end": end,
+                        "statistic": stat_name,
+                        "class": cls,
+                        "area_ha": item["area_ha"],
+                        "ratio_percent": item["ratio_percent"],
+                    })
+
+        provenance = {
+            "pre_fire": {
+                "images": self._window_provenance(
+                    Dependency.PRE_FIRE_COLLECTION, self.context, values, "pre_fire"
+                ),
+            },
+            "scene_selection": self._scene_selection(),
+        }
+        if self.preflight_result is not None:
+            provenance["preflight"] = self.preflight_result
+
+        return {
+            "windows": windows,
+            "table": table,
+            "provenance": provenance,
+        }
+
+    @staticmethod
+    def run_many(
+        runners: List["PostFireAssessment"],
+        max_cluster_km: float = DEFAULT_MAX_CLUSTER_KM,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run several assessments, sharing work between neighbouring ROIs.
+
+        ROIs with the same time windows and scene settings are clustered
+        spatially (see roi_clusters). Each cluster builds one collection
+        and pre/post mosaic (and the index images) over the cluster bounds,
+        and the statistics of all its ROIs are computed in one grouped
+        reduction. Mosaics are per-pixel identical to the per-ROI ones,
+        since every scene covering a pixel of an ROI intersects that ROI.
+
+        Runs that pick scenes per ROI (max_scenes_per_window,
+        complete_coverage) or partition their statistics run on their own,
+        as do all runs with `max_cluster_km=0`. Returns the run() results in the order of `runners`.
+        """
+        for runner in runners:
+            if runner.preflight and runner.preflight_result is None:
+                runner._run_preflight()
+
+        if not max_cluster_km:
+            return [runner.run() for runner in runners]
+
+        groups: Dict[str, List[int]] = {}
+        for i, runner in enumerate(runners):
+            key = runner._cluster_key()
+            if key is not None:
+                groups.setdefault(key, []).append(i)
+
+        for members in groups.values():
+            geometries = [runners[i].roi_geometry for i in members]
+            for cluster in cluster_rois(geometries, max_cluster_km):
+                if len(cluster) > 1:
+                    PostFireAssessment._share_cluster(
+                        [runners[members[i]] for i in cluster]
+                    )
+
+        return [runner.run() for runner in runners]
+
+    def _cluster_key(self) -> str | None:
+        """
+        Fingerprint of the inputs that must match for ROIs to share
+        collections and mosaics, or None if this run cannot share them.
+        """
+        inputs = self.context.inputs
+        if inputs["max_scenes_per_window"] or inputs["complete_coverage"]:
+            return None
+        if resolve_cell_km(self.roi_geometry, inputs["partition_cell_km"]):
+            return None
+        # The grouped reduceRegions has no pixel limit to apply
+        if inputs["statistics_max_pixels"]:
+            return None
+
+        return fingerprint({
+            "start_date": inputs["start_date"],
+            "end_date": inputs["end_date"],
+            "cloud_threshold": inputs["cloud_threshold"],
+            "days_before_after": inputs["days_before_after"],
+            "statistics_scale": inputs["statistics_scale"],
+        })
 
     @staticmethod
-    def _load_geojson(path: Path) -> ee.Geometry:
+    def _share_cluster(runners: List["PostFireAssessment"]) -> None:
+        """
+        Build the shared images of a cluster and seed every runner's DAG
+        cache with them and with its statistics.
+        """
+        plan = resolve_dependencies([
+            PostFireAssessment._dependency_of(d)
+            for runner in runners
+            for d in runner.deliverables
+        ])
+        statistics = [dep for dep in plan if dep.name.endswith("_AREA_STATISTICS")]
+        shared = [dep for dep in plan if dep not in ROI_DEPENDENCIES]
+
+        bounds = shape(runners[0].roi_geometry).bounds
+        for runner in runners[1:]:
+            bounds = merge_bounds(bounds, shape(runner.roi_geometry).bounds)
+
+        # Scenes are filtered by the cluster bounds, always in EE: the
+        # catalogue would select them per ROI.
+        context = DAGExecutionContext(**dict(
+            runners[0].context.inputs,
+            roi=ee.Geometry.Rectangle(coords=list(bounds), geodesic=False),
+            roi_geometry=mapping(box(*bounds)),
+            scene_catalogue=None,
+        ))
+        execute_dependencies(shared, context)
+
+        values = {}
+        if statistics:
+            logger.info(
+                "[CLUSTER] Statistics of %d ROIs in one grouped reduction", len(runners)
+            )
+            regions = [runner.roi for runner in runners]
+            scale = context.inputs["statistics_scale"] or DEFAULT_STATISTICS_SCALE
+            values = get_client().get_info(ee.Dictionary({
+                dep.name: area_stats_groups_by_region(
+                    context.get(next(iter(DEPENDENCY_GRAPH[dep]))), regions, scale
+                )
+                for dep in statistics
+            }))
+
+        for i, runner in enumerate(runners):
+            for dep in shared:
+                value = context.get(dep)
+                # Provenance lists the scenes of this ROI only
+                if dep in COLLECTION_DEPENDENCIES:
+                    value = value.filterBounds(runner.roi)
+                runner.context.set(dep, value)
+            for dep in statistics:
+                runner.context.set(dep, format_area_statistics(values[dep.name][i]))
+
+    def _scene_selection(self) -> Dict[str, Any]:
+        return {
+            "max_scenes_per_window": self.context.inputs["max_scenes_per_window"],
+            "complete_coverage": self.context.inputs["complete_coverage"],
+            "scene_catalogue": uses_scene_catalogue(self.context),
+        }
+
+    def _sync_scene_catalogue(self, contexts: List[DAGExecutionContext]) -> None:
+        """
+        Bring the scene catalogue up to date for the full date span of all
+        windows in a single metadata request.
+        """
+        if self.scene_catalogue is None:
+            return
+
+        ranges = [
+            window_range(dep, context)
+            for context in contexts
+            for dep in (Dependency.PRE_FIRE_COLLECTION, Dependency.POST_FIRE_COLLECTION)
+        ]
+        self.scene_catalogue.sync(
+            self.roi_geometry,
+            min(start for start, _ in ranges),
+            max(end for _, end in ranges),
+        )
+
+    def _window_provenance(
+        self,
+        dep: Dependency,
+        context: DAGExecutionContext,
+        values: Dict[str, Any] | None = None,
+        key: str | None = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Provenance of one window's scenes: straight from the scene
+        catalogue when it drove the selection, otherwise from EE (either
+        pre-fetched in `values[f"{key}/provenance"]` or via getInfo).
+        """
+        if uses_scene_catalogue(context):
+            return [
+                {
+                    "id": f"{COLLECTION_ID}/{scene['id']}",
+                    "date": scene["date"],
+                    "cloud_percent": scene["cloud_percent"],
+                    "tile": scene["tile"],
+                }
+                for scene in catalogue_window_scenes(dep, context)
+            ]
+
+        if values is not None:
+            return [f["properties"] for f in values[f"{key}/provenance"]["features"]]
+
+        collection = context.get(dep)
+        if collection is None:
+            return []
+        return self._extract_collection_provenance(collection)
+
+    def _render_visual(
+        self,
+        d: Deliverable,
+        local_rasters: Dict[Dependency, str],
+        session,
+    ) -> Dict[str, Any]:
+        """
+        Request a visual's thumbnail (or XYZ tile layer).
+
+        In local mode, the underlying index raster is downloaded (or reused
+        from the scientific outputs of this run) and rendered with NumPy,
+        with no thumbnail request at all.
+
+        When an image store is configured, the JPEG bytes are fetched and
+        stored under a fingerprint of the visual's inputs; a later run with
+        the same inputs is served from disk without any EE request.
+        """
+        value = self.context.get(self._dependency_of(d))
+
+        if self.visual_mode == "local":
+            return self._render_local_visual(d, value, local_rasters)
+
+        vis = VISUAL_RENDERERS[d](value, self.roi)
+
+        if self.visual_mode == "tiles":
+            return self._render_tile_layer(d, vis)
+
+        if self.image_store is None:
+            return {"url": get_visual_thumbnail_url(vis, self.roi)}
+
+        key = self._fingerprint_inputs(d)
+        cached = self.image_store.get(key)
+        if cached is not None:
+            logger.info("[VISUAL] %s served from image store", d.name)
+            return {"url": None, "path": str(cached)}
+
+        url = get_visual_thumbnail_url(vis, self.roi)
+        response = session.get(url, timeout=120)
+        response.raise_for_status()
+        path = self.image_store.put(key, response.content)
+
+        return {"url": url, "path": str(path)}
+
+    def _render_local_visual(
+        self,
+        d: Deliverable,
+        value: ee.Image,
+        local_rasters: Dict[Dependency, str],
+    ) -> Dict[str, Any]:
+        """
+        Render a visual locally from its index raster.
+        """
+        object_name = self._generate_object_name(d)
+
+        raster = local_rasters.get(self._dependency_of(d))
+        if raster is None:
+            raster = self._download_local(value, f"{object_name}_source.tif")
+
+        path = render_geotiff(
+            deliverable=d,
+            raster_path=raster,
+            output_path=self.output_dir / f"{object_name}.png",
+            roi_geometry=self.roi_geometry,
+        )
+
+        return {"url": None, "path": str(path)}
+
+    def _download_local(self, image: ee.Image, filename: str) -> str:
+        """
+        Download an image to the output directory, unless a previous run
+        with identical inputs already produced the file.
+        """
+        path = self.output_dir / filename
+        if path.exists():
+            logger.info("[EXPORT] Reusing local file %s", path)
+            return str(path)
+
+        return export_geotiff_to_local(
+            image=image,
+            roi=self.roi,
+            path=path,
+            crs=self.export_crs,
+            scale=self.DEFAULT_SCALE,
+        )["path"]
+
+    @staticmethod
+    def _dependency_of(deliverable: Deliverable) -> Dependency:
+        return next(iter(DELIVERABLE_DEPENDENCIES[deliverable]))
+
+    def _render_tile_layer(self, d: Deliverable, vis: ee.Image) -> Dict[str, Any]:
+        """
+        Build an XYZ tile layer for a visual, optionally routed through
+        the local caching tile proxy.
+        """
+        url_format = get_visual_tile_url(vis, self.roi)
+
+        if self.tile_proxy_url:
+            url_format = register_tile_layer(
+                proxy_url=self.tile_proxy_url,
+                key=self._fingerprint_inputs(d),
+                url_format=url_format,
+            )
+
+        return {"url": url_format, "type": "xyz"}
+
+    def _fingerprint_inputs(self, deliverable: Deliverable) -> str:
+        """
+        Fingerprint of everything that determines a deliverable's content.
+        """
+        inputs = self.context.inputs
+        return fingerprint({
+            "roi": self.roi_geometry,
+            "start_date": inputs["start_date"],
+            "end_date": inputs["end_date"],
+            "cloud_threshold": inputs["cloud_threshold"],
+            "days_before_after": inputs["days_before_after"],
+            "max_scenes_per_window": inputs["max_scenes_per_window"],
+            "complete_coverage": inputs["complete_coverage"],
+            "scale": self.DEFAULT_SCALE,
+            "crs": self.export_crs,
+            "deliverable": deliverable.name,
+            **self._perimeter_inputs(deliverable),
+        })
+
+    def _perimeter_inputs(self, deliverable: Deliverable) -> Dict[str, Any]:
+        # Only perimeter outputs depend on the vectorisation settings;
+        # other deliverables keep their existing fingerprints.
+        if not deliverable.name.endswith("_BURN_PERIMETERS"):
+            return {}
+        inputs = self.context.inputs
+        return {
+            "perimeters": {
+                "scale": inputs["perimeter_scale"],
+                "tile_scale": inputs["perimeter_tile_scale"],
+                "min_mapping_unit_ha": inputs["min_mapping_unit_ha"],
+                "simplify_tolerance": inputs["simplify_tolerance"],
+            }
+        }
+
+    @staticmethod
+    def _load_geojson(path: Path) -> Dict[str, Any]:
         import json
         with open(path, encoding="utf-8") as f:       # alterei para abrir arquivos no padrão UTF8   Reginaldo Cardoso
             geojson = json.load(f)
-        return ee.Geometry(geojson["features"][0]["geometry"])
+        return geojson["features"][0]["geometry"]
     
-    @staticmethod
-    def _generate_object_name(
-        deliverable: str,
-        start_date: str,
-        end_date: str,
-    ) -> str:
+    def _generate_object_name(self, deliverable: Deliverable) -> str:
         """
-        Generate a unique object name for exports.
+        Generate a deterministic object name for exports.
+
+        The name ends with a hash of the ROI, dates, parameters and
+        deliverable, so identical requests always map to the same object.
         """
-        ts = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
-        uid = uuid.uuid4().hex[:8]
+        start_norm = self.context.inputs["start_date"].replace("-", "_")
+        end_norm = self.context.inputs["end_date"].replace("-", "_")
+        digest = self._fingerprint_inputs(deliverable)[:16]
 
-        start_norm = start_date.replace("-", "_")
-        end_norm = end_date.replace("-", "_")
+        return f"{deliverable.name.lower()}_{start_norm}_{end_norm}_{digest}"
 
-        return f"{deliverable}_{start_norm}_{end_norm}_{ts}_{uid}"
-        
     @staticmethod
     def _parse_date(value: str, field_name: str) -> date:
         try:
@@ -164,6 +1279,21 @@ class PostFireAssessment:
         The order reflects the ImageCollection internal ordering
         (i.e., sorted by CLOUDY_PIXEL_PERCENTAGE).
         """
+        feature_collection = PostFireAssessment._collection_provenance_request(
+            collection
+        )
+
+        features = get_client().get_info(feature_collection)["features"]
+
+        return [f["properties"] for f in features]
+
+    @staticmethod
+    def _collection_provenance_request(
+        collection: ee.ImageCollection,
+    ) -> ee.FeatureCollection:
+        """
+        Server-side provenance features (id, date, cloud %) of a collection.
+        """
         def to_feature(img):
             return ee.Feature(
                 None,
@@ -173,11 +1303,8 @@ class PostFireAssessment:
                         img.get("system:time_start")
                     ).format("YYYY-MM-dd"),
                     "cloud_percent": img.get("CLOUDY_PIXEL_PERCENTAGE"),
+                    "tile": img.get("MGRS_TILE"),
                 },
             )
 
-        feature_collection = ee.FeatureCollection(collection.map(to_feature))
-
-        features = feature_collection.getInfo()["features"]
-
-        return [f["properties"] for f in features]
+        return ee.FeatureCollection(collection.map(to_feature))
@@ -0,0 +1,189 @@
+# wildfire_analyser/fire_assessment/preflight.py
+#
+# Cheap pre-flight check of scene availability, run before the DAG.
+#
+# Scene counts and ROI coverage fractions of the pre- and post-fire windows
+# are fetched for every candidate (days_before_after, cloud_threshold)
+# setting in one small request. The first setting with enough coverage in
+# both windows is used; if none qualifies, the run fails fast instead of
+# discovering empty windows after the expensive reductions.
+#
+# In time-series mode the post-fire windows are fixed date ranges: they are
+# all checked, and only the cloud threshold widening applies to them.
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import ee
+
+from wildfire_analyser.fire_assessment.ee_client import get_client
+from wildfire_analyser.fire_assessment.sentinel2 import COLLECTION_ID
+from wildfire_analyser.fire_assessment.time_windows import (
+    compute_fire_time_windows,
+    window_filter_range,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_COVERAGE = 0.99
+DEFAULT_DAYS_STEP = 5
+DEFAULT_CLOUD_STEP = 10
+COVERAGE_MAX_ERROR = 10  # meters
+
+
+def candidate_settings(
+    days_before_after: int,
+    cloud_threshold: int,
+    max_days_before_after: int | None = None,
+    max_cloud_threshold: int | None = None,
+    days_step: int = DEFAULT_DAYS_STEP,
+    cloud_step: int = DEFAULT_CLOUD_STEP,
+) -> List[Tuple[int, int]]:
+    """
+    Widening ladder of (days_before_after, cloud_threshold) settings.
+
+    The window is widened first, up to its limit, and only then the cloud
+    threshold, so cleaner scenes are preferred over cloudier ones.
+    """
+    max_days = max(days_before_after, max_days_before_after or days_before_after)
+    max_cloud = max(cloud_threshold, max_cloud_threshold or cloud_threshold)
+
+    days, cloud = days_before_after, cloud_threshold
+    candidates = [(days, cloud)]
+
+    while days < max_days:
+        days = min(days + days_step, max_days)
+        candidates.append((days, cloud))
+
+    while cloud < max_cloud:
+        cloud = min(cloud + cloud_step, max_cloud)
+        candidates.append((days, cloud))
+
+    return candidates
+
+
+def _window_summary(
+    collection: ee.ImageCollection,
+    roi: ee.Geometry,
+    roi_area: ee.Number,
+) -> ee.Dictionary:
+    margin = ee.ErrorMargin(COVERAGE_MAX_ERROR)
+    covered = collection.geometry().intersection(roi, margin).area(margin)
+
+    return ee.Dictionary({
+        "scenes": collection.size(),
+        "coverage": covered.divide(roi_area).min(1),
+    })
+
+
+def _post_fire_summaries(attempt: Dict[str, Any]) -> List[Dict[str, Any]]:
+    if "post_windows" in attempt:
+        return attempt["post_windows"]
+    return [attempt["post_fire"]]
+
+
+def run_preflight(
+    roi: ee.Geometry,
+    start_date: str,
+    end_date: str,
+    days_before_after: int,
+    cloud_threshold: int,
+    min_coverage: float = DEFAULT_MIN_COVERAGE,
+    max_days_before_after: int | None = None,
+    max_cloud_threshold: int | None = None,
+    post_windows: Optional[List[Tuple[str, str]]] = None,
+) -> Dict[str, Any]:
+    """
+    Check scene availability for both windows and pick the narrowest
+    setting that satisfies `min_coverage`.
+
+    With `post_windows` (inclusive (start, end) pairs of a time series)
+    every one of them is checked instead of the post-fire window derived
+    from `days_before_after`, and reported under "post_windows".
+
+    Raises RuntimeError when no candidate setting qualifies.
+    """
+    candidates = candidate_settings(
+        days_before_after,
+        cloud_threshold,
+        max_days_before_after,
+        max_cloud_threshold,
+    )
+
+    base = ee.ImageCollection(COLLECTION_ID).filterBounds(roi)
+    roi_area = roi.area(COVERAGE_MAX_ERROR)
+
+    summaries = {}
+    for i, (days, cloud) in enumerate(candidates):
+        before_start, before_end, after_start, after_end = compute_fire_time_windows(
+            start_date, end_date, days
+        )
+        filtered = base.filter(ee.Filter.lte("CLOUDY_PIXEL_PERCENTAGE", cloud))
+
+        summaries[f"{i}/pre_fire"] = _window_summary(
+            filtered.filterDate(before_start, before_end), roi, roi_area
+        )
+        if post_windows is None:
+            summaries[f"{i}/post_fire"] = _window_summary(
+                filtered.filterDate(after_start, after_end), roi, roi_area
+            )
+            continue
+        for j, window in enumerate(post_windows):
+            summaries[f"{i}/post_fire/{j}"] = _window_summary(
+                filtered.filterDate(*window_filter_range(*window)), roi, roi_area
+            )
+
+    values = get_client().get_info(ee.Dictionary(summaries))
+
+    attempts = []
+    for i, (days, cloud) in enumerate(candidates):
+        attempt = {
+            "days_before_after": days,
+            "cloud_threshold": cloud,
+            "pre_fire": values[f"{i}/pre_fire"],
+        }
+        if post_windows is None:
+            attempt["post_fire"] = values[f"{i}/post_fire"]
+        else:
+            attempt["post_windows"] = [
+                {"start": start, "end": end, **values[f"{i}/post_fire/{j}"]}
+                for j, (start, end) in enumerate(post_windows)
+            ]
+        attempts.append(attempt)
+
+        if all(
+            summary["scenes"] > 0 and summary["coverage"] >= min_coverage
+            for summary in [attempt["pre_fire"], *_post_fire_summaries(attempt)]
+        ):
+            if i > 0:
+                logger.info(
+                    "[PREFLIGHT] Widened to days_before_after=%d, cloud_threshold=%d",
+                    days,
+                    cloud,
+                )
+            return {
+                **attempt,
+                "min_coverage": min_coverage,
+                "widened": i > 0,
+                "attempts": attempts,
+            }
+
+    last = attempts[-1]
+    post_fire = min(
+        _post_fire_summaries(last), key=lambda s: (s["coverage"], s["scenes"])
+    )
+    post_label = (
+        f"post-fire {post_fire['start']}..{post_fire['end']}"
+        if post_windows is not None
+        else "post-fire"
+    )
+    raise RuntimeError(
+        "Insufficient Sentinel-2 coverage for the requested windows "
+        f"(min_coverage={min_coverage}). Widest setting tried: "
+        f"days_before_after={last['days_before_after']}, "
+        f"cloud_threshold={last['cloud_threshold']} -> "
+        f"pre-fire {last['pre_fire']['scenes']} scenes / "
+        f"{last['pre_fire']['coverage']:.1%} coverage, "
+        f"{post_label} {post_fire['scenes']} scenes / "
+        f"{post_fire['coverage']:.1%} coverage"
+    )
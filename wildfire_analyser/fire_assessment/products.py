@@ -1,9 +1,22 @@
-from typing import Callable, Dict, Any
+from typing import Callable, Dict, Any, List
 import ee
 
 from wildfire_analyser.fire_assessment.dependencies import Dependency
-from wildfire_analyser.fire_assessment.time_windows import compute_fire_time_windows
-from wildfire_analyser.fire_assessment.sentinel2 import gather_collection
+from wildfire_analyser.fire_assessment.ee_client import get_client
+from wildfire_analyser.fire_assessment.partitioned_stats import (
+    merge_area_groups,
+    partition_cells,
+    reduce_cells,
+    resolve_cell_km,
+)
+from wildfire_analyser.fire_assessment.time_windows import (
+    compute_fire_time_windows,
+    window_filter_range,
+)
+from wildfire_analyser.fire_assessment.sentinel2 import (
+    gather_collection,
+    select_scenes,
+)
 
 ProductExecutor = Callable[[Any], Any]
 PRODUCT_REGISTRY: Dict[Dependency, ProductExecutor] = {}
@@ -31,38 +44,88 @@ def gather_collection_node(context):
     )
 
 
-@register(Dependency.PRE_FIRE_COLLECTION)
-def build_pre_fire_collection(context):
-    collection = context.get(Dependency.COLLECTION_GATHERING)
-    if collection is None:
-        raise RuntimeError("COLLECTION_GATHERING not available")
-
+def window_range(dep: Dependency, context) -> tuple[str, str]:
+    """
+    [start, end) date range of the PRE_FIRE or POST_FIRE collection.
+    """
     start_date = context.inputs["start_date"]
     end_date = context.inputs["end_date"]
     days = context.inputs.get("days_before_after")
 
-    before_start, before_end, _, _ = compute_fire_time_windows(
+    before_start, before_end, after_start, after_end = compute_fire_time_windows(
         start_date, end_date, days
     )
 
-    return collection.filterDate(before_start, before_end)
+    if dep is Dependency.PRE_FIRE_COLLECTION:
+        return before_start, before_end
 
+    # Recovery time series: explicit (inclusive) post-fire window
+    post_fire_window = context.inputs.get("post_fire_window")
+    if post_fire_window is not None:
+        return window_filter_range(*post_fire_window)
+
+    return after_start, after_end
+
+
+def uses_scene_catalogue(context) -> bool:
+    """
+    Whether window scenes are picked client-side from the scene catalogue.
+
+    Complete-coverage selection needs the footprints of all candidates
+    server-side, so it keeps using the EE collection.
+    """
+    return (
+        context.inputs.get("scene_catalogue") is not None
+        and not context.inputs.get("complete_coverage", False)
+    )
+
+
+def catalogue_window_scenes(dep: Dependency, context):
+    """
+    Scenes of one window selected from the local scene catalogue.
+    """
+    start, end = window_range(dep, context)
+
+    return context.inputs["scene_catalogue"].select_scenes(
+        context.inputs["roi_geometry"],
+        start,
+        end,
+        cloud_threshold=context.inputs.get("cloud_threshold"),
+        max_scenes_per_tile=context.inputs.get("max_scenes_per_window"),
+    )
+
+
+def _window_collection(dep: Dependency, context):
+    if uses_scene_catalogue(context):
+        scenes = catalogue_window_scenes(dep, context)
+        return gather_collection(
+            roi=context.inputs["roi"],
+            cloud_threshold=context.inputs.get("cloud_threshold"),
+            scene_ids=[scene["id"] for scene in scenes],
+        )
 
-@register(Dependency.POST_FIRE_COLLECTION)
-def build_post_fire_collection(context):
     collection = context.get(Dependency.COLLECTION_GATHERING)
     if collection is None:
         raise RuntimeError("COLLECTION_GATHERING not available")
 
-    start_date = context.inputs["start_date"]
-    end_date = context.inputs["end_date"]
-    days = context.inputs.get("days_before_after")
+    start, end = window_range(dep, context)
 
-    _, _, after_start, after_end = compute_fire_time_windows(
-        start_date, end_date, days
+    return select_scenes(
+        collection.filterDate(start, end),
+        roi=context.inputs["roi"],
+        max_scenes_per_tile=context.inputs.get("max_scenes_per_window"),
+        complete_coverage=context.inputs.get("complete_coverage", False),
     )
 
-    return collection.filterDate(after_start, after_end)
+
+@register(Dependency.PRE_FIRE_COLLECTION)
+def build_pre_fire_collection(context):
+    return _window_collection(Dependency.PRE_FIRE_COLLECTION, context)
+
+
+@register(Dependency.POST_FIRE_COLLECTION)
+def build_post_fire_collection(context):
+    return _window_collection(Dependency.POST_FIRE_COLLECTION, context)
 
 
 # ─────────────────────────────
@@ -281,7 +344,19 @@ def format_area_statistics(stats):
 
     return result
 
-def compute_area_stats(severity: ee.Image, roi: ee.Geometry):
+DEFAULT_STATISTICS_SCALE = 10          # m
+DEFAULT_STATISTICS_MAX_PIXELS = 1e13
+
+
+def area_stats_groups(
+    severity: ee.Image,
+    roi: ee.Geometry,
+    scale: float = DEFAULT_STATISTICS_SCALE,
+    max_pixels: float = DEFAULT_STATISTICS_MAX_PIXELS,
+) -> ee.List:
+    """
+    Server-side grouped area sums (ha) per severity class.
+    """
     pixel_area = ee.Image.pixelArea().divide(10_000)  # m² → ha
 
     reducer = ee.Reducer.sum().group(
@@ -295,25 +370,130 @@ def compute_area_stats(severity: ee.Image, roi: ee.Geometry):
         .reduceRegion(
             reducer=reducer,
             geometry=roi,
-            scale=10,
-            maxPixels=1e13,
+            scale=scale,
+            maxPixels=max_pixels,
         )
         .get("groups")
     )
 
-    stats = ee.List(stats).getInfo()
+    return ee.List(stats)
 
-    return format_area_statistics(stats)
 
-@register(Dependency.DNBR_AREA_STATISTICS)
-def compute_dnbr_area_statistics(context):
-    dnbr = context.get(Dependency.DNBR)
+def compute_area_stats(
+    severity: ee.Image,
+    roi: ee.Geometry,
+    defer: bool = False,
+    scale: float = DEFAULT_STATISTICS_SCALE,
+    max_pixels: float = DEFAULT_STATISTICS_MAX_PIXELS,
+):
+    """
+    Compute paper-ready area statistics.
+
+    With `defer`, the unevaluated ee.List is returned so the caller can
+    batch several statistics into a single request and format them with
+    `format_area_statistics`.
+    """
+    stats = area_stats_groups(severity, roi, scale, max_pixels)
+    if defer:
+        return stats
+
+    return format_area_statistics(get_client().get_info(stats))
+
+
+def compute_area_stats_partitioned(
+    severity: ee.Image,
+    roi: ee.Geometry,
+    roi_geometry: Dict[str, Any],
+    cell_km: float,
+    scale: float = DEFAULT_STATISTICS_SCALE,
+    max_pixels: float = DEFAULT_STATISTICS_MAX_PIXELS,
+):
+    """
+    Area statistics reduced per grid cell concurrently and merged
+    client-side (see partitioned_stats).
+    """
+    masked = severity.clip(roi)
+    cells = partition_cells(roi_geometry, cell_km)
+
+    def reduce_cell(cell):
+        region = ee.Geometry.Rectangle(coords=list(cell), geodesic=False)
+        return get_client().get_info(
+            area_stats_groups(masked, region, scale, max_pixels)
+        )
+
+    return format_area_statistics(merge_area_groups(reduce_cells(reduce_cell, cells)))
+
+
+def area_stats_groups_by_region(
+    severity: ee.Image,
+    regions: List[ee.Geometry],
+    scale: float = DEFAULT_STATISTICS_SCALE,
+) -> ee.List:
+    """
+    Server-side grouped area sums (ha) per severity class for several
+    regions in one reduceRegions, as a list in the order of `regions`.
+    """
+    pixel_area = ee.Image.pixelArea().divide(10_000)  # m² → ha
+
+    reducer = ee.Reducer.sum().group(
+        groupField=1,
+        groupName="severity_class",
+    )
+
+    collection = ee.FeatureCollection([
+        ee.Feature(region, {"region_index": i}) for i, region in enumerate(regions)
+    ])
+
+    return (
+        pixel_area
+        .addBands(severity)
+        .reduceRegions(collection=collection, reducer=reducer, scale=scale)
+        .sort("region_index")
+        .aggregate_array("groups")
+    )
+
+
+def _area_statistics(severity: ee.Image, context):
+    """
+    Statistics of a severity image: deferred for batching, partitioned
+    for very large ROIs, or a single reduction.
+
+    Deferred (time series) statistics are never partitioned: they are
+    materialised in one request together with the other windows.
+    """
     roi = context.inputs["roi"]
+    scale = context.inputs.get("statistics_scale") or DEFAULT_STATISTICS_SCALE
+    max_pixels = (
+        context.inputs.get("statistics_max_pixels") or DEFAULT_STATISTICS_MAX_PIXELS
+    )
+
+    if context.inputs.get("defer_statistics", False):
+        return compute_area_stats(
+            severity, roi, defer=True, scale=scale, max_pixels=max_pixels
+        )
+
+    cell_km = resolve_cell_km(
+        context.inputs["roi_geometry"], context.inputs.get("partition_cell_km")
+    )
+    if cell_km:
+        return compute_area_stats_partitioned(
+            severity, roi, context.inputs["roi_geometry"], cell_km, scale, max_pixels
+        )
+
+    return compute_area_stats(severity, roi, scale=scale, max_pixels=max_pixels)
+
+# ─────────────────────────────
+# Severity classes
+# ─────────────────────────────
+
+@register(Dependency.DNBR_SEVERITY)
+def classify_dnbr_severity(context):
+    dnbr = context.get(Dependency.DNBR)
 
     if dnbr is None:
         raise RuntimeError("DNBR not available")
 
-    severity = (
+    return (
         ee.Image(0)
         .where(dnbr.gte(0.10).And(dnbr.lt(0.27)), 1)
         .where(dnbr.gte(0.27).And(dnbr.lt(0.44)), 2)
@@ -323,17 +503,14 @@ def compute_dnbr_area_statistics(context):
         .toInt8()
     )
 
-    return compute_area_stats(severity, roi)
-
-@register(Dependency.DNDVI_AREA_STATISTICS)
-def compute_dndvi_area_statistics(context):
+@register(Dependency.DNDVI_SEVERITY)
+def classify_dndvi_severity(context):
     dndvi = context.get(Dependency.DNDVI)
-    roi = context.inputs["roi"]
 
     if dndvi is None:
         raise RuntimeError("DNDVI not available")
 
-    severity = (
+    return (
         ee.Image(0)  # Unburned: dNDVI < 0.07
         .where(dndvi.gte(0.07).And(dndvi.lt(0.10)), 1)   # Low
         .where(dndvi.gte(0.10).And(dndvi.lt(0.20)), 1)  # Low
@@ -342,17 +519,14 @@ def compute_dndvi_area_statistics(context):
         .where(dndvi.gte(0.45), 4)                      # Very High
     )
 
-    return compute_area_stats(severity, roi)
-
-@register(Dependency.RBR_AREA_STATISTICS)
-def compute_rbr_area_statistics(context):
+@register(Dependency.RBR_SEVERITY)
+def classify_rbr_severity(context):
     rbr = context.get(Dependency.RBR)
-    roi = context.inputs["roi"]
 
     if rbr is None:
         raise RuntimeError("RBR not available")
 
-    severity = (
+    return (
         ee.Image(0)
         .where(rbr.gte(0.10).And(rbr.lt(0.27)), 1)
         .where(rbr.gte(0.27).And(rbr.lt(0.44)), 2)
@@ -362,4 +536,106 @@ def compute_rbr_area_statistics(context):
         .toInt8()
     )
 
-    return compute_area_stats(severity, roi)
+# ─────────────────────────────
+# Statistics executors
+# ─────────────────────────────
+
+def _severity(dep: Dependency, context) -> ee.Image:
+    severity = context.get(dep)
+    if severity is None:
+        raise RuntimeError(f"{dep.name} not available")
+    return severity
+
+@register(Dependency.DNBR_AREA_STATISTICS)
+def compute_dnbr_area_statistics(context):
+    return _area_statistics(_severity(Dependency.DNBR_SEVERITY, context), context)
+
+@register(Dependency.DNDVI_AREA_STATISTICS)
+def compute_dndvi_area_statistics(context):
+    return _area_statistics(_severity(Dependency.DNDVI_SEVERITY, context), context)
+
+@register(Dependency.RBR_AREA_STATISTICS)
+def compute_rbr_area_statistics(context):
+    return _area_statistics(_severity(Dependency.RBR_SEVERITY, context), context)
+
+# ─────────────────────────────
+# Stage 6 – Burn perimeters
+# ─────────────────────────────
+
+DEFAULT_PERIMETER_SCALE = 30          # m
+DEFAULT_PERIMETER_TILE_SCALE = 4
+DEFAULT_MIN_MAPPING_UNIT_HA = 1.0
+
+
+def burn_perimeters(
+    severity: ee.Image,
+    roi: ee.Geometry,
+    scale: float = DEFAULT_PERIMETER_SCALE,
+    tile_scale: float = DEFAULT_PERIMETER_TILE_SCALE,
+    min_mapping_unit_ha: float = DEFAULT_MIN_MAPPING_UNIT_HA,
+    simplify_tolerance: float | None = None,
+) -> ee.FeatureCollection:
+    """
+    Vectorise the burned severity classes (1-4) server-side.
+
+    One polygon per connected patch of a class, with `severity_class`,
+    `severity` (label) and `area_ha` properties. Patches smaller than the
+    minimum mapping unit are dropped; outlines are simplified with
+    `simplify_tolerance` metres (default: the vectorisation scale).
+    """
+    tolerance = scale if simplify_tolerance is None else simplify_tolerance
+    labels = ee.Dictionary({str(k): v for k, v in SEVERITY_LABELS.items()})
+
+    burned = severity.rename("severity").toInt8()
+    vectors = burned.updateMask(burned.gt(0)).reduceToVectors(
+        geometry=roi,
+        scale=scale,
+        geometryType="polygon",
+        eightConnected=False,
+        labelProperty="severity_class",
+        maxPixels=1e13,
+        tileScale=tile_scale,
+    )
+
+    def describe(feature):
+        area_ha = feature.geometry().area(1).divide(10_000)
+        cls = ee.Number(feature.get("severity_class")).int()
+        return ee.Feature(
+            feature.geometry().simplify(tolerance),
+            {
+                "severity_class": cls,
+                "severity": labels.get(cls.format()),
+                "area_ha": area_ha,
+            },
+        )
+
+    return (
+        vectors.map(describe)
+        .filter(ee.Filter.gte("area_ha", min_mapping_unit_ha))
+    )
+
+
+def _burn_perimeters(dep: Dependency, context) -> ee.FeatureCollection:
+    inputs = context.inputs
+    return burn_perimeters(
+        _severity(dep, context),
+        inputs["roi"],
+        scale=inputs.get("perimeter_scale") or DEFAULT_PERIMETER_SCALE,
+        tile_scale=inputs.get("perimeter_tile_scale") or DEFAULT_PERIMETER_TILE_SCALE,
+        min_mapping_unit_ha=inputs.get(
+            "min_mapping_unit_ha", DEFAULT_MIN_MAPPING_UNIT_HA
+        ),
+        simplify_tolerance=inputs.get("simplify_tolerance"),
+    )
+
+@register(Dependency.DNBR_BURN_PERIMETERS)
+def vectorise_dnbr_burn_perimeters(context):
+    return _burn_perimeters(Dependency.DNBR_SEVERITY, context)
+
+@register(Dependency.DNDVI_BURN_PERIMETERS)
+def vectorise_dndvi_burn_perimeters(context):
+    return _burn_perimeters(Dependency.DNDVI_SEVERITY, context)
+
+@register(Dependency.RBR_BURN_PERIMETERS)
+def vectorise_rbr_burn_perimeters(context):
+    return _burn_perimeters(Dependency.RBR_SEVERITY, context)
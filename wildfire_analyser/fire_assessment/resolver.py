@@ -1,12 +1,13 @@
 # wildfire_analyser/fire_assessment/resolver.py
 
-from typing import Dict, Iterable, Any, List
+from typing import Dict, Iterable, Any, List, Set
 
 from wildfire_analyser.fire_assessment.deliverables import Deliverable
 from wildfire_analyser.fire_assessment.deliverable_dependencies import (
     DELIVERABLE_DEPENDENCIES,
 )
 from wildfire_analyser.fire_assessment.dependencies import Dependency
+from wildfire_analyser.fire_assessment.dependency_graph import DEPENDENCY_GRAPH
 from wildfire_analyser.fire_assessment.dependency_resolver import resolve_dependencies
 from wildfire_analyser.fire_assessment.products import PRODUCT_REGISTRY
 
@@ -14,6 +15,14 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Lazy scene collections read by the run provenance: always built (no
+# request), even when a restored checkpoint makes them unnecessary for
+# the requested nodes.
+PROVENANCE_DEPENDENCIES = (
+    Dependency.PRE_FIRE_COLLECTION,
+    Dependency.POST_FIRE_COLLECTION,
+)
+
 
 class DAGExecutionContext:
     """
@@ -31,6 +40,78 @@ class DAGExecutionContext:
         self.cache[dep] = value
 
 
+def execute_dependencies(
+    dependencies: Iterable[Dependency],
+    context: DAGExecutionContext,
+) -> List[Dependency]:
+    """
+    Execute the given dependencies and everything they depend on, in
+    topological order, skipping nodes already in the context cache.
+
+    With `asset_checkpoints` in the context inputs, checkpointed nodes are
+    loaded from their Earth Engine asset when it is ready (starting from
+    the most derived node, so an ancestor only needed by a restored node
+    is neither looked up nor built), and exported after being computed
+    otherwise. The provenance collections are built either way.
+
+    Returns the execution order.
+    """
+    dependencies = list(dependencies)
+    execution_order = resolve_dependencies(dependencies)
+
+    checkpoints = context.inputs.get("asset_checkpoints")
+    needed = set(execution_order)
+    if checkpoints is not None:
+        for dep in reversed(execution_order):
+            if dep in _needed_dependencies(dependencies, context):
+                checkpoints.restore(dep, context)
+        needed = _needed_dependencies(
+            dependencies
+            + [dep for dep in PROVENANCE_DEPENDENCIES if dep in execution_order],
+            context,
+        )
+
+    for dep in execution_order:
+        if dep in context.cache or dep not in needed:
+            continue
+
+        logger.info("[DAG] Executing dependency: %s", dep.name)
+
+        executor = PRODUCT_REGISTRY.get(dep)
+        if executor is None:
+            raise KeyError(f"No product executor registered for dependency {dep}")
+
+        result = executor(context)
+        context.set(dep, result)
+
+        if checkpoints is not None and dep in needed:
+            checkpoints.save(dep, result, context)
+
+    return execution_order
+
+
+def _needed_dependencies(
+    dependencies: List[Dependency],
+    context: DAGExecutionContext,
+) -> Set[Dependency]:
+    """
+    Nodes reachable from `dependencies` without passing through a node
+    already in the context cache.
+    """
+    needed: Set[Dependency] = set()
+    stack = list(dependencies)
+
+    while stack:
+        dep = stack.pop()
+        if dep in needed:
+            continue
+        needed.add(dep)
+        if dep not in context.cache:
+            stack.extend(DEPENDENCY_GRAPH.get(dep, set()))
+
+    return needed
+
+
 def execute_dag(
     deliverables: Iterable[Deliverable],
     context: DAGExecutionContext,
@@ -59,22 +140,8 @@ def execute_dag(
             raise KeyError(f"No dependencies defined for deliverable {deliverable}")
         requested_dependencies.extend(deps)
 
-    # 2. Resolve full dependency order
-    execution_order = resolve_dependencies(requested_dependencies)
-
-    # 3. Execute dependencies in order
-    for dep in execution_order:
-        if dep in context.cache:
-            continue
-
-        logger.info("[DAG] Executing dependency: %s", dep.name)
-
-        executor = PRODUCT_REGISTRY.get(dep)
-        if executor is None:
-            raise KeyError(f"No product executor registered for dependency {dep}")
-
-        result = executor(context)
-        context.set(dep, result)
+    # 2-3. Resolve full dependency order and execute it
+    execute_dependencies(requested_dependencies, context)
 
     # 4. Collect final deliverables
     outputs: Dict[Deliverable, Any] = {}
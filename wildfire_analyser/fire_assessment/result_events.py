@@ -0,0 +1,56 @@
+# wildfire_analyser/fire_assessment/result_events.py
+#
+# Events yielded by PostFireAssessment.iter_results / aiter_results, one per
+# deliverable as soon as it is ready. `section` is the key of the run()
+# result the event's value belongs to, so a consumer can rebuild the full
+# result (or update a partial one) with result[event.section][event.name].
+
+from dataclasses import dataclass
+from typing import Any, ClassVar
+
+
+@dataclass(frozen=True)
+class ResultEvent:
+    name: str
+    value: Any
+
+    section: ClassVar[str]
+
+
+@dataclass(frozen=True)
+class StatisticsReady(ResultEvent):
+    """
+    Area statistics of a *_AREA_STATISTICS deliverable.
+    """
+
+    section: ClassVar[str] = "statistics"
+
+
+@dataclass(frozen=True)
+class VisualReady(ResultEvent):
+    """
+    Thumbnail URL, tile layer or local rendering of a *_VISUAL deliverable.
+    """
+
+    section: ClassVar[str] = "visual"
+
+
+@dataclass(frozen=True)
+class ExportSubmitted(ResultEvent):
+    """
+    Scientific deliverable handed off: GCS export task submitted (or
+    queued / reused), local file written, or burn perimeters returned
+    inline.
+    """
+
+    section: ClassVar[str] = "scientific"
+
+
+@dataclass(frozen=True)
+class ProvenanceReady(ResultEvent):
+    """
+    One provenance entry: pre_fire / post_fire scenes, scene_selection
+    or preflight.
+    """
+
+    section: ClassVar[str] = "provenance"
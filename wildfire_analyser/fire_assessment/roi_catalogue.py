@@ -0,0 +1,167 @@
+# wildfire_analyser/fire_assessment/roi_catalogue.py
+#
+# Indexed ROI catalogue in a single GeoPackage or FlatGeobuf file.
+#
+# Instead of one GeoJSON file per conservation unit, all ROIs live in one
+# layer (name, source, geometry in EPSG:4326). The file is read once per
+# process; lookups by name hit an in-memory cache of parsed GeoJSON
+# geometries, and bbox / intersection queries ("which units intersect this
+# fire?") go through an STRtree spatial index instead of parsing every file.
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import geopandas as gpd
+import shapely
+from shapely.geometry import box, shape
+
+logger = logging.getLogger(__name__)
+
+CATALOGUE_DRIVERS = {".gpkg": "GPKG", ".fgb": "FlatGeobuf"}
+LAYER = "rois"
+
+
+def _driver(path: Path) -> str:
+    driver = CATALOGUE_DRIVERS.get(path.suffix.lower())
+    if driver is None:
+        raise ValueError(
+            f"ROI catalogue must be a {' or '.join(CATALOGUE_DRIVERS)} file (got {path})"
+        )
+    return driver
+
+
+def build_roi_catalogue(directory: str | Path, path: str | Path) -> int:
+    """
+    Write every *.geojson ROI in `directory` to the catalogue at `path`
+    (.gpkg or .fgb, replacing it). Each ROI is named after its file stem
+    and keeps the geometry the client would use (the first feature's).
+
+    Returns the number of ROIs written.
+    """
+    directory = Path(directory)
+    path = Path(path)
+    driver = _driver(path)
+
+    names, sources, geometries = [], [], []
+    for source in sorted(directory.glob("*.geojson")):
+        with open(source, encoding="utf-8") as f:
+            geojson = json.load(f)
+        names.append(source.stem)
+        sources.append(source.name)
+        geometries.append(shape(geojson["features"][0]["geometry"]))
+
+    if not names:
+        raise ValueError(f"No GeoJSON files found in {directory}")
+
+    frame = gpd.GeoDataFrame(
+        {"name": names, "source": sources}, geometry=geometries, crs="EPSG:4326"
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        path.unlink()
+
+    # Polygons are kept as polygons (not promoted to multipolygons), so
+    # catalogue geometries fingerprint like the original GeoJSON files.
+    kwargs = {"layer": LAYER} if driver == "GPKG" else {}
+    frame.to_file(path, driver=driver, promote_to_multi=False, **kwargs)
+
+    logger.info("[ROI] Catalogue %s written with %d ROIs", path, len(frame))
+    return len(frame)
+
+
+class RoiCatalogue:
+    """
+    Read-only ROI catalogue with name lookups and spatial queries.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        driver = _driver(self.path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"ROI catalogue not found: {self.path}")
+
+        kwargs = {"layer": LAYER} if driver == "GPKG" else {}
+        frame = gpd.read_file(self.path, **kwargs)
+        if frame.crs is not None and frame.crs.to_epsg() != 4326:
+            frame = frame.to_crs("EPSG:4326")
+
+        duplicated = frame["name"][frame["name"].duplicated()].tolist()
+        if duplicated:
+            raise ValueError(f"Duplicate ROI names in {self.path}: {duplicated}")
+
+        self._names: List[str] = frame["name"].tolist()
+        self._index = {name: i for i, name in enumerate(self._names)}
+        self._geoms = frame.geometry.values
+        self._sindex = frame.sindex
+        self._geojson: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
+
+    def names(self) -> List[str]:
+        return list(self._names)
+
+    def geometry(self, name: str) -> Dict[str, Any]:
+        """
+        GeoJSON geometry of an ROI (parsed once, then cached).
+        """
+        with self._lock:
+            cached = self._geojson.get(name)
+            if cached is None:
+                if name not in self._index:
+                    raise KeyError(f"ROI '{name}' not found in {self.path}")
+                cached = json.loads(shapely.to_geojson(self._geoms[self._index[name]]))
+                self._geojson[name] = cached
+        return cached
+
+    def bounds(self, name: str) -> Tuple[float, float, float, float]:
+        if name not in self._index:
+            raise KeyError(f"ROI '{name}' not found in {self.path}")
+        return tuple(self._geoms[self._index[name]].bounds)
+
+    def query_bbox(
+        self, west: float, south: float, east: float, north: float
+    ) -> List[str]:
+        """
+        Names of the ROIs intersecting a lon/lat bounding box.
+        """
+        return self._query(box(west, south, east, north))
+
+    def intersecting(self, geometry: Dict[str, Any]) -> List[str]:
+        """
+        Names of the ROIs intersecting a GeoJSON geometry (e.g. a fire
+        perimeter).
+        """
+        return self._query(shape(geometry))
+
+    def _query(self, geom) -> List[str]:
+        hits = self._sindex.query(geom, predicate="intersects")
+        return sorted(self._names[i] for i in hits)
+
+
+_catalogues: Dict[Tuple[str, int], RoiCatalogue] = {}
+_catalogues_lock = threading.Lock()
+
+
+def open_roi_catalogue(path: str | Path) -> RoiCatalogue:
+    """
+    Process-wide RoiCatalogue of `path`, reloaded when the file changes.
+    """
+    path = Path(path).expanduser().resolve()
+    key = (str(path), path.stat().st_mtime_ns if path.exists() else 0)
+
+    with _catalogues_lock:
+        catalogue = _catalogues.get(key)
+        if catalogue is None:
+            catalogue = RoiCatalogue(path)
+            for stale in [k for k in _catalogues if k[0] == key[0]]:
+                del _catalogues[stale]
+            _catalogues[key] = catalogue
+        return catalogue
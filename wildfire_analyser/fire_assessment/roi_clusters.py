@@ -0,0 +1,66 @@
+# wildfire_analyser/fire_assessment/roi_clusters.py
+#
+# Spatial clustering of ROIs assessed together.
+#
+# Neighbouring ROIs (e.g. conservation units a few km apart) sit on the
+# same Sentinel-2 tiles, so with the same time windows their filtered
+# collections and mosaics are identical over each ROI. ROIs are grouped
+# greedily while the bounding box of the group stays within about one
+# Sentinel-2 tile (110 km), which keeps the shared collection close to
+# the tiles any member would have used on its own.
+
+from typing import Any, Dict, List, Tuple
+
+from pyproj import Geod
+from shapely.geometry import shape
+
+_GEOD = Geod(ellps="WGS84")
+
+DEFAULT_MAX_CLUSTER_KM = 100
+
+Bounds = Tuple[float, float, float, float]  # (west, south, east, north)
+
+
+def bounds_extent_km(bounds: Bounds) -> float:
+    """
+    Largest side (km) of a lon/lat bounding box.
+    """
+    west, south, east, north = bounds
+    _, _, width_south = _GEOD.inv(west, south, east, south)
+    _, _, width_north = _GEOD.inv(west, north, east, north)
+    _, _, height = _GEOD.inv(west, south, west, north)
+    return max(width_south, width_north, height) / 1000
+
+
+def merge_bounds(a: Bounds, b: Bounds) -> Bounds:
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def cluster_rois(
+    geometries: List[Dict[str, Any]],
+    max_extent_km: float = DEFAULT_MAX_CLUSTER_KM,
+) -> List[List[int]]:
+    """
+    Group ROIs (GeoJSON geometries) into clusters whose combined bounding
+    box is at most `max_extent_km` on its largest side.
+
+    Returns lists of indices into `geometries`; the result is
+    deterministic for a given input.
+    """
+    if max_extent_km <= 0:
+        raise ValueError(f"max_extent_km must be > 0 (got {max_extent_km})")
+
+    bounds = [shape(g).bounds for g in geometries]
+    order = sorted(range(len(geometries)), key=lambda i: (bounds[i][0], bounds[i][1]))
+
+    clusters: List[Tuple[List[int], Bounds]] = []
+    for i in order:
+        for n, (members, cluster_bounds) in enumerate(clusters):
+            merged = merge_bounds(cluster_bounds, bounds[i])
+            if bounds_extent_km(merged) <= max_extent_km:
+                clusters[n] = (members + [i], merged)
+                break
+        else:
+            clusters.append(([i], bounds[i]))
+
+    return [sorted(members) for members, _ in clusters]
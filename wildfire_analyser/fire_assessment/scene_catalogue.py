@@ -0,0 +1,300 @@
+# wildfire_analyser/fire_assessment/scene_catalogue.py
+#
+# Local SQLite catalogue of Sentinel-2 scene metadata.
+#
+# Scene ids, MGRS tiles, acquisition dates, CLOUDY_PIXEL_PERCENTAGE and
+# footprints are pulled from Earth Engine in batches and only for the
+# regions and date ranges not synced yet. Scene selection is then done
+# client-side (R*Tree spatial index + tile/date index), so runs can hand
+# an explicit id list to gather_collection and build provenance without
+# re-querying metadata.
+
+import json
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+import ee
+from shapely.geometry import shape
+
+from wildfire_analyser.fire_assessment.ee_client import get_client
+from wildfire_analyser.fire_assessment.sentinel2 import COLLECTION_ID
+
+logger = logging.getLogger(__name__)
+
+# Recent days are never marked as synced: new acquisitions keep being
+# ingested for a few days after sensing.
+SYNC_SETTLE_DAYS = 3
+# Metadata is pulled in chunks of this many days, all in one request.
+SYNC_CHUNK_DAYS = 92
+
+Interval = Tuple[str, str]  # [start, end) as YYYY-MM-DD
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenes (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    mgrs_tile TEXT,
+    date TEXT NOT NULL,
+    time_start INTEGER NOT NULL,
+    cloud REAL,
+    footprint TEXT
+);
+CREATE INDEX IF NOT EXISTS scenes_tile_date ON scenes (mgrs_tile, date);
+CREATE INDEX IF NOT EXISTS scenes_date ON scenes (date);
+CREATE VIRTUAL TABLE IF NOT EXISTS scenes_rtree USING rtree (
+    rowid, min_x, max_x, min_y, max_y
+);
+CREATE TABLE IF NOT EXISTS synced (
+    min_x REAL, min_y REAL, max_x REAL, max_y REAL,
+    start TEXT NOT NULL,
+    end TEXT NOT NULL
+);
+"""
+
+
+def subtract_intervals(target: Interval, covered: List[Interval]) -> List[Interval]:
+    """
+    Parts of the [start, end) `target` interval not covered by `covered`.
+    """
+    start, end = target
+    missing = []
+
+    for c_start, c_end in sorted(covered):
+        if c_end <= start or c_start >= end:
+            continue
+        if c_start > start:
+            missing.append((start, c_start))
+        start = max(start, c_end)
+        if start >= end:
+            break
+
+    if start < end:
+        missing.append((start, end))
+    return missing
+
+
+def _chunks(interval: Interval, days: int) -> List[Interval]:
+    start = datetime.strptime(interval[0], "%Y-%m-%d")
+    end = datetime.strptime(interval[1], "%Y-%m-%d")
+    chunks = []
+    while start < end:
+        stop = min(start + timedelta(days=days), end)
+        chunks.append((start.strftime("%Y-%m-%d"), stop.strftime("%Y-%m-%d")))
+        start = stop
+    return chunks
+
+
+class SceneCatalogue:
+    """
+    SQLite-backed Sentinel-2 scene catalogue keyed by MGRS tile and date.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._sync_lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ─────────────────────────────
+    # Sync
+    # ─────────────────────────────
+
+    def missing_intervals(
+        self,
+        bbox: Tuple[float, float, float, float],
+        start: str,
+        end: str,
+    ) -> List[Interval]:
+        """
+        Date ranges not yet synced for a region containing `bbox`.
+        """
+        min_x, min_y, max_x, max_y = bbox
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT start, end FROM synced
+                WHERE min_x <= ? AND min_y <= ? AND max_x >= ? AND max_y >= ?
+                """,
+                (min_x, min_y, max_x, max_y),
+            ).fetchall()
+
+        return subtract_intervals((start, end), [(r["start"], r["end"]) for r in rows])
+
+    def sync(self, geometry: Dict[str, Any], start: str, end: str) -> int:
+        """
+        Pull metadata of all scenes intersecting the geometry's bbox in
+        [start, end) that are not in the catalogue yet.
+
+        All missing chunks are fetched in a single EE request.
+        Returns the number of scenes inserted or updated.
+        """
+        bbox = shape(geometry).bounds
+
+        with self._sync_lock:
+            missing = self.missing_intervals(bbox, start, end)
+            if not missing:
+                return 0
+
+            chunks = [c for interval in missing for c in _chunks(interval, SYNC_CHUNK_DAYS)]
+            logger.info(
+                "[CATALOGUE] Syncing %d chunk(s) between %s and %s",
+                len(chunks), chunks[0][0], chunks[-1][1],
+            )
+
+            region = ee.Geometry.Rectangle(list(bbox))
+            base = ee.ImageCollection(COLLECTION_ID).filterBounds(region)
+
+            def to_feature(img):
+                return ee.Feature(
+                    img.geometry(),
+                    {
+                        "id": img.get("system:index"),
+                        "tile": img.get("MGRS_TILE"),
+                        "time_start": img.get("system:time_start"),
+                        "cloud": img.get("CLOUDY_PIXEL_PERCENTAGE"),
+                    },
+                )
+
+            request = ee.Dictionary({
+                f"{s}/{e}": ee.FeatureCollection(base.filterDate(s, e).map(to_feature))
+                for s, e in chunks
+            })
+            values = get_client().get_info(request)
+
+            features = [f for fc in values.values() for f in fc["features"]]
+            self._insert(features)
+            self._mark_synced(bbox, missing)
+
+        return len(features)
+
+    def _insert(self, features: List[Dict[str, Any]]) -> None:
+        with self._connect() as conn:
+            for f in features:
+                props = f["properties"]
+                geom = shape(f["geometry"])
+                acquired = datetime.fromtimestamp(props["time_start"] / 1000, timezone.utc)
+
+                cursor = conn.execute(
+                    """
+                    INSERT INTO scenes (id, mgrs_tile, date, time_start, cloud, footprint)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (id) DO UPDATE SET
+                        mgrs_tile = excluded.mgrs_tile,
+                        date = excluded.date,
+                        time_start = excluded.time_start,
+                        cloud = excluded.cloud,
+                        footprint = excluded.footprint
+                    RETURNING rowid
+                    """,
+                    (
+                        props["id"],
+                        props.get("tile"),
+                        acquired.strftime("%Y-%m-%d"),
+                        props["time_start"],
+                        props.get("cloud"),
+                        json.dumps(f["geometry"]),
+                    ),
+                )
+                rowid = cursor.fetchone()[0]
+
+                min_x, min_y, max_x, max_y = geom.bounds
+                conn.execute(
+                    "INSERT OR REPLACE INTO scenes_rtree VALUES (?, ?, ?, ?, ?)",
+                    (rowid, min_x, max_x, min_y, max_y),
+                )
+
+    def _mark_synced(self, bbox, intervals: List[Interval]) -> None:
+        settled = (date.today() - timedelta(days=SYNC_SETTLE_DAYS)).strftime("%Y-%m-%d")
+
+        with self._connect() as conn:
+            for start, end in intervals:
+                end = min(end, settled)
+                if start >= end:
+                    continue
+                conn.execute(
+                    "INSERT INTO synced VALUES (?, ?, ?, ?, ?, ?)",
+                    (*bbox, start, end),
+                )
+
+    # ─────────────────────────────
+    # Queries
+    # ─────────────────────────────
+
+    def select_scenes(
+        self,
+        geometry: Dict[str, Any],
+        start: str,
+        end: str,
+        cloud_threshold: float,
+        max_scenes_per_tile: int | None = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Scenes intersecting `geometry` acquired in [start, end) with cloud
+        cover under the threshold, optionally limited to the k least cloudy
+        per MGRS tile. Syncs missing metadata first.
+
+        Ordered by CLOUDY_PIXEL_PERCENTAGE descending, like gather_collection,
+        so the least cloudy scene lands on top in mosaic().
+        """
+        self.sync(geometry, start, end)
+
+        roi = shape(geometry)
+        min_x, min_y, max_x, max_y = roi.bounds
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT s.id, s.mgrs_tile, s.date, s.cloud, s.footprint
+                FROM scenes s
+                JOIN scenes_rtree r ON r.rowid = s.rowid
+                WHERE r.max_x >= ? AND r.min_x <= ?
+                  AND r.max_y >= ? AND r.min_y <= ?
+                  AND s.date >= ? AND s.date < ?
+                  AND s.cloud <= ?
+                ORDER BY s.cloud ASC, s.time_start ASC
+                """,
+                (min_x, max_x, min_y, max_y, start, end, cloud_threshold),
+            ).fetchall()
+
+        selected = []
+        per_tile: Dict[str, int] = {}
+        for row in rows:
+            if not shape(json.loads(row["footprint"])).intersects(roi):
+                continue
+            if max_scenes_per_tile:
+                count = per_tile.get(row["mgrs_tile"], 0)
+                if count >= max_scenes_per_tile:
+                    continue
+                per_tile[row["mgrs_tile"]] = count + 1
+
+            selected.append({
+                "id": row["id"],
+                "tile": row["mgrs_tile"],
+                "date": row["date"],
+                "cloud_percent": row["cloud"],
+            })
+
+        selected.reverse()
+        return selected
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM scenes").fetchone()[0]
+
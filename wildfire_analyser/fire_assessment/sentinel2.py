@@ -19,6 +19,8 @@
 # local visual or spectral purity and is appropriate for large-scale, automated
 # post-fire assessments.
 
+from typing import List
+
 import ee
 
 COLLECTION_ID = "COPERNICUS/S2_SR_HARMONIZED"
@@ -42,6 +44,7 @@ def _add_reflectance_bands(image: ee.Image) -> ee.Image:
 def gather_collection(
     roi: ee.Geometry,
     cloud_threshold: int,
+    scene_ids: List[str] | None = None,
 ) -> ee.ImageCollection:
     """
     Load Sentinel-2 SR collection with:
@@ -49,12 +52,129 @@ def gather_collection(
     - Cloud filter
     - Cloud masking
     - Reflectance bands
+
+    With `scene_ids` (system:index values, e.g. picked from a local scene
+    catalogue) the collection is built from exactly those scenes and the
+    ROI/cloud filters are skipped.
     """
+    if scene_ids is not None:
+        collection = ee.ImageCollection(
+            [ee.Image(f"{COLLECTION_ID}/{scene_id}") for scene_id in scene_ids]
+        )
+    else:
+        collection = (
+            ee.ImageCollection(COLLECTION_ID)
+            .filterBounds(roi)
+            .filter(ee.Filter.lte("CLOUDY_PIXEL_PERCENTAGE", cloud_threshold))
+        )
+
     return (
-        ee.ImageCollection(COLLECTION_ID)
-        .filterBounds(roi)
-        .filter(ee.Filter.lte("CLOUDY_PIXEL_PERCENTAGE", cloud_threshold))
+        collection
         #.map(_mask_s2_clouds)
         .map(_add_reflectance_bands)
         .sort("CLOUDY_PIXEL_PERCENTAGE", False)
     )
+
+
+COVERAGE_MAX_ERROR = 10  # meters
+
+
+def select_least_cloudy(
+    collection: ee.ImageCollection,
+    max_scenes_per_tile: int,
+) -> ee.ImageCollection:
+    """
+    Keep only the `max_scenes_per_tile` least cloudy scenes of each
+    MGRS tile, re-sorted so the least cloudy scene lands on top in mosaic().
+
+    The scenes are filtered out of `collection` by system:index rather than
+    flattened from the per-tile collections, since flatten() prefixes
+    system:index and fill_roi_coverage() matches on it.
+    """
+    tiles = collection.aggregate_array("MGRS_TILE").distinct()
+
+    ids = tiles.map(
+        lambda tile: collection
+        .filter(ee.Filter.eq("MGRS_TILE", tile))
+        .sort("CLOUDY_PIXEL_PERCENTAGE")
+        .limit(max_scenes_per_tile)
+        .aggregate_array("system:index")
+    ).flatten()
+
+    return (
+        collection
+        .filter(ee.Filter.inList("system:index", ids))
+        .sort("CLOUDY_PIXEL_PERCENTAGE", False)
+    )
+
+
+def fill_roi_coverage(
+    selected: ee.ImageCollection,
+    candidates: ee.ImageCollection,
+    roi: ee.Geometry,
+) -> ee.ImageCollection:
+    """
+    Add scenes from `candidates` (least cloudy first) to `selected`, only
+    while the ROI is not yet fully covered by the selected footprints and
+    only if the scene covers part of the remaining gap.
+    """
+    margin = ee.ErrorMargin(COVERAGE_MAX_ERROR)
+    selected_ids = selected.aggregate_array("system:index")
+
+    remaining = (
+        candidates
+        .filter(ee.Filter.inList("system:index", selected_ids).Not())
+        .sort("CLOUDY_PIXEL_PERCENTAGE")
+    )
+
+    def add_if_needed(image, state):
+        image = ee.Image(image)
+        state = ee.Dictionary(state)
+        covered = ee.Geometry(state.get("covered"))
+        gap = roi.difference(covered, margin)
+
+        needed = gap.area(margin).gt(0).And(
+            image.geometry().intersects(gap, margin)
+        )
+
+        return ee.Algorithms.If(
+            needed,
+            ee.Dictionary({
+                "covered": covered.union(image.geometry(), margin),
+                "ids": ee.List(state.get("ids")).add(image.get("system:index")),
+            }),
+            state,
+        )
+
+    initial = ee.Dictionary({
+        "covered": selected.geometry().dissolve(margin),
+        "ids": selected_ids,
+    })
+    ids = ee.Dictionary(remaining.iterate(add_if_needed, initial)).get("ids")
+
+    return (
+        candidates
+        .filter(ee.Filter.inList("system:index", ids))
+        .sort("CLOUDY_PIXEL_PERCENTAGE", False)
+    )
+
+
+def select_scenes(
+    collection: ee.ImageCollection,
+    roi: ee.Geometry,
+    max_scenes_per_tile: int | None,
+    complete_coverage: bool = False,
+) -> ee.ImageCollection:
+    """
+    Bound the number of scenes composited for one time window.
+
+    Without `max_scenes_per_tile` the collection is returned unchanged.
+    """
+    if not max_scenes_per_tile:
+        return collection
+
+    selected = select_least_cloudy(collection, max_scenes_per_tile)
+    if complete_coverage:
+        selected = fill_roi_coverage(selected, collection, roi)
+
+    return selected
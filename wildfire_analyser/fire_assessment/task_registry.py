@@ -0,0 +1,258 @@
+# wildfire_analyser/fire_assessment/task_registry.py
+#
+# Durable SQLite registry of GEE export tasks and the notifications owed
+# to their requesters.
+#
+# PostFireAssessment records every export it starts (or reuses) together
+# with who asked for it. A single long-running monitor polls all unfinished
+# tasks in bulk, and when a task reaches a terminal state the registry
+# queues one notification per channel (email, webhook). Notifications are
+# retried with exponential backoff. Everything lives in the database, so
+# a restarted monitor resumes exactly where it stopped.
+
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+TERMINAL_STATES = ("COMPLETED", "FAILED", "CANCELLED")
+
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_RETRY_DELAY = 30.0      # seconds, doubled on every attempt
+MAX_RETRY_DELAY = 3600.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS exports (
+    id INTEGER PRIMARY KEY,
+    task_id TEXT NOT NULL,
+    deliverable TEXT NOT NULL,
+    url TEXT,
+    requester TEXT NOT NULL DEFAULT '',
+    webhook TEXT NOT NULL DEFAULT '',
+    state TEXT NOT NULL DEFAULT 'SUBMITTED',
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    UNIQUE (task_id, requester, webhook)
+);
+CREATE INDEX IF NOT EXISTS exports_state ON exports (state);
+
+CREATE TABLE IF NOT EXISTS notifications (
+    id INTEGER PRIMARY KEY,
+    export_id INTEGER NOT NULL REFERENCES exports (id),
+    channel TEXT NOT NULL,
+    target TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    UNIQUE (export_id, channel)
+);
+CREATE INDEX IF NOT EXISTS notifications_due ON notifications (status, next_attempt_at);
+"""
+
+
+class TaskRegistry:
+    """
+    Export-task registry and notification outbox.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ─────────────────────────────
+    # Exports
+    # ─────────────────────────────
+
+    def record_export(
+        self,
+        task_id: str,
+        deliverable: str,
+        url: str | None = None,
+        requester: str | None = None,
+        webhook: str | None = None,
+    ) -> None:
+        """
+        Register an export for monitoring. Recording the same task for the
+        same requester and webhook twice is a no-op.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO exports
+                    (task_id, deliverable, url, requester, webhook, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (task_id, deliverable, url, requester or "", webhook or "", now, now),
+            )
+
+    def active_task_ids(self) -> List[str]:
+        placeholders = ", ".join("?" for _ in TERMINAL_STATES)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT DISTINCT task_id FROM exports WHERE state NOT IN ({placeholders})",
+                TERMINAL_STATES,
+            ).fetchall()
+        return [row["task_id"] for row in rows]
+
+    def update_state(self, task_id: str, state: str, error: str | None = None) -> int:
+        """
+        Store the latest task state. On the transition to a terminal state,
+        queue the notifications of every requester of the task.
+
+        Returns the number of notifications queued.
+        """
+        now = time.time()
+        queued = 0
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM exports WHERE task_id = ? AND state != ?",
+                (task_id, state),
+            ).fetchall()
+
+            for row in rows:
+                if row["state"] in TERMINAL_STATES:
+                    continue
+
+                conn.execute(
+                    "UPDATE exports SET state = ?, error = ?, updated_at = ? WHERE id = ?",
+                    (state, error, now, row["id"]),
+                )
+
+                if state not in TERMINAL_STATES:
+                    continue
+
+                targets = []
+                if row["requester"]:
+                    targets.append(("email", row["requester"]))
+                if row["webhook"]:
+                    targets.append(("webhook", row["webhook"]))
+
+                for channel, target in targets:
+                    cursor = conn.execute(
+                        """
+                        INSERT OR IGNORE INTO notifications
+                            (export_id, channel, target, next_attempt_at)
+                        VALUES (?, ?, ?, ?)
+                        """,
+                        (row["id"], channel, target, now),
+                    )
+                    queued += cursor.rowcount
+
+        return queued
+
+    def exports(self, state: str | None = None) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            if state is None:
+                rows = conn.execute("SELECT * FROM exports ORDER BY id").fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT * FROM exports WHERE state = ? ORDER BY id", (state,)
+                ).fetchall()
+        return [dict(row) for row in rows]
+
+    # ─────────────────────────────
+    # Notification outbox
+    # ─────────────────────────────
+
+    def recover(self) -> int:
+        """
+        Return notifications left 'sending' by a crashed monitor to the
+        outbox. Call once at startup.
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE notifications SET status = 'pending' WHERE status = 'sending'"
+            )
+        return cursor.rowcount
+
+    def claim_due_notifications(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Mark up to `limit` due notifications as 'sending' and return them
+        joined with their export.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT n.id, n.channel, n.target, n.attempts,
+                       e.task_id, e.deliverable, e.url, e.state, e.error
+                FROM notifications n JOIN exports e ON e.id = n.export_id
+                WHERE n.status = 'pending' AND n.next_attempt_at <= ?
+                ORDER BY n.next_attempt_at
+                LIMIT ?
+                """,
+                (now, limit),
+            ).fetchall()
+
+            conn.executemany(
+                "UPDATE notifications SET status = 'sending' WHERE id = ?",
+                [(row["id"],) for row in rows],
+            )
+
+        return [dict(row) for row in rows]
+
+    def mark_sent(self, notification_id: int) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                """
+                UPDATE notifications
+                SET status = 'sent', attempts = attempts + 1, last_error = NULL
+                WHERE id = ?
+                """,
+                (notification_id,),
+            )
+
+    def mark_failed_attempt(self, notification_id: int, error: str) -> str:
+        """
+        Record a failed delivery; schedule a retry with exponential backoff
+        or give up after `max_attempts`. Returns the new status.
+        """
+        with self._connect() as conn:
+            attempts = conn.execute(
+                "SELECT attempts FROM notifications WHERE id = ?", (notification_id,)
+            ).fetchone()["attempts"] + 1
+
+            status = "failed" if attempts >= self.max_attempts else "pending"
+            delay = min(MAX_RETRY_DELAY, self.retry_delay * 2 ** (attempts - 1))
+
+            conn.execute(
+                """
+                UPDATE notifications
+                SET status = ?, attempts = ?, last_error = ?, next_attempt_at = ?
+                WHERE id = ?
+                """,
+                (status, attempts, error, time.time() + delay, notification_id),
+            )
+        return status
+
+    def notification_counts(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) AS n FROM notifications GROUP BY status"
+            ).fetchall()
+        return {row["status"]: row["n"] for row in rows}
@@ -1,5 +1,6 @@
 # date_utils.py
 import logging
+import calendar
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
@@ -22,3 +23,53 @@ def compute_fire_time_windows(
     return before_start, before_end, after_start, after_end
 
 
+def parse_window(value: str) -> tuple[str, str]:
+    """
+    Parse an inclusive 'YYYY-MM-DD:YYYY-MM-DD' window.
+    """
+    try:
+        start, end = value.split(":")
+        sd = datetime.strptime(start, "%Y-%m-%d")
+        ed = datetime.strptime(end, "%Y-%m-%d")
+    except ValueError as e:
+        raise ValueError(
+            f"Window must be in YYYY-MM-DD:YYYY-MM-DD format (got '{value}')"
+        ) from e
+
+    if sd > ed:
+        raise ValueError(f"Window start must be <= end (got '{value}')")
+
+    return start, end
+
+
+def recovery_windows(
+    end_date: str,
+    months: list[int],
+    window_days: int,
+) -> list[tuple[str, str]]:
+    """
+    Inclusive post-fire windows of `window_days` days starting
+    `months` calendar months after the fire end date.
+    """
+    ed = datetime.strptime(end_date, "%Y-%m-%d")
+    windows = []
+
+    for m in months:
+        year = ed.year + (ed.month - 1 + m) // 12
+        month = (ed.month - 1 + m) % 12 + 1
+        day = min(ed.day, calendar.monthrange(year, month)[1])
+
+        start = ed.replace(year=year, month=month, day=day)
+        end = start + timedelta(days=window_days)
+        windows.append((start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")))
+
+    return windows
+
+
+def window_filter_range(start: str, end: str) -> tuple[str, str]:
+    """
+    Convert an inclusive window into the [start, end) range used by
+    ee.ImageCollection.filterDate.
+    """
+    ed = datetime.strptime(end, "%Y-%m-%d")
+    return start, (ed + timedelta(days=1)).strftime("%Y-%m-%d")
@@ -0,0 +1,31 @@
+import ee
+
+from wildfire_analyser.fire_assessment.visualization.styles import (
+    OUTLINE_COLOR,
+    OUTLINE_WIDTH,
+)
+
+
+def classify(image: ee.Image, classes) -> ee.Image:
+    """
+    Discrete severity classes from (lower, upper, class) ranges.
+    """
+    classified = ee.Image(0)  # Unburned
+    for lower, upper, value in classes:
+        condition = image.gte(lower)
+        if upper is not None:
+            condition = condition.And(image.lt(upper))
+        classified = classified.where(condition, value)
+    return classified
+
+
+def outline(roi: ee.Geometry) -> ee.Image:
+    """
+    ROI outline, ready to be blended over a visualized image.
+    """
+    painted = ee.Image().byte().paint(
+        featureCollection=ee.FeatureCollection(roi),
+        color=1,
+        width=OUTLINE_WIDTH,
+    )
+    return painted.visualize(palette=[OUTLINE_COLOR])
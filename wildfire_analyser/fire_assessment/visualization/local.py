@@ -0,0 +1,204 @@
+# wildfire_analyser/fire_assessment/visualization/local.py
+#
+# Local (NumPy) counterparts of the Earth Engine visual renderers.
+#
+# When an index raster is already on disk, the visual product is rendered
+# without any extra EE request: severity classes are computed with
+# vectorised comparisons, mapped to colours through a palette lookup
+# table, and the ROI outline is rasterised on top.
+
+import warnings
+from pathlib import Path
+from typing import Any, Dict
+
+import numpy as np
+import rasterio
+from rasterio.errors import NotGeoreferencedWarning
+from rasterio.features import rasterize
+from rasterio.transform import Affine
+from rasterio.warp import transform_geom
+
+from wildfire_analyser.fire_assessment.deliverables import Deliverable
+from wildfire_analyser.fire_assessment.visualization.styles import (
+    DNBR_CLASSES,
+    DNDVI_CLASSES,
+    OUTLINE_COLOR,
+    OUTLINE_WIDTH,
+    RBR_CLASSES,
+    RGB_STRETCH,
+    SEVERITY_PALETTE,
+)
+
+ROI_CRS = "EPSG:4326"
+
+
+def palette_lut(palette) -> np.ndarray:
+    """
+    Convert a list of hex colours into an (n, 3) uint8 lookup table.
+    """
+    return np.array(
+        [[int(c[i:i + 2], 16) for i in (0, 2, 4)] for c in palette],
+        dtype=np.uint8,
+    )
+
+
+SEVERITY_LUT = palette_lut(SEVERITY_PALETTE)
+OUTLINE_RGB = palette_lut([OUTLINE_COLOR])[0]
+
+
+def classify_array(values: np.ndarray, classes) -> np.ndarray:
+    """
+    NumPy equivalent of the chained ee.Image.where classification.
+
+    NaN and nodata pixels never match a range, so they stay Unburned,
+    as in the server-side renderers.
+    """
+    classified = np.zeros(values.shape, dtype=np.uint8)
+    with np.errstate(invalid="ignore"):
+        for lower, upper, value in classes:
+            condition = values >= lower
+            if upper is not None:
+                condition &= values < upper
+            classified[condition] = value
+    return classified
+
+
+def stretch_rgb(bands: np.ndarray, vmin: float, vmax: float, gamma: float) -> np.ndarray:
+    """
+    Linear stretch plus gamma of a (3, rows, cols) reflectance array,
+    matching ee.Image.visualize(min, max, gamma).
+    """
+    scaled = np.clip((bands - vmin) / (vmax - vmin), 0.0, 1.0)
+    scaled = np.nan_to_num(scaled, nan=0.0) ** (1.0 / gamma)
+    return np.moveaxis((scaled * 255.0 + 0.5).astype(np.uint8), 0, -1)
+
+
+def rasterize_outline(
+    geometry: Dict[str, Any],
+    transform: Affine,
+    shape,
+    width: int = OUTLINE_WIDTH,
+) -> np.ndarray:
+    """
+    Boolean mask of the polygon boundary, `width` pixels wide.
+
+    `geometry` must already be in the raster CRS.
+    """
+    if geometry["type"] == "Polygon":
+        rings = geometry["coordinates"]
+    elif geometry["type"] == "MultiPolygon":
+        rings = [ring for polygon in geometry["coordinates"] for ring in polygon]
+    else:
+        raise ValueError(f"Unsupported ROI geometry type: {geometry['type']}")
+
+    lines = {"type": "MultiLineString", "coordinates": rings}
+    mask = rasterize(
+        [(lines, 1)],
+        out_shape=shape,
+        transform=transform,
+        all_touched=True,
+        dtype=np.uint8,
+    ).astype(bool)
+
+    # Thicken the 1 px line by dilating towards the bottom-right.
+    thick = mask.copy()
+    for offset in range(1, width):
+        thick[offset:, :] |= mask[:-offset, :]
+        thick[:, offset:] |= mask[:, :-offset]
+        thick[offset:, offset:] |= mask[:-offset, :-offset]
+    return thick
+
+
+def _severity_renderer(classes):
+    def render(bands: np.ndarray) -> np.ndarray:
+        return SEVERITY_LUT[classify_array(bands[0], classes)]
+    return render
+
+
+def _rgb_renderer(bands: np.ndarray) -> np.ndarray:
+    return stretch_rgb(
+        bands[:3],
+        RGB_STRETCH["min"],
+        RGB_STRETCH["max"],
+        RGB_STRETCH["gamma"],
+    )
+
+
+LOCAL_RENDERERS = {
+    Deliverable.RGB_PRE_FIRE_VISUAL: _rgb_renderer,
+    Deliverable.RGB_POST_FIRE_VISUAL: _rgb_renderer,
+    Deliverable.DNDVI_VISUAL: _severity_renderer(DNDVI_CLASSES),
+    Deliverable.DNBR_VISUAL: _severity_renderer(DNBR_CLASSES),
+    Deliverable.RBR_VISUAL: _severity_renderer(RBR_CLASSES),
+}
+
+
+def render_array(
+    deliverable: Deliverable,
+    bands: np.ndarray,
+    transform: Affine,
+    roi_geometry: Dict[str, Any] | None = None,
+) -> np.ndarray:
+    """
+    Render a (bands, rows, cols) array into an (rows, cols, 3) uint8 image.
+
+    `roi_geometry` must be in the same CRS as `transform`.
+    """
+    renderer = LOCAL_RENDERERS.get(deliverable)
+    if renderer is None:
+        raise KeyError(f"No local renderer for deliverable {deliverable}")
+
+    rgb = renderer(bands)
+
+    if roi_geometry is not None:
+        outline = rasterize_outline(roi_geometry, transform, rgb.shape[:2])
+        rgb[outline] = OUTLINE_RGB
+
+    return rgb
+
+
+def write_image(rgb: np.ndarray, path: str | Path) -> Path:
+    """
+    Write an (rows, cols, 3) uint8 image as PNG or JPEG (by file suffix).
+    """
+    path = Path(path)
+    driver = "JPEG" if path.suffix.lower() in (".jpg", ".jpeg") else "PNG"
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", NotGeoreferencedWarning)
+        with rasterio.open(
+            path,
+            "w",
+            driver=driver,
+            width=rgb.shape[1],
+            height=rgb.shape[0],
+            count=3,
+            dtype="uint8",
+        ) as dst:
+            dst.write(np.moveaxis(rgb, -1, 0))
+
+    return path
+
+
+def render_geotiff(
+    deliverable: Deliverable,
+    raster_path: str | Path,
+    output_path: str | Path,
+    roi_geometry: Dict[str, Any] | None = None,
+) -> Path:
+    """
+    Render a visual product straight from a local index GeoTIFF.
+
+    `roi_geometry` is GeoJSON in EPSG:4326, as loaded from the ROI file.
+    """
+    with rasterio.open(raster_path) as src:
+        bands = src.read(masked=True).filled(np.nan).astype("float32")
+        transform = src.transform
+        crs = src.crs
+
+    if roi_geometry is not None:
+        roi_geometry = transform_geom(ROI_CRS, crs, roi_geometry)
+
+    rgb = render_array(deliverable, bands, transform, roi_geometry)
+    return write_image(rgb, output_path)
@@ -1,29 +1,17 @@
 import ee
 
-
-def _outline(roi):
-    return ee.Image().byte().paint(
-        featureCollection=ee.FeatureCollection(roi),
-        color=1,
-        width=2,
-    )
+from wildfire_analyser.fire_assessment.visualization.common import outline
+from wildfire_analyser.fire_assessment.visualization.styles import (
+    RGB_BANDS,
+    RGB_STRETCH,
+)
 
 
 def rgb_pre_fire_visual(image: ee.Image, roi: ee.Geometry) -> ee.Image:
-    vis = image.visualize(
-        bands=["red", "green", "blue"],
-        min=0.02,
-        max=0.30,
-        gamma=1.2,
-    )
-    return vis.blend(_outline(roi).visualize(palette=["000000"]))
+    vis = image.visualize(bands=RGB_BANDS, **RGB_STRETCH)
+    return vis.blend(outline(roi))
 
 
 def rgb_post_fire_visual(image: ee.Image, roi: ee.Geometry) -> ee.Image:
-    vis = image.visualize(
-        bands=["red", "green", "blue"],
-        min=0.02,
-        max=0.30,
-        gamma=1.2,
-    )
-    return vis.blend(_outline(roi).visualize(palette=["000000"]))
+    vis = image.visualize(bands=RGB_BANDS, **RGB_STRETCH)
+    return vis.blend(outline(roi))
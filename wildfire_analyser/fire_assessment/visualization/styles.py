@@ -0,0 +1,45 @@
+# wildfire_analyser/fire_assessment/visualization/styles.py
+#
+# Shared styling for the visual products, used both by the server-side
+# (Earth Engine) renderers and by the local NumPy renderers, so the two
+# always produce the same classes and colours.
+
+SEVERITY_PALETTE = [
+    "36a402",  # Unburned
+    "fbfb01",  # Low
+    "feb012",  # Moderate
+    "f50003",  # High
+    "6a044d",  # Very High
+]
+
+OUTLINE_COLOR = "000000"
+OUTLINE_WIDTH = 2
+
+# Severity classes as (lower, upper, class), applied in order like a chain
+# of ee.Image.where calls. Pixels matching no range stay Unburned (0).
+# An upper bound of None means "no upper bound".
+
+# Classificação discreta (paper-style)
+DNBR_CLASSES = [
+    (0.10, 0.27, 1),  # Low
+    (0.27, 0.44, 2),  # Moderate
+    (0.44, 0.66, 3),  # High
+    (0.66, None, 4),  # Very High
+]
+
+RBR_CLASSES = DNBR_CLASSES
+
+# Tabela 5 — dNDVI (paper)
+DNDVI_CLASSES = [
+    (0.10, 0.20, 1),  # Low
+    (0.20, 0.33, 2),  # Moderate
+    (0.33, 0.44, 3),  # High
+    (0.45, None, 4),  # Very High
+]
+
+RGB_BANDS = ["red", "green", "blue"]
+RGB_STRETCH = {
+    "min": 0.02,
+    "max": 0.30,
+    "gamma": 1.2,
+}
@@ -0,0 +1,206 @@
+# wildfire_analyser/fire_assessment/work_queue.py
+#
+# SQLite work queue for spreading a batch manifest over several workers
+# (processes or machines) that share a directory.
+#
+# Every worker enqueues the full manifest (idempotent: jobs are keyed by
+# their fingerprint) and then claims jobs one at a time. A claim is a lease:
+# the worker extends it with heartbeats while the job runs, and a job whose
+# lease expired (crashed or killed worker) is handed to the next claimer.
+#
+# Claims run inside BEGIN IMMEDIATE transactions, so two workers never get
+# the same job. The database uses the rollback journal rather than WAL,
+# which needs shared memory and does not work on network filesystems.
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_SECONDS = 900
+DEFAULT_MAX_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, lease_expires);
+"""
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class WorkQueue:
+    """
+    Lease-based job queue stored in a SQLite file.
+
+    Job states: pending -> leased -> done, or back to pending on failure
+    (until `max_attempts`, then failed).
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def enqueue(self, jobs: List[Tuple[str, str, Dict[str, Any]]]) -> int:
+        """
+        Add (job, name, payload) tuples. Jobs already in the queue are left
+        untouched. Returns the number of new jobs.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            before = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO jobs (job, name, payload, updated_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                [(job, name, json.dumps(payload), now) for job, name, payload in jobs],
+            )
+            after = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        return after - before
+
+    def claim(self, worker: str) -> Tuple[str, Dict[str, Any]] | None:
+        """
+        Lease the next pending (or lease-expired) job, or return None when
+        nothing is claimable.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            # Jobs that keep killing their workers are not retried forever
+            conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'failed', error = 'lease expired', updated_at = ?
+                WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?
+                """,
+                (now, now, self.max_attempts),
+            )
+
+            row = conn.execute(
+                """
+                SELECT job, payload, status, worker FROM jobs
+                WHERE status = 'pending'
+                   OR (status = 'leased' AND lease_expires < ?)
+                ORDER BY rowid
+                LIMIT 1
+                """,
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            if row["status"] == "leased":
+                logger.warning(
+                    "[QUEUE] Lease of %s held by %s expired, reclaiming",
+                    row["job"][:16],
+                    row["worker"],
+                )
+
+            conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'leased', worker = ?, lease_expires = ?,
+                    attempts = attempts + 1, updated_at = ?
+                WHERE job = ?
+                """,
+                (worker, now + self.lease_seconds, now, row["job"]),
+            )
+
+        return row["job"], json.loads(row["payload"])
+
+    def heartbeat(self, job: str, worker: str) -> bool:
+        """
+        Extend the lease. Returns False if the worker no longer holds it.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE jobs SET lease_expires = ?, updated_at = ?
+                WHERE job = ? AND worker = ? AND status = 'leased'
+                """,
+                (now + self.lease_seconds, now, job, worker),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job: str, worker: str) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                """
+                UPDATE jobs SET status = 'done', lease_expires = NULL,
+                    error = NULL, updated_at = ?
+                WHERE job = ? AND worker = ?
+                """,
+                (time.time(), job, worker),
+            )
+
+    def fail(self, job: str, worker: str, error: str) -> None:
+        """
+        Release a failed job for another attempt, or mark it failed once
+        `max_attempts` is reached.
+        """
+        with self._transaction() as conn:
+            conn.execute(
+                """
+                UPDATE jobs
+                SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                    lease_expires = NULL, error = ?, updated_at = ?
+                WHERE job = ? AND worker = ?
+                """,
+                (self.max_attempts, error, time.time(), job, worker),
+            )
+
+    def counts(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"
+            ).fetchall()
+        return {row["status"]: row["n"] for row in rows}
@@ -0,0 +1,364 @@
+# python3 -m wildfire_analyser.fire_season_watcher \
+#   --manifest fires.json \
+#   --state fire_season_state.json \
+#   --deliverables DNBR_AREA_STATISTICS RBR_AREA_STATISTICS
+#
+# Incremental fire-season watcher.
+#
+# Keeps per-ROI state (the latest scene seen per MGRS tile in the post-fire
+# window). Each cycle checks all ROIs for new Sentinel-2 acquisitions in a
+# single bulk request and runs PostFireAssessment only for the ROIs whose
+# post-fire window gained scenes, so daily compute follows the amount of
+# new data rather than the number of ROIs.
+
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+import ee
+from dotenv import load_dotenv
+
+from wildfire_analyser.fire_assessment.auth import authenticate_gee
+from wildfire_analyser.fire_assessment.deliverables import Deliverable
+from wildfire_analyser.fire_assessment.ee_client import get_client
+from wildfire_analyser.fire_assessment.fingerprint import fingerprint
+from wildfire_analyser.fire_assessment.manifest import load_manifest
+from wildfire_analyser.fire_assessment.post_fire_assessment import PostFireAssessment
+from wildfire_analyser.fire_assessment.roi_catalogue import open_roi_catalogue
+from wildfire_analyser.fire_assessment.sentinel2 import COLLECTION_ID
+from wildfire_analyser.fire_assessment.time_windows import compute_fire_time_windows
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_HOURS = 24
+DEFAULT_WORKERS = 4
+DEFAULT_DAYS_BEFORE_AFTER = 30
+DEFAULT_CLOUD_THRESHOLD = 70
+
+
+class WatcherState:
+    """
+    Per-ROI watcher state persisted as JSON:
+
+        {"rois": {name: {"key": ..., "tiles": {tile: time_start_ms},
+                         "last_run": iso, "scenes": [...]}}}
+
+    `key` fingerprints the manifest entry; when the entry changes
+    (dates, thresholds), its state is reset.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                self.data = json.load(f)
+        else:
+            self.data = {"rois": {}}
+
+    def tiles(self, name: str, key: str) -> Dict[str, int]:
+        roi = self.data["rois"].get(name)
+        if roi is None or roi.get("key") != key:
+            return {}
+        return roi["tiles"]
+
+    def mark_processed(self, name: str, key: str, scenes: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            tiles = dict(self.tiles(name, key))
+            for scene in scenes:
+                tiles[scene["tile"]] = max(tiles.get(scene["tile"], 0), scene["time_start"])
+
+            self.data["rois"][name] = {
+                "key": key,
+                "tiles": tiles,
+                "last_run": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "scenes": sorted(scene["id"] for scene in scenes),
+            }
+            self._save()
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+        tmp.replace(self.path)
+
+
+def entry_settings(entry: Dict[str, Any], defaults: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "days_before_after": entry.get("days_before_after", defaults["days_before_after"]),
+        "cloud_threshold": entry.get("cloud_threshold", defaults["cloud_threshold"]),
+    }
+
+
+def entry_key(entry: Dict[str, Any], settings: Dict[str, Any]) -> str:
+    return fingerprint({
+        "roi": entry["roi"],
+        "start_date": entry["start_date"],
+        "end_date": entry["end_date"],
+        **settings,
+    })
+
+
+def fetch_post_fire_scenes(
+    entries: List[Dict[str, Any]],
+    geometries: Dict[str, Dict[str, Any]],
+    defaults: Dict[str, Any],
+    today: date | None = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Scenes (id, tile, time_start) currently in each ROI's post-fire window,
+    for all ROIs in a single request.
+
+    ROIs whose post-fire window has not started yet are left out.
+    """
+    today = (today or date.today()).strftime("%Y-%m-%d")
+    base = ee.ImageCollection(COLLECTION_ID)
+    request = {}
+
+    for entry in entries:
+        settings = entry_settings(entry, defaults)
+        _, _, after_start, after_end = compute_fire_time_windows(
+            entry["start_date"], entry["end_date"], settings["days_before_after"]
+        )
+        if after_start > today:
+            continue
+
+        collection = (
+            base
+            .filterBounds(ee.Geometry(geometries[entry["name"]]))
+            .filterDate(after_start, after_end)
+            .filter(ee.Filter.lte("CLOUDY_PIXEL_PERCENTAGE", settings["cloud_threshold"]))
+        )
+        request[entry["name"]] = ee.Dictionary({
+            "ids": collection.aggregate_array("system:index"),
+            "tiles": collection.aggregate_array("MGRS_TILE"),
+            "times": collection.aggregate_array("system:time_start"),
+        })
+
+    if not request:
+        return {}
+
+    values = get_client().get_info(ee.Dictionary(request))
+
+    return {
+        name: [
+            {"id": scene_id, "tile": tile, "time_start": time_start}
+            for scene_id, tile, time_start in zip(v["ids"], v["tiles"], v["times"])
+        ]
+        for name, v in values.items()
+    }
+
+
+def new_scenes(
+    scenes: List[Dict[str, Any]],
+    seen_tiles: Dict[str, int],
+) -> List[Dict[str, Any]]:
+    """
+    Scenes acquired after the last scene seen on the same MGRS tile.
+    """
+    return [s for s in scenes if s["time_start"] > seen_tiles.get(s["tile"], -1)]
+
+
+def run_cycle(
+    entries: List[Dict[str, Any]],
+    geometries: Dict[str, Dict[str, Any]],
+    state: WatcherState,
+    defaults: Dict[str, Any],
+    run_kwargs: Dict[str, Any],
+    workers: int = DEFAULT_WORKERS,
+) -> Dict[str, Any]:
+    """
+    One watcher cycle: bulk-check new scenes and reprocess only the
+    ROIs that gained data. State is updated per ROI after a successful run,
+    so failed ROIs are retried on the next cycle.
+    """
+    scenes_by_roi = fetch_post_fire_scenes(entries, geometries, defaults)
+
+    scheduled = []
+    for entry in entries:
+        scenes = scenes_by_roi.get(entry["name"])
+        if not scenes:
+            continue
+
+        settings = entry_settings(entry, defaults)
+        key = entry_key(entry, settings)
+        fresh = new_scenes(scenes, state.tiles(entry["name"], key))
+        if fresh:
+            scheduled.append((entry, settings, key, scenes, fresh))
+
+    logger.info(
+        "[WATCHER] %d of %d ROIs gained scenes", len(scheduled), len(entries)
+    )
+
+    def process(runner, name, key, scenes):
+        result = runner.run()
+        state.mark_processed(name, key, scenes)
+        return result
+
+    results = {}
+    failed = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for entry, settings, key, scenes, fresh in scheduled:
+            # Constructed here: authentication is not safe to run concurrently.
+            runner = PostFireAssessment(
+                geojson_path=entry["roi"],
+                roi_geometry=geometries[entry["name"]],
+                start_date=entry["start_date"],
+                end_date=entry["end_date"],
+                **settings,
+                **run_kwargs,
+            )
+            future = pool.submit(process, runner, entry["name"], key, scenes)
+            futures[future] = (entry["name"], fresh)
+
+        for future in as_completed(futures):
+            name, fresh = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                logger.exception("[WATCHER] %s failed", name)
+                failed[name] = str(e)
+                continue
+
+            logger.info(
+                "[WATCHER] %s processed (%d new scene(s): %s)",
+                name,
+                len(fresh),
+                ", ".join(s["id"] for s in fresh),
+            )
+
+    return {
+        "checked": len(entries),
+        "scheduled": [entry["name"] for entry, *_ in scheduled],
+        "results": results,
+        "failed": failed,
+    }
+
+
+def main():
+    logging.basicConfig(format="%(levelname)s:%(name)s:%(message)s")
+    logger.setLevel(logging.INFO)
+
+    parser = argparse.ArgumentParser(
+        description=(
+            "Watch fire-season ROIs and rerun the assessment only for ROIs "
+            "whose post-fire window gained new Sentinel-2 scenes"
+        )
+    )
+
+    parser.add_argument("--manifest", required=True, help="Batch manifest (JSON)")
+    parser.add_argument(
+        "--state",
+        default="fire_season_state.json",
+        help="Watcher state file (default: fire_season_state.json)",
+    )
+    parser.add_argument(
+        "--deliverables",
+        nargs="+",
+        help="Deliverables to generate (default: all)",
+    )
+    parser.add_argument(
+        "--days-before-after",
+        type=int,
+        default=DEFAULT_DAYS_BEFORE_AFTER,
+        help="Default window length for manifest entries without one (default: 30)",
+    )
+    parser.add_argument(
+        "--cloud-threshold",
+        type=int,
+        default=DEFAULT_CLOUD_THRESHOLD,
+        help="Default cloud threshold for manifest entries without one (default: 70)",
+    )
+    parser.add_argument("--max-scenes-per-window", type=int)
+    parser.add_argument("--scene-catalogue")
+    parser.add_argument(
+        "--roi-catalogue",
+        help="GeoPackage / FlatGeobuf ROI catalogue; manifest 'roi' entries may be ROI names",
+    )
+    parser.add_argument("--output-dir")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="ROIs processed concurrently (default: 4)",
+    )
+    parser.add_argument(
+        "--interval-hours",
+        type=float,
+        default=DEFAULT_INTERVAL_HOURS,
+        help="Hours between cycles (default: 24)",
+    )
+    parser.add_argument("--once", action="store_true", help="Run a single cycle and exit")
+
+    args = parser.parse_args()
+
+    load_dotenv()
+    gee_key_json = os.getenv("GEE_PRIVATE_KEY_JSON")
+    if not gee_key_json:
+        raise RuntimeError("GEE_PRIVATE_KEY_JSON not set")
+
+    gcs_bucket_name = os.getenv("GCS_BUCKET_NAME")
+    if not gcs_bucket_name and not args.output_dir:
+        raise RuntimeError("GCS_BUCKET_NAME not set")
+
+    if args.deliverables:
+        deliverables = [Deliverable[name.upper()] for name in args.deliverables]
+    else:
+        deliverables = list(Deliverable)
+
+    authenticate_gee(gee_key_json)
+
+    roi_catalogue = open_roi_catalogue(args.roi_catalogue) if args.roi_catalogue else None
+    entries = load_manifest(args.manifest, roi_catalogue)
+    geometries = {
+        entry["name"]: (
+            roi_catalogue.geometry(entry["roi"])
+            if roi_catalogue is not None and entry["roi"] in roi_catalogue
+            else PostFireAssessment._load_geojson(Path(entry["roi"]))
+        )
+        for entry in entries
+    }
+    state = WatcherState(args.state)
+
+    defaults = {
+        "days_before_after": args.days_before_after,
+        "cloud_threshold": args.cloud_threshold,
+    }
+    run_kwargs = {
+        "gee_key_json": gee_key_json,
+        "deliverables": deliverables,
+        "max_scenes_per_window": args.max_scenes_per_window,
+        "scene_catalogue": args.scene_catalogue,
+        "gcs_bucket": gcs_bucket_name,
+        "output_dir": args.output_dir,
+    }
+
+    while True:
+        summary = run_cycle(
+            entries, geometries, state, defaults, run_kwargs, args.workers
+        )
+        logger.info(
+            "[WATCHER] Cycle done: %d scheduled, %d failed",
+            len(summary["scheduled"]),
+            len(summary["failed"]),
+        )
+
+        if args.once:
+            return
+
+        time.sleep(args.interval_hours * 3600)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,19 +2,34 @@
 #   --gee-task-id GWPUZIDAD4TGMXCLWOJNBRFT \
 #   --deliverable DNBR \
 #   --user-email user@email.com
+#
+# python3 -m wildfire_analyser.gee_task_monitor --registry tasks.sqlite
 
 import argparse
+import logging
 import time
-import ee
+
+from dotenv import load_dotenv
 
 from wildfire_analyser.fire_assessment.auth import authenticate_gee
+from wildfire_analyser.fire_assessment.ee_client import get_client
+from wildfire_analyser.fire_assessment.notifications import (
+    DEFAULT_WORKERS,
+    NotificationDispatcher,
+    notification_message,
+    send_email,
+    smtp_settings_from_env,
+)
+from wildfire_analyser.fire_assessment.task_registry import TaskRegistry
+
+logger = logging.getLogger(__name__)
 
 POLL_INTERVAL_SECONDS = 15
 
 
 def wait_for_task(gee_task_id: str):
     while True:
-        statuses = ee.data.getTaskStatus(gee_task_id)
+        statuses = get_client().task_status(gee_task_id)
 
         if not statuses:
             raise RuntimeError(f"Task {gee_task_id} not found")
@@ -34,24 +49,144 @@ def wait_for_task(gee_task_id: str):
         time.sleep(POLL_INTERVAL_SECONDS)
 
 
+def refresh_registry(registry: TaskRegistry) -> int:
+    """
+    Update the state of every unfinished task in the registry with one
+    task listing (plus a status lookup for tasks too recent to be listed).
+
+    Returns the number of notifications queued.
+    """
+    active = registry.active_task_ids()
+    if not active:
+        return 0
+
+    by_id = {t["id"]: t for t in get_client().task_list()}
+
+    missing = [task_id for task_id in active if task_id not in by_id]
+    if missing:
+        for status in get_client().task_status(missing):
+            by_id[status["id"]] = status
+
+    queued = 0
+    for task_id in active:
+        status = by_id.get(task_id)
+        if status is None or status.get("state") == "UNKNOWN":
+            continue
+        queued += registry.update_state(
+            task_id, status["state"], status.get("error_message")
+        )
+
+    return queued
+
+
+def monitor_registry(
+    registry: TaskRegistry,
+    dispatcher: NotificationDispatcher,
+    poll_interval: float = POLL_INTERVAL_SECONDS,
+    once: bool = False,
+) -> None:
+    """
+    Long-running monitor: poll all registered tasks in bulk and send the
+    notifications of finished ones. Safe to restart at any time.
+    """
+    recovered = registry.recover()
+    if recovered:
+        logger.info("[MONITOR] Re-queued %d interrupted notifications", recovered)
+
+    while True:
+        try:
+            queued = refresh_registry(registry)
+            if queued:
+                logger.info("[MONITOR] %d notifications queued", queued)
+        except Exception as e:
+            logger.warning("[MONITOR] Task refresh failed: %s", e)
+
+        dispatcher.dispatch()
+
+        if once:
+            # Drain what is due now, including retries scheduled meanwhile
+            while dispatcher.dispatch() or not dispatcher.idle():
+                time.sleep(0.1)
+            return
+
+        time.sleep(poll_interval)
+
+
 def main():
+    logging.basicConfig(format="%(levelname)s:%(name)s:%(message)s")
+    logging.getLogger("wildfire_analyser").setLevel(logging.INFO)
+
     parser = argparse.ArgumentParser(
-        description="Monitor a Google Earth Engine task until completion"
+        description="Monitor Google Earth Engine export tasks and notify requesters"
     )
 
-    parser.add_argument("--gee-task-id", required=True)
-    parser.add_argument("--deliverable", required=True)
-    parser.add_argument("--user-email", required=True)
+    parser.add_argument("--gee-task-id")
+    parser.add_argument("--deliverable")
+    parser.add_argument("--user-email")
+
+    parser.add_argument(
+        "--registry",
+        help="Task registry (SQLite) to monitor continuously instead of a single task",
+    )
+    parser.add_argument(
+        "--notify-workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Concurrent notification deliveries (default: 4)",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=POLL_INTERVAL_SECONDS,
+        help="Seconds between task status refreshes (default: 15)",
+    )
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Refresh the registry and send due notifications once, then exit",
+    )
 
     args = parser.parse_args()
 
+    if not args.registry and not (args.gee_task_id and args.deliverable and args.user_email):
+        parser.error(
+            "either --registry or --gee-task-id, --deliverable and --user-email are required"
+        )
+
+    load_dotenv()
     authenticate_gee()
+    smtp = smtp_settings_from_env()
+
+    if args.registry:
+        registry = TaskRegistry(args.registry)
+        dispatcher = NotificationDispatcher(
+            registry, smtp=smtp, max_workers=args.notify_workers
+        )
+        try:
+            monitor_registry(registry, dispatcher, args.poll_interval, args.once)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            dispatcher.close()
+        return
 
     wait_for_task(args.gee_task_id)
 
     print(f"Deliverable '{args.deliverable}' completed.")
     print(f"User: {args.user_email}")
-    print("Email sending not implemented yet.")
+
+    if smtp is None:
+        print("SMTP_HOST not set, no email sent.")
+        return
+
+    subject, body = notification_message({
+        "task_id": args.gee_task_id,
+        "deliverable": args.deliverable,
+        "state": "COMPLETED",
+        "url": None,
+    })
+    send_email(smtp, args.user_email, subject, body)
+    print("Email sent.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,83 @@
+# python3 -m wildfire_analyser.roi_catalogue build polygons/ rois.gpkg
+#
+# python3 -m wildfire_analyser.roi_catalogue query rois.gpkg --intersects fire.geojson
+# python3 -m wildfire_analyser.roi_catalogue query rois.gpkg --bbox -48.5 -23.6 -48.2 -23.3
+#
+# Builds the single-file ROI catalogue from a directory of GeoJSON ROIs and
+# lists the catalogue ROIs affected by a fire (or a bounding box).
+
+import argparse
+import json
+import logging
+import time
+
+from wildfire_analyser.fire_assessment.roi_catalogue import (
+    build_roi_catalogue,
+    open_roi_catalogue,
+)
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def main():
+    logging.basicConfig(format="%(levelname)s:%(name)s:%(message)s")
+    logging.getLogger("wildfire_analyser").setLevel(logging.INFO)
+
+    parser = argparse.ArgumentParser(
+        description="Build and query the GeoPackage / FlatGeobuf ROI catalogue"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Build a catalogue from *.geojson ROIs")
+    build.add_argument("directory", help="Directory with one GeoJSON file per ROI")
+    build.add_argument("catalogue", help="Output .gpkg or .fgb file")
+
+    query = commands.add_parser("query", help="List ROIs intersecting a geometry or bbox")
+    query.add_argument("catalogue")
+    target = query.add_mutually_exclusive_group(required=True)
+    target.add_argument(
+        "--intersects",
+        metavar="GEOJSON",
+        help="GeoJSON file (e.g. a fire perimeter); its features' geometries are used",
+    )
+    target.add_argument(
+        "--bbox",
+        nargs=4,
+        type=float,
+        metavar=("WEST", "SOUTH", "EAST", "NORTH"),
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build_roi_catalogue(args.directory, args.catalogue)
+        return
+
+    catalogue = open_roi_catalogue(args.catalogue)
+    t0 = time.perf_counter()
+
+    if args.bbox:
+        names = catalogue.query_bbox(*args.bbox)
+    else:
+        with open(args.intersects, encoding="utf-8") as f:
+            geojson = json.load(f)
+        features = geojson.get("features") or [{"geometry": geojson.get("geometry", geojson)}]
+        names = sorted({
+            name
+            for feature in features
+            for name in catalogue.intersecting(feature["geometry"])
+        })
+
+    logger.info(
+        "%d of %d ROIs selected in %.1f ms",
+        len(names),
+        len(catalogue),
+        (time.perf_counter() - t0) * 1000,
+    )
+    for name in names:
+        print(name)
+
+
+if __name__ == "__main__":
+    main()
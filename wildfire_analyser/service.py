@@ -0,0 +1,330 @@
+# python3 -m wildfire_analyser.service --port 8780
+#
+# Minimal asyncio HTTP service wrapping PostFireAssessment.
+#
+#   POST /assessments   {"roi": <GeoJSON>, "start_date": ..., "end_date": ...,
+#                        "deliverables": [...], "cloud_threshold": 70, ...}
+#       -> statistics, visual URLs and provenance (synchronously), plus the
+#          GEE task ids of scientific exports for polling
+#   GET  /tasks/<id>    -> export task status
+#   GET  /health        -> in-flight / coalesced counters
+#
+# Identical concurrent requests (same normalised parameters) are coalesced:
+# only the first one runs an assessment, the others await the same future.
+# Assessments run in a thread pool; the runner factory is injectable so the
+# service can be exercised without Earth Engine.
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Tuple
+
+from dotenv import load_dotenv
+
+from wildfire_analyser.fire_assessment.deliverables import Deliverable
+from wildfire_analyser.fire_assessment.fingerprint import fingerprint
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8780
+DEFAULT_WORKERS = 8
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+TASK_PATH = re.compile(r"^/tasks/([A-Za-z0-9_-]+)$")
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+RunnerFactory = Callable[[Dict[str, Any]], Any]
+
+
+def _roi_geometry(roi: Any) -> Dict[str, Any]:
+    """
+    Accept a GeoJSON geometry, Feature or FeatureCollection (first feature,
+    as in the ROI files) and return the geometry.
+    """
+    if not isinstance(roi, dict) or "type" not in roi:
+        raise ValueError("roi must be a GeoJSON object")
+
+    if roi["type"] == "FeatureCollection":
+        if not roi.get("features"):
+            raise ValueError("roi FeatureCollection has no features")
+        roi = roi["features"][0]
+    if roi["type"] == "Feature":
+        roi = roi["geometry"]
+    if roi["type"] not in ("Polygon", "MultiPolygon"):
+        raise ValueError(f"Unsupported roi geometry type: {roi['type']}")
+
+    return {"type": roi["type"], "coordinates": roi["coordinates"]}
+
+
+def _date(body: Dict[str, Any], field: str) -> str:
+    value = body.get(field)
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"{field} must be in YYYY-MM-DD format (got {value!r})") from e
+    return value
+
+
+def normalize_request(body: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate a request body and bring it to a canonical form, so equivalent
+    requests (deliverable order/case, defaults spelled out or not) compare
+    equal.
+    """
+    if not isinstance(body, dict):
+        raise ValueError("Request body must be a JSON object")
+
+    names = body.get("deliverables") or [d.name for d in Deliverable]
+    try:
+        deliverables = sorted({Deliverable[str(n).upper()].name for n in names})
+    except KeyError as e:
+        raise ValueError(f"Invalid deliverable '{e.args[0]}'") from e
+
+    max_scenes = body.get("max_scenes_per_window")
+    complete_coverage = bool(body.get("complete_coverage", False))
+    if complete_coverage and not max_scenes:
+        raise ValueError("complete_coverage requires max_scenes_per_window")
+
+    return {
+        "roi": _roi_geometry(body.get("roi")),
+        "start_date": _date(body, "start_date"),
+        "end_date": _date(body, "end_date"),
+        "deliverables": deliverables,
+        "cloud_threshold": int(body.get("cloud_threshold", 70)),
+        "days_before_after": int(body.get("days_before_after", 30)),
+        "max_scenes_per_window": int(max_scenes) if max_scenes else None,
+        "complete_coverage": complete_coverage,
+    }
+
+
+def default_runner_factory(
+    gee_key_json: str,
+    gcs_bucket: str | None = None,
+    export_scheduler=None,
+) -> RunnerFactory:
+    """
+    Factory building PostFireAssessment runners from normalised requests.
+    """
+    from wildfire_analyser.fire_assessment.post_fire_assessment import (
+        PostFireAssessment,
+    )
+
+    # Construction (re)initialises the EE client, which is not thread-safe.
+    lock = threading.Lock()
+
+    def factory(params: Dict[str, Any]):
+        with lock:
+            return PostFireAssessment(
+                gee_key_json=gee_key_json,
+                geojson_path=None,
+                roi_geometry=params["roi"],
+                start_date=params["start_date"],
+                end_date=params["end_date"],
+                deliverables=[Deliverable[n] for n in params["deliverables"]],
+                cloud_threshold=params["cloud_threshold"],
+                days_before_after=params["days_before_after"],
+                max_scenes_per_window=params["max_scenes_per_window"],
+                complete_coverage=params["complete_coverage"],
+                gcs_bucket=gcs_bucket,
+                export_scheduler=export_scheduler,
+            )
+
+    return factory
+
+
+def _task_status(task_id: str) -> Dict[str, Any]:
+    from wildfire_analyser.fire_assessment.ee_client import get_client
+
+    return get_client().task_status(task_id)[0]
+
+
+class AssessmentService:
+    """
+    Request coalescing front of PostFireAssessment.
+    """
+
+    def __init__(
+        self,
+        runner_factory: RunnerFactory,
+        max_workers: int = DEFAULT_WORKERS,
+        task_status: Callable[[str], Dict[str, Any]] = _task_status,
+    ):
+        self.runner_factory = runner_factory
+        self.task_status = task_status
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="assessment"
+        )
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.counters = {"requests": 0, "runs": 0, "coalesced": 0}
+
+    def _run(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        result = self.runner_factory(params).run()
+        return {
+            "statistics": result["statistics"],
+            "visual": result["visual"],
+            "exports": result["scientific"],
+            "provenance": result["provenance"],
+        }
+
+    async def assess(self, body: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Run (or join) the assessment for a request body.
+
+        Returns the result and whether it was coalesced onto an in-flight
+        identical request.
+        """
+        params = normalize_request(body)
+        key = fingerprint(params)
+        self.counters["requests"] += 1
+
+        future = self._in_flight.get(key)
+        coalesced = future is not None
+
+        if coalesced:
+            self.counters["coalesced"] += 1
+        else:
+            self.counters["runs"] += 1
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, self._run, params)
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        # Shielded: a client going away must not cancel the shared run
+        result = await asyncio.shield(future)
+        return {"key": key, **result}, coalesced
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        if path == "/health":
+            return 200, {"status": "ok", "in_flight": len(self._in_flight), **self.counters}
+
+        if path == "/assessments":
+            if method != "POST":
+                return 405, {"error": "Use POST"}
+            try:
+                payload = json.loads(body or b"{}")
+                result, coalesced = await self.assess(payload)
+            except (ValueError, KeyError) as e:
+                return 400, {"error": str(e)}
+            return 200, {**result, "coalesced": coalesced}
+
+        match = TASK_PATH.match(path)
+        if match and method == "GET":
+            loop = asyncio.get_running_loop()
+            status = await loop.run_in_executor(
+                self._executor, self.task_status, match.group(1)
+            )
+            return 200, status
+
+        return 404, {"error": f"Unknown path {path}"}
+
+    async def handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        try:
+            status, payload = await self._handle_request(reader)
+        except Exception as e:
+            logger.exception("[SERVICE] Request failed")
+            status, payload = 500, {"error": str(e)}
+
+        data = json.dumps(payload, default=str).encode()
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode()
+
+        try:
+            writer.write(head + data)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, reader: asyncio.StreamReader) -> Tuple[int, Any]:
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        try:
+            method, target, _ = request_line.split(" ", 2)
+        except ValueError:
+            return 400, {"error": "Malformed request line"}
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length") or 0)
+        if length > MAX_BODY_BYTES:
+            return 413, {"error": "Request body too large"}
+        body = await reader.readexactly(length) if length else b""
+
+        return await self.dispatch(method.upper(), target.split("?", 1)[0], body)
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        logger.info("[SERVICE] Listening on http://%s:%d", host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+def main():
+    logging.basicConfig(format="%(levelname)s:%(name)s:%(message)s")
+    logger.setLevel(logging.INFO)
+
+    parser = argparse.ArgumentParser(
+        description="HTTP service for post-fire assessments"
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Assessments run concurrently (default: 8)",
+    )
+    args = parser.parse_args()
+
+    load_dotenv()
+    gee_key_json = os.getenv("GEE_PRIVATE_KEY_JSON")
+    if not gee_key_json:
+        raise RuntimeError("GEE_PRIVATE_KEY_JSON not set")
+
+    service = AssessmentService(
+        default_runner_factory(gee_key_json, os.getenv("GCS_BUCKET_NAME")),
+        max_workers=args.workers,
+    )
+
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
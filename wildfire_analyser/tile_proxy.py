@@ -0,0 +1,367 @@
+# python3 -m wildfire_analyser.tile_proxy \
+#   --cache-dir tile_cache \
+#   --max-cache-mb 1024 \
+#   --port 8765
+#
+# Local caching proxy for Earth Engine XYZ map tiles.
+#
+# Layers are registered with POST /layers {"key": ..., "url_format": ...}
+# and served from GET /tiles/<key>/<z>/<x>/<y>. The key identifies the
+# visual's inputs (not the expiring EE map id), so re-registering the same
+# fire with a fresh map id keeps its cached tiles. Concurrent requests for
+# the same tile share one upstream fetch, and the on-disk cache is bounded
+# with least-recently-used eviction.
+#
+# Only Earth Engine tile URLs (https://earthengine.googleapis.com/...{z}/{x}/{y})
+# are accepted as upstream layers, so clients cannot point the proxy at
+# arbitrary hosts.
+
+import argparse
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict
+from urllib.parse import urlsplit
+
+import requests
+
+from wildfire_analyser.fire_assessment.http_session import build_http_session
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_CACHE_MB = 1024
+UPSTREAM_TIMEOUT_SECONDS = 60
+
+TILE_PATH = re.compile(r"^/tiles/([0-9a-f]+)/(\d+)/(\d+)/(\d+)$")
+
+UPSTREAM_SCHEME = "https"
+UPSTREAM_HOST = "earthengine.googleapis.com"
+TILE_PLACEHOLDERS = ("{z}", "{x}", "{y}")
+
+
+def validate_url_format(url_format: str) -> str:
+    """
+    Check that an upstream layer is an Earth Engine XYZ tile template
+    with exactly the {z}, {x} and {y} placeholders.
+    """
+    if not isinstance(url_format, str):
+        raise ValueError("url_format must be a string")
+
+    parts = urlsplit(url_format)
+    if (
+        parts.scheme != UPSTREAM_SCHEME
+        or parts.hostname != UPSTREAM_HOST
+        or parts.netloc != UPSTREAM_HOST
+    ):
+        raise ValueError(
+            f"url_format must be a {UPSTREAM_SCHEME}://{UPSTREAM_HOST}/ tile URL"
+        )
+
+    rest = url_format
+    for placeholder in TILE_PLACEHOLDERS:
+        if rest.count(placeholder) != 1:
+            raise ValueError(f"url_format must contain {placeholder} once")
+        rest = rest.replace(placeholder, "")
+    if "{" in rest or "}" in rest:
+        raise ValueError("url_format may only contain {z}, {x} and {y}")
+
+    return url_format
+
+
+def tile_url(url_format: str, z: int, x: int, y: int) -> str:
+    return (
+        url_format.replace("{z}", str(int(z)))
+        .replace("{x}", str(int(x)))
+        .replace("{y}", str(int(y)))
+    )
+
+
+class TileCache:
+    """
+    On-disk tile cache with a byte budget and LRU eviction.
+
+    Recency survives restarts: the index is rebuilt from file mtimes,
+    which are refreshed on every hit.
+    """
+
+    def __init__(self, root: str | Path, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[Path, int]" = OrderedDict()
+        self._size = 0
+        self._load_index()
+
+    def _load_index(self) -> None:
+        entries = []
+        for path in self.root.glob("tiles/*/*/*/*"):
+            # Partial write left by a crash between mkstemp and os.replace
+            if path.suffix == ".tmp":
+                path.unlink(missing_ok=True)
+                continue
+            stat = path.stat()
+            entries.append((stat.st_mtime, path, stat.st_size))
+
+        for _, path, size in sorted(entries):
+            self._index[path] = size
+            self._size += size
+
+    def path_for(self, key: str, z: int, x: int, y: int) -> Path:
+        return self.root / "tiles" / key / str(z) / str(x) / str(y)
+
+    def get(self, path: Path) -> bytes | None:
+        with self._lock:
+            if path not in self._index:
+                return None
+            self._index.move_to_end(path)
+
+        try:
+            content = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            self._forget(path)
+            return None
+        return content
+
+    def put(self, path: Path, content: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp, path)
+
+        with self._lock:
+            self._size += len(content) - self._index.pop(path, 0)
+            self._index[path] = len(content)
+            self._evict()
+
+    def _forget(self, path: Path) -> None:
+        with self._lock:
+            self._size -= self._index.pop(path, 0)
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and len(self._index) > 1:
+            path, size = self._index.popitem(last=False)
+            self._size -= size
+            path.unlink(missing_ok=True)
+
+
+class TileProxy:
+    """
+    Registry of upstream tile layers plus the shared cache in front of them.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        max_cache_bytes: int,
+        session: requests.Session | None = None,
+    ):
+        self.cache = TileCache(cache_dir, max_cache_bytes)
+        self.session = session or build_http_session(pool_size=16)
+        self._layers_path = Path(cache_dir) / "layers.json"
+        self._layers: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Path, threading.Event] = {}
+
+        if self._layers_path.exists():
+            for key, url_format in json.loads(self._layers_path.read_text()).items():
+                try:
+                    self._layers[key] = validate_url_format(url_format)
+                except ValueError as e:
+                    logger.warning("Dropping tile layer %s: %s", key, e)
+
+    def register(self, key: str, url_format: str) -> None:
+        validate_url_format(url_format)
+        with self._lock:
+            self._layers[key] = url_format
+            self._layers_path.parent.mkdir(parents=True, exist_ok=True)
+            self._layers_path.write_text(json.dumps(self._layers, indent=2))
+
+    def get_tile(self, key: str, z: int, x: int, y: int) -> bytes:
+        """
+        Return tile bytes from the cache, fetching them upstream at most
+        once even when many clients ask for the same tile concurrently.
+        """
+        if key not in self._layers:
+            raise KeyError(f"Unknown tile layer: {key}")
+
+        path = self.cache.path_for(key, z, x, y)
+
+        while True:
+            content = self.cache.get(path)
+            if content is not None:
+                return content
+
+            with self._lock:
+                event = self._in_flight.get(path)
+                if event is None:
+                    event = self._in_flight[path] = threading.Event()
+                    owner = True
+                else:
+                    owner = False
+
+            if not owner:
+                # Another request is fetching this tile; retry from cache
+                # once it finishes (or fetch ourselves if it failed).
+                event.wait(UPSTREAM_TIMEOUT_SECONDS)
+                continue
+
+            try:
+                url = tile_url(self._layers[key], z, x, y)
+                response = self.session.get(url, timeout=UPSTREAM_TIMEOUT_SECONDS)
+                response.raise_for_status()
+                self.cache.put(path, response.content)
+                return response.content
+            finally:
+                with self._lock:
+                    self._in_flight.pop(path, None)
+                event.set()
+
+
+def _content_type(content: bytes) -> str:
+    if content.startswith(b"\xff\xd8"):
+        return "image/jpeg"
+    return "image/png"
+
+
+def make_handler(proxy: TileProxy):
+    class TileProxyHandler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            match = TILE_PATH.match(self.path.split("?", 1)[0])
+            if not match:
+                self._send(404, b"Not found", "text/plain")
+                return
+
+            key = match.group(1)
+            z, x, y = (int(v) for v in match.groups()[1:])
+
+            try:
+                content = proxy.get_tile(key, z, x, y)
+            except KeyError as e:
+                self._send(404, str(e).encode(), "text/plain")
+                return
+            except requests.RequestException as e:
+                logger.warning("Upstream tile fetch failed: %s", e)
+                self._send(502, b"Upstream tile fetch failed", "text/plain")
+                return
+
+            self._send(200, content, _content_type(content))
+
+        def do_POST(self):
+            if self.path != "/layers":
+                self._send(404, b"Not found", "text/plain")
+                return
+
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length))
+                key = body["key"]
+                url_format = body["url_format"]
+                if not isinstance(key, str) or not re.fullmatch(r"[0-9a-f]+", key):
+                    raise ValueError("key must be a hex string")
+                proxy.register(key, url_format)
+            except (ValueError, KeyError) as e:
+                self._send(400, f"Invalid layer: {e}".encode(), "text/plain")
+                return
+
+            host = self.headers.get("Host", "%s:%d" % self.server.server_address)
+            payload = {
+                "key": key,
+                "url_format": f"http://{host}/tiles/{key}/{{z}}/{{x}}/{{y}}",
+            }
+            self._send(200, json.dumps(payload).encode(), "application/json")
+
+        def _send(self, status: int, body: bytes, content_type: str) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            if status == 200 and content_type.startswith("image/"):
+                self.send_header("Cache-Control", "public, max-age=86400")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(format, *args)
+
+    return TileProxyHandler
+
+
+def serve(
+    cache_dir: str | Path,
+    max_cache_bytes: int,
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+) -> ThreadingHTTPServer:
+    """
+    Build a tile proxy HTTP server. Call `serve_forever()` to run it.
+    """
+    proxy = TileProxy(cache_dir, max_cache_bytes)
+    return ThreadingHTTPServer((host, port), make_handler(proxy))
+
+
+def register_tile_layer(
+    proxy_url: str,
+    key: str,
+    url_format: str,
+    session: requests.Session | None = None,
+) -> str:
+    """
+    Register an upstream XYZ layer with a running proxy and return the
+    proxied URL template.
+    """
+    session = session or requests
+    response = session.post(
+        f"{proxy_url.rstrip('/')}/layers",
+        json={"key": key, "url_format": url_format},
+        timeout=30,
+    )
+    response.raise_for_status()
+    return response.json()["url_format"]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Local caching proxy for Earth Engine XYZ map tiles"
+    )
+
+    parser.add_argument("--cache-dir", required=True)
+    parser.add_argument(
+        "--max-cache-mb",
+        type=int,
+        default=DEFAULT_MAX_CACHE_MB,
+        help=f"Maximum on-disk cache size in MB (default: {DEFAULT_MAX_CACHE_MB})",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    server = serve(
+        cache_dir=args.cache_dir,
+        max_cache_bytes=args.max_cache_mb * 1024 * 1024,
+        host=args.host,
+        port=args.port,
+    )
+
+    logger.info("Tile proxy listening on http://%s:%d", args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()